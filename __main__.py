@@ -0,0 +1,194 @@
+"""Headless command line: run an algorithm or circuit and print JSON.
+
+    python -m quantum teleport --theta 1.2 --shots 1000
+    python -m quantum grovers_search --n-qubits 8 --target 10110011
+    python -m quantum shors_period_finding --N 21 --a 2 --shots 64 --seed 0
+    python -m quantum qft --n-qubits 100 --input 1011 --backend mps
+    python -m quantum batch jobs.jsonl   # {"program": "ghz", "n_qubits": 50} per line
+
+Each run prints one JSON object with the program, its parameters, the
+result (usually a {bitstring: count} histogram) and timings: 'import' is
+the time spent importing the modules the program needs and 'run' the time
+spent in it. Nothing from the GUI or matplotlib is imported, and a program
+only imports its own modules, so short batch jobs start in tens of
+milliseconds on top of the interpreter and NumPy. `batch` runs many jobs in
+one process and pays the imports once.
+"""
+import argparse
+import importlib
+import json
+import math
+import sys
+import time
+
+PROGRAMS = {}
+
+
+def program(name, module, *arguments, help=None):
+    """Register func(module, args) under `name`; `module` is imported when it runs.
+
+    `arguments` are (flags, add_argument kwargs) pairs for the program's options.
+    """
+    def register(func):
+        PROGRAMS[name] = {'func': func, 'module': module, 'arguments': arguments, 'help': help}
+        return func
+    return register
+
+
+def _bits(value):
+    if any(c not in '01' for c in value):
+        raise argparse.ArgumentTypeError(f"expected a bitstring, got {value!r}")
+    return value
+
+
+@program('teleport', 'protocols',
+         (('--theta',), {'type': float, 'default': 0.0, 'help': 'polar angle of the input state'}),
+         (('--phi',), {'type': float, 'default': 0.0, 'help': 'azimuthal angle of the input state'}),
+         help='feed-forward teleportation; counts over c0 c1 (Alice) and c2 (Bob)')
+def teleport(protocols, args):
+    state = [math.cos(args.theta / 2), complex(math.cos(args.phi), math.sin(args.phi)) * math.sin(args.theta / 2)]
+    counts, cache = protocols.teleport_shots(state, args.shots, args.seed)
+    return {'counts': counts, 'branches': cache.branches}
+
+
+@program('grovers_search', 'algorithms',
+         (('--n-qubits',), {'type': int, 'default': 4}),
+         (('--target',), {'type': _bits, 'help': 'marked bitstring (default all ones)'}),
+         (('--iterations',), {'type': int, 'help': 'default: the optimal count'}),
+         help="Grover's search for one marked basis state")
+def grovers_search(algorithms, args):
+    target = args.target or '1' * args.n_qubits
+    if len(target) != args.n_qubits:
+        raise ValueError(f"--target needs {args.n_qubits} bits, got {target!r}")
+    counts = algorithms.grovers_search(args.n_qubits, args.iterations, [int(b) for b in target],
+                                       shots=args.shots, rng=args.seed)
+    return {'counts': counts}
+
+
+@program('shors_period_finding', 'algorithms',
+         (('--N',), {'type': int, 'default': 15}),
+         (('--a',), {'type': int, 'default': 7}),
+         help='order finding of a mod N; counting-register counts and the recovered period')
+def shors_period_finding(algorithms, args):
+    import numpy as np
+    from .sampling import counts_from_bits
+    timings = {}
+    bits = algorithms.shors_period_finding(args.N, args.a, args.shots, args.seed, timings)
+    t = bits.shape[1]
+    values = bits.astype(np.int64) @ (1 << np.arange(t - 1, -1, -1))
+    period = algorithms.period_from_samples(values, t, args.N, args.a)
+    return {'counts': counts_from_bits(bits), 'period': period, 'stages': timings}
+
+
+@program('shors_factor', 'algorithms',
+         (('--N',), {'type': int, 'default': 15}),
+         help="factor N with Shor's algorithm (--shots samples per attempt)")
+def shors_factor(algorithms, args):
+    timings = {}
+    factors = algorithms.shors_factor(args.N, args.shots, args.seed, timings=timings)
+    return {'factors': list(factors), 'stages': timings}
+
+
+@program('bernstein_vazirani', 'algorithms',
+         (('--secret',), {'type': _bits, 'default': '101'}),
+         (('--backend',), {'choices': ['auto', 'statevector', 'stabilizer', 'mps'], 'default': 'auto'}),
+         help='Bernstein-Vazirani; counts over the input qubits')
+def bernstein_vazirani(algorithms, args):
+    return {'counts': algorithms.bernstein_vazirani(args.secret, args.shots, args.seed, args.backend)}
+
+
+@program('qft', 'transforms',
+         (('--n-qubits',), {'type': int, 'default': 8}),
+         (('--input',), {'type': _bits, 'help': 'basis state prepared on the leading qubits'}),
+         (('--backend',), {'choices': ['statevector', 'mps'], 'default': 'statevector'}),
+         (('--max-bond',), {'type': int, 'help': 'MPS bond dimension limit'}),
+         help='QFT of a basis state')
+def qft(transforms, args):
+    from .gates import X
+    if args.backend == 'mps':
+        from .mps import MPSRegister
+        register = MPSRegister(args.n_qubits, max_bond=args.max_bond)
+    else:
+        from .register import QuantumRegister
+        register = QuantumRegister(args.n_qubits)
+    for q, bit in enumerate(args.input or ''):
+        if bit == '1':
+            register.apply_gate(X, q)
+    transforms.qft(register)
+    result = {'counts': register.counts(args.shots, args.seed)}
+    if args.backend == 'mps':
+        result['truncation_error'] = register.truncation_error
+        result['max_bond'] = max(register.bond_dimensions(), default=1)
+    return result
+
+
+@program('ghz', 'circuit',
+         (('--n-qubits',), {'type': int, 'default': 3}),
+         (('--backend',), {'choices': ['auto', 'statevector', 'stabilizer', 'mps'], 'default': 'auto'}),
+         help='GHZ state (H then a CNOT chain)')
+def ghz(circuit, args):
+    from .gates import H, CNOT
+    ghz = circuit.Circuit(args.n_qubits)
+    ghz.apply_gate(H, 0)
+    for q in range(args.n_qubits - 1):
+        ghz.apply_gate(CNOT, [q, q + 1])
+    return {'counts': ghz.run(backend=args.backend).counts(args.shots, args.seed)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m quantum',
+                                     description='Run a quantum program headless and print JSON.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, spec in PROGRAMS.items():
+        sub = commands.add_parser(name, help=spec['help'])
+        sub.add_argument('--shots', type=int, default=1024)
+        sub.add_argument('--seed', type=int, help='RNG seed (default: fresh entropy)')
+        for flags, options in spec['arguments']:
+            sub.add_argument(*flags, **options)
+    batch = commands.add_parser('batch', help='run JSON jobs, one per line, printing one JSON line each')
+    batch.add_argument('jobs', help="JSONL file of {'program': name, option: value, ...} ('-': stdin)")
+    return parser
+
+
+def run_program(args):
+    """Run one parsed command; returns its JSON-ready record."""
+    spec = PROGRAMS[args.command]
+    start = time.perf_counter()
+    module = importlib.import_module(f'.{spec["module"]}', __package__)
+    imported = time.perf_counter()
+    result = spec['func'](module, args)
+    finished = time.perf_counter()
+    params = {k: v for k, v in vars(args).items() if k != 'command'}
+    return {'program': args.command, 'params': params, 'result': result,
+            'timings': {'import': imported - start, 'run': finished - imported}}
+
+
+def _job_argv(job):
+    job = dict(job)
+    argv = [job.pop('program')]
+    for key, value in job.items():
+        argv += [f"--{key.replace('_', '-')}", str(value)]
+    return argv
+
+
+def _dump(record):
+    # NumPy scalars and arrays in results
+    return json.dumps(record, default=lambda value: value.tolist())
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command != 'batch':
+        print(_dump(run_program(args)))
+        return 0
+    jobs = sys.stdin if args.jobs == '-' else open(args.jobs)
+    with jobs:
+        for line in jobs:
+            if line.strip():
+                print(_dump(run_program(parser.parse_args(_job_argv(json.loads(line))))), flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,161 +1,408 @@
+import time
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd, isqrt
 import numpy as np
-from .gates import H, X, Z, apply_gate
-from .state import Qubit
-
-def simple_oracle(qubits, target_state=[1, 1]):
-    """Oracle that marks the target state by applying phase flip"""
-    # Check if we're in the target state (simplified)
-    # In a real implementation, this would be more sophisticated
-    if len(qubits) >= 2:
-        # Apply conditional phase flip to last qubit if in target state
-        # This is a simplified oracle
-        qubits[-1].state = apply_gate(qubits[-1].state, Z)
-    return qubits
-
-def diffusion_operator(qubits):
-    """Apply the diffusion operator (inversion about average)"""
-    n = len(qubits)
-    
+from .gates import H, X, Z, CNOT
+from .precision import get_default_dtype
+from .register import QuantumRegister
+from .sampling import sample_indices, indices_to_bits
+from .circuit import Circuit
+from .transforms import qft
+from .noise import run_density, run_trajectories
+from . import instrument
+
+def _multi_controlled_z(register):
+    """Phase flip on |1...1⟩ over every qubit of the register"""
+    n = register.n_qubits
+    if n == 1:
+        register.apply_gate(Z, 0)
+    else:
+        register.apply_controlled(Z, list(range(n - 1)), n - 1)
+    return register
+
+def simple_oracle(register, target_state=[1, 1]):
+    """Oracle that marks the target state by applying phase flip
+
+    Works on a QuantumRegister or records into a Circuit.
+    """
+    if len(target_state) != register.n_qubits:
+        raise ValueError(f"Target state {target_state} does not match {register.n_qubits} qubits")
+    # Map the target onto |1...1⟩, flip its phase, and map back
+    zeros = [i for i, bit in enumerate(target_state) if bit == 0]
+    for i in zeros:
+        register.apply_gate(X, i)
+    _multi_controlled_z(register)
+    for i in zeros:
+        register.apply_gate(X, i)
+    return register
+
+def diffusion_operator(register):
+    """Apply the diffusion operator (inversion about average) to a register or Circuit"""
+    n = register.n_qubits
+
     # Apply H to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, H)
-    
+    for i in range(n):
+        register.apply_gate(H, i)
+
     # Apply X to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, X)
-    
-    # Apply multi-controlled Z (simplified for 2 qubits)
-    if n == 2:
-        # For 2 qubits, apply Z to second qubit if first is |1⟩
-        qubits[1].state = apply_gate(qubits[1].state, Z)
-    
+    for i in range(n):
+        register.apply_gate(X, i)
+
+    # Apply multi-controlled Z
+    _multi_controlled_z(register)
+
     # Apply X to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, X)
-    
+    for i in range(n):
+        register.apply_gate(X, i)
+
     # Apply H to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, H)
-    
-    return qubits
+    for i in range(n):
+        register.apply_gate(H, i)
+
+    return register
+
+def grover_circuit(n_qubits=2, iterations=None, target_state=[1, 1]):
+    """Record Grover's search as an (unoptimized) Circuit"""
+    circuit = Circuit(n_qubits)
 
-def grovers_search(n_qubits=2, iterations=None, target_state=[1, 1]):
-    """Grover's search algorithm implementation"""
-    
-    # Initialize qubits in |0⟩ state
-    qubits = [Qubit() for _ in range(n_qubits)]
-    
     # Create superposition by applying Hadamard to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, H)
-    
+    for i in range(n_qubits):
+        circuit.apply_gate(H, i)
+
     # Determine optimal number of iterations
     if iterations is None:
         N = 2**n_qubits
         iterations = int(np.pi/4 * np.sqrt(N))
-    
+
     # Grover iterations
     for i in range(iterations):
         # Apply oracle
-        qubits = simple_oracle(qubits, target_state)
-        
+        simple_oracle(circuit, target_state)
+
         # Apply diffusion operator
-        qubits = diffusion_operator(qubits)
-    
+        diffusion_operator(circuit)
+
+    return circuit
+
+def marked_basis(n_qubits, marked):
+    """Sorted int array of the marked basis indices.
+
+    `marked` is an iterable of bit lists / bitstrings / integers, or a
+    vectorized predicate taking an array of basis indices and returning a
+    boolean array; predicates are evaluated in chunks to bound memory.
+    Indices rather than a full mask keep each oracle call O(#marked).
+    """
+    if callable(marked):
+        N = 2**n_qubits
+        step = 1 << 20
+        chunks = [start + np.flatnonzero(marked(np.arange(start, min(start + step, N))))
+                  for start in range(0, N, step)]
+        return np.concatenate(chunks)
+    indices = []
+    for item in marked:
+        if isinstance(item, str):
+            item = [int(bit) for bit in item]
+        if not np.isscalar(item):
+            if len(item) != n_qubits:
+                raise ValueError(f"Target state {item} does not match {n_qubits} qubits")
+            item = int(''.join(map(str, item)), 2)
+        indices.append(int(item))
+    return np.unique(np.array(indices, dtype=np.int64))
+
+def mask_oracle(register, marked):
+    """Phase-flip the marked amplitudes (indices or mask) in place, no gates built"""
+    register.state[..., marked] *= -1
+    return register
+
+def mean_inversion(register, mean=None):
+    """Diffusion as the in-place update amp -> 2*mean - amp
+
+    The update leaves the mean unchanged, so callers tracking it can pass it
+    in and skip the extra reduction pass over the amplitudes.
+    """
+    amplitudes = register.state
+    if mean is None:
+        mean = amplitudes.mean(axis=-1, keepdims=True)
+    np.subtract(2 * mean, amplitudes, out=amplitudes)
+    return register
+
+def optimal_iterations(n_qubits, n_marked=1):
+    """Iteration count closest to the first success peak, floor(π/4·√(N/M))"""
+    return int(np.pi / 4 * np.sqrt(2**n_qubits / n_marked))
+
+def grover_success_probability(n_qubits, n_marked, iterations):
+    """Analytic success probability sin²((2k+1)θ) after k = 0..iterations steps"""
+    theta = np.arcsin(np.sqrt(n_marked / 2**n_qubits))
+    return np.sin((2 * np.arange(iterations + 1) + 1) * theta)**2
+
+def grovers_search(n_qubits=2, iterations=None, target_state=[1, 1], shots=None, rng=None, marked=None,
+                   progress=None):
+    """Grover's search algorithm implementation
+
+    Runs on a full register: the oracle is a precomputed phase flip over the
+    marked basis indices (`marked`, or just `target_state`) and the diffusion
+    is the in-place inversion about the mean, so each iteration is O(2^n)
+    with no Hadamard matrices. The gate-level circuit is grover_circuit.
+
+    With `shots` set, the final state is sampled once per shot in a single
+    vectorized draw and a {bitstring: count} dict is returned instead.
+    `progress(i, iterations, register)` is called every 64 iterations and once
+    more after the last; raising from it aborts the search.
+    """
+    marked = marked_basis(n_qubits, [target_state] if marked is None else marked)
+    if not len(marked):
+        raise ValueError("Grover's search needs at least one marked state")
+
+    # Uniform superposition H^n|0...0⟩ written directly
+    register = QuantumRegister(n_qubits)
+    register.state[:] = 1 / np.sqrt(2**n_qubits)
+
+    # Determine optimal number of iterations
+    if iterations is None:
+        iterations = optimal_iterations(n_qubits, len(marked))
+
+    # Grover iterations: one O(#marked) oracle and one pass for the diffusion.
+    # The oracle shifts the mean by 2·Σ(flipped)/N and the inversion keeps it,
+    # so the mean is tracked instead of recomputed (re-synced periodically).
+    N = 2**n_qubits
+    with instrument.span('grover.iterations', iterations=iterations, marked=len(marked)):
+        for i in range(iterations):
+            if i % 64 == 0:
+                mean = register.state.mean()
+                if progress is not None:
+                    progress(i, iterations, register)
+            mask_oracle(register, marked)
+            mean += 2 * register.state[marked].sum() / N
+            mean_inversion(register, mean)
+    if progress is not None:
+        progress(iterations, iterations, register)
+
     # Measure all qubits
-    results = [q.measure() for q in qubits]
-    
+    with instrument.span('grover.measure', shots=shots):
+        if shots is not None:
+            return register.counts(shots, rng)
+        results = register.measure(rng)
+
     return results
 
-def quantum_fourier_transform(qubits):
-    """Simplified Quantum Fourier Transform"""
-    n = len(qubits)
-    
-    for i in range(n):
-        # Apply Hadamard
-        qubits[i].state = apply_gate(qubits[i].state, H)
-        
-        # Apply controlled phase rotations (simplified)
-        for j in range(i + 1, n):
-            # This is a simplified version
-            # In reality, we'd need proper controlled gates
-            angle = np.pi / (2**(j-i))
-            rotation_gate = np.array([[1, 0], [0, np.exp(1j * angle)]])
-            qubits[j].state = apply_gate(qubits[j].state, rotation_gate)
-    
-    return qubits
+def noisy_grover_success(n_qubits, noise, target_state, iterations=None, trajectories=None, rng=None):
+    """Probability of measuring the target after Grover's search under a NoiseModel.
 
-def bernstein_vazirani(secret_string="101"):
-    """Bernstein-Vazirani algorithm to find secret string"""
+    Uses the density-matrix backend, or `trajectories` Monte Carlo
+    statevector trajectories for registers too large for a 4^n rho.
+    """
+    circuit = grover_circuit(n_qubits, iterations, target_state)
+    target = int(''.join(map(str, target_state)), 2)
+    if trajectories is None:
+        return float(run_density(circuit, noise).probabilities()[target])
+    register = run_trajectories(circuit, noise, trajectories, rng)
+    return float(register.probabilities()[:, target].mean())
+
+def quantum_fourier_transform(register, targets=None, method="gates"):
+    """Quantum Fourier Transform on the register (see transforms.qft)"""
+    return qft(register, targets, method)
+
+def bernstein_vazirani_circuit(secret_string="101"):
+    """Record the Bernstein-Vazirani circuit (ancilla is the last qubit)"""
     n = len(secret_string)
-    
-    # Initialize qubits
-    qubits = [Qubit() for _ in range(n)]
-    ancilla = Qubit()
-    
+    circuit = Circuit(n + 1)
+    ancilla = n
+
     # Initialize ancilla in |1⟩ state
-    ancilla.state = apply_gate(ancilla.state, X)
-    
+    circuit.apply_gate(X, ancilla)
+
     # Apply Hadamard to all qubits
-    for q in qubits:
-        q.state = apply_gate(q.state, H)
-    ancilla.state = apply_gate(ancilla.state, H)
-    
-    # Apply oracle (simplified)
+    for i in range(n + 1):
+        circuit.apply_gate(H, i)
+
+    # Apply oracle: CNOT from each secret '1' bit onto the ancilla
     for i, bit in enumerate(secret_string):
         if bit == '1':
-            # Apply CNOT between qubit i and ancilla
-            # This is simplified - in reality we'd need proper multi-qubit gates
-            qubits[i].state = apply_gate(qubits[i].state, X)
-    
-    # Apply Hadamard to all qubits again
-    for q in qubits:
-        q.state = apply_gate(q.state, H)
-    
-    # Measure qubits
-    result = [q.measure() for q in qubits]
-    
-    return ''.join(map(str, result))
+            circuit.apply_gate(CNOT, [i, ancilla])
 
-def shors_period_finding(N=15, a=7):
-    """Simplified Shor's algorithm for period finding"""
-    # This is a highly simplified version for demonstration
-    # Real Shor's algorithm is much more complex
-    
-    # Number of qubits needed
-    n = int(np.ceil(np.log2(N)))
-    
-    # Initialize qubits
-    qubits = [Qubit() for _ in range(2 * n)]
-    
-    # Create superposition in first register
+    # Apply Hadamard to all input qubits again
     for i in range(n):
-        qubits[i].state = apply_gate(qubits[i].state, H)
-    
-    # Apply modular exponentiation (simplified)
-    # In reality, this would be a complex quantum circuit
-    
-    # Apply QFT to first register
-    first_register = qubits[:n]
-    quantum_fourier_transform(first_register)
-    
-    # Measure first register
-    result = [q.measure() for q in first_register]
-    
-    # Classical post-processing would find the period
-    # For demonstration, return a simple result
-    return result
+        circuit.apply_gate(H, i)
+
+    return circuit
+
+def bernstein_vazirani(secret_string="101", shots=None, rng=None, backend='auto'):
+    """Bernstein-Vazirani algorithm to find secret string
+
+    With `shots` set, returns a {bitstring: count} dict over the input qubits.
+    `backend` is passed to Circuit.run ('mps' handles hundreds of qubits).
+    """
+    n = len(secret_string)
+    register = bernstein_vazirani_circuit(secret_string).run(backend=backend)
+
+    # Measure input qubits
+    if shots is not None:
+        return register.counts(shots, rng, qubits=range(n))
+    result = register.measure(rng)[:n]
+
+    return ''.join(map(str, result))
+
+@lru_cache(maxsize=256)
+def modexp_permutation(N, a, k):
+    """Index table y -> a^(2^k)·y mod N over the work register's values 0..N-1.
+
+    Multiplication by a unit mod N permutes the residues, so the controlled
+    modular multiply is a basis-state permutation. Tables are cached per
+    (N, a, k) and returned read-only.
+    """
+    table = np.arange(N, dtype=np.int64) * pow(a, 2**k, N) % N
+    table.setflags(write=False)
+    return table
+
+def controlled_modexp(work, N, a, k):
+    """Apply controlled-U^(2^k) to the work labels of a counting register.
+
+    `work` holds, for every counting basis state x, the work-register value
+    entangled with it (the work register only ever holds a permuted basis
+    state). Counting bit k (qubit t-1-k) is one axis of a reshape, so the
+    controlled permutation is a gather on the control=1 slice.
+    """
+    view = work.reshape(-1, 2, 2**k)
+    view[:, 1, :] = modexp_permutation(N, a, k)[view[:, 1, :]]
+    return work
+
+def _add_time(timings, key, start):
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + time.perf_counter() - start
+    return time.perf_counter()
+
+def _shor_samples(N, a, shots, rng=None, timings=None):
+    """Counting-register outcomes (integers in [0, 2^t)) of order finding for a mod N."""
+    rng = np.random.default_rng(rng)
+    n = max(int(N - 1).bit_length(), 1)
+    t = 2 * n
+    start = time.perf_counter()
+    # H on every counting qubit gives each x the amplitude 2^(-t/2), so only
+    # the work labels are stored; the work register starts in |1⟩ everywhere
+    with instrument.span('shor.modexp', N=N, a=a, t=t):
+        work = np.ones(2**t, dtype=np.int32 if N < 2**31 else np.int64)
+        for k in range(t):
+            controlled_modexp(work, N, a, k)
+    start = _add_time(timings, 'modexp', start)
+    # Measuring the work register first does not change the counting
+    # statistics (it is never touched again), and shots sharing a work
+    # outcome share the collapsed counting state: one QFT per distinct value
+    with instrument.span('shor.measure', shots=shots):
+        weights = np.bincount(work, minlength=N) / 2**t
+        outcomes, repeats = np.unique(sample_indices(weights, shots, rng), return_counts=True)
+    start = _add_time(timings, 'measure', start)
+    # The collapsed counting state is real (uniform over the x whose work
+    # label was measured), so its spectrum is conjugate-symmetric: a real FFT
+    # of half the length gives P(y) = P(2^t - y) for every y. All branches
+    # reuse the same buffers; sample_indices normalises the weights.
+    dim = 2**t
+    branch = np.empty(dim, dtype=np.finfo(get_default_dtype()).dtype)
+    spectrum = np.empty(dim // 2 + 1, dtype=get_default_dtype())
+    folded = np.empty(dim // 2 + 1, dtype=branch.dtype)
+    samples = []
+    for value, count in zip(outcomes, repeats):
+        with instrument.span('shor.qft', shots=int(count)):
+            np.equal(work, value, out=branch)
+            np.fft.rfft(branch, out=spectrum)
+            np.abs(spectrum, out=folded)
+            np.square(folded, out=folded)
+            folded[1:-1] *= 2  # y and 2^t - y folded together
+            y = sample_indices(folded, count, rng)
+            mirror = (y % (dim // 2) != 0) & (rng.random(count) < 0.5)
+            samples.append(np.where(mirror, dim - y, y))
+        start = _add_time(timings, 'qft', start)
+    return rng.permutation(np.concatenate(samples)), t
+
+def shors_period_finding(N=15, a=7, shots=None, rng=None, timings=None):
+    """Quantum order finding for a mod N (counting register of 2·⌈log2 N⌉ qubits)
+
+    Returns the measured counting bits for one shot, or a (shots, t) bit
+    array with `shots`. Pass a dict as `timings` to accumulate seconds spent
+    in the 'modexp', 'measure' and 'qft' stages.
+    """
+    if gcd(a, N) != 1:
+        raise ValueError(f"a={a} must be coprime to N={N}")
+    samples, t = _shor_samples(N, a, 1 if shots is None else shots, rng, timings)
+    bits = indices_to_bits(samples, t)
+    return [int(b) for b in bits[0]] if shots is None else bits
+
+def period_from_samples(samples, t, N, a):
+    """Order r of a mod N from measured counting values, or None
+
+    Each sample y ≈ s·2^t/r; the continued-fraction convergent of y/2^t with
+    denominator below N gives r/gcd(s, r). Denominators from different shots
+    are combined by lcm until a^r ≡ 1 (mod N).
+    """
+    period = 1
+    for y in samples:
+        r = Fraction(int(y), 2**t).limit_denominator(N - 1).denominator
+        candidate = period * r // gcd(period, r)
+        if candidate >= N:
+            continue
+        period = candidate
+        if pow(a, period, N) == 1:
+            return period
+    return None
+
+def _is_prime(N):
+    return N > 1 and all(N % p for p in range(2, isqrt(N) + 1))
+
+def shors_factor(N=15, shots=16, rng=None, max_attempts=20, timings=None):
+    """Factor N with Shor's algorithm; returns a pair (p, q) with p·q = N
+
+    Even N and perfect powers are split classically. Otherwise a random base
+    a is drawn, its order is found from `shots` batched samples, and
+    gcd(a^(r/2) ± 1, N) gives a factor when r is even and a^(r/2) ≢ -1.
+    """
+    if N < 4 or _is_prime(N):
+        raise ValueError(f"N={N} must be composite")
+    if N % 2 == 0:
+        return 2, N // 2
+    for power in range(2, N.bit_length() + 1):
+        root = round(N ** (1 / power))
+        for base in (root - 1, root, root + 1):
+            if base > 1 and base**power == N:
+                return base, N // base
+    rng = np.random.default_rng(rng)
+    for _ in range(max_attempts):
+        a = int(rng.integers(2, N - 1))
+        if gcd(a, N) > 1:  # lucky guess shares a factor with N
+            p = gcd(a, N)
+            return min(p, N // p), max(p, N // p)
+        samples, t = _shor_samples(N, a, shots, rng, timings)
+        start = time.perf_counter()
+        r = period_from_samples(samples, t, N, a)
+        _add_time(timings, 'postprocess', start)
+        if r is None or r % 2 or pow(a, r // 2, N) == N - 1:
+            continue
+        p = gcd(pow(a, r // 2, N) - 1, N)
+        if 1 < p < N:
+            return min(p, N // p), max(p, N // p)
+    raise RuntimeError(f"No factor of {N} found in {max_attempts} attempts")
 
 if __name__ == "__main__":
     # Test the algorithms
     print("Testing Grover's Search:")
     result = grovers_search(n_qubits=2)
     print(f"Result: {result}")
+    stats = grover_circuit(n_qubits=4, target_state=[1, 0, 1, 1]).optimize().stats
+    print(f"4-qubit circuit gates: {stats['gates_before']} -> {stats['gates_after']}")
+    k = optimal_iterations(20)
+    counts = grovers_search(n_qubits=20, target_state=[1, 0] * 10, shots=1000)
+    print(f"20-qubit search, {k} iterations: P(success) analytic "
+          f"{grover_success_probability(20, 1, k)[-1]:.4f}, sampled {max(counts.values()) / 1000:.3f}")
     
     print("\nTesting Bernstein-Vazirani:")
     secret = bernstein_vazirani("101")
     print(f"Found secret string: {secret}")
+    stats = bernstein_vazirani_circuit("101").optimize().stats
+    print(f"Circuit gates: {stats['gates_before']} -> {stats['gates_after']}")
     
     print("\nTesting Shor's Period Finding:")
     period_result = shors_period_finding()
-    print(f"Period finding result: {period_result}")
\ No newline at end of file
+    print(f"Period finding result: {period_result}")
+    timings = {}
+    print(f"Factors of 15: {shors_factor(15, rng=1)}")
+    print(f"Factors of 391: {shors_factor(391, rng=1, timings=timings)}")
+    print("Time per stage: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
\ No newline at end of file
@@ -1,124 +1,183 @@
+import subprocess
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from quantum.state import Qubit
-from quantum.gates import H, apply_gate
+from quantum.gates import H
+from .bloch import bloch_vector, draw_sphere
+
+# matplotlib is imported inside the functions that draw, so state_trajectory
+# (used by the GUI and batch code) does not pay for it
+
+def state_trajectory(gates, initial=None):
+    """States after each gate of a single-qubit sequence as an (F, 2) array
+
+    The running products G_k···G_1 are formed in one vectorized pass with a
+    log-depth prefix scan (F matmuls per step, ⌈log2 F⌉ steps) instead of
+    F sequential gate applications, then applied to the initial state at once.
+    """
+    initial = Qubit().state if initial is None else np.asarray(initial, dtype=complex)
+    prefix = np.array([np.asarray(g, dtype=complex) for g in gates])
+    if prefix.ndim != 3 or prefix.shape[1:] != (2, 2):
+        raise ValueError(f"Expected a sequence of 2x2 gates, got shape {prefix.shape}")
+    shift = 1
+    while shift < len(prefix):
+        # Right-hand side is evaluated before assignment, so this reads the old values
+        prefix[shift:] = prefix[shift:] @ prefix[:-shift]
+        shift *= 2
+    return prefix @ initial
+
+class _Scene:
+    """Probability plot and Bloch sphere: static parts drawn once, animated artists reused"""
+
+    def __init__(self, fig, states):
+        self.states = states
+        self.steps = np.arange(len(states))
+        self.probs = np.abs(states)**2
+        self.x, self.y, self.z = bloch_vector(states)
+        frames = len(states)
+
+        # Create two subplots
+        ax1 = fig.add_subplot(121)  # 2D probability plot
+        ax2 = fig.add_subplot(122, projection='3d')  # 3D Bloch sphere
 
-def animate_qubit():
-    """Animate qubit state evolution on Bloch sphere"""
-    fig = plt.figure(figsize=(10, 5))
-    
-    # Create two subplots
-    ax1 = fig.add_subplot(121)  # 2D probability plot
-    ax2 = fig.add_subplot(122, projection='3d')  # 3D Bloch sphere
-    
-    # Initialize qubit
-    qubit = Qubit()
-    
-    # Data storage for animation
-    probs_0 = []
-    probs_1 = []
-    frames_data = []
-    
-    def init():
-        ax1.clear()
-        ax2.clear()
-        
         # Setup 2D plot
-        ax1.set_xlim(0, 20)
+        ax1.set_xlim(0, max(frames - 1, 1))
         ax1.set_ylim(0, 1)
         ax1.set_xlabel('Time Step')
         ax1.set_ylabel('Probability')
         ax1.set_title('Qubit Measurement Probabilities')
-        ax1.legend(['|0⟩', '|1⟩'])
-        
+        ax1.grid(True)
+        self.line_0, = ax1.plot([], [], 'b-', label='|0⟩', animated=True)
+        self.line_1, = ax1.plot([], [], 'r-', label='|1⟩', animated=True)
+        ax1.legend(loc='upper right')
+
         # Setup 3D Bloch sphere
-        u = np.linspace(0, 2 * np.pi, 20)
-        v = np.linspace(0, np.pi, 20)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-        ax2.plot_surface(x, y, z, color='lightblue', alpha=0.3)
-        
-        ax2.set_xlim([-1.5, 1.5])
-        ax2.set_ylim([-1.5, 1.5])
-        ax2.set_zlim([-1.5, 1.5])
+        draw_sphere(ax2, resolution=20)
         ax2.set_title('Bloch Sphere Evolution')
-        
-        return []
-    
-    def update(frame):
-        # Apply Hadamard gate to evolve the state
-        qubit.state = apply_gate(qubit.state, H)
-        
-        # Calculate probabilities
-        prob_0 = np.abs(qubit.state[0])**2
-        prob_1 = np.abs(qubit.state[1])**2
-        
-        probs_0.append(prob_0)
-        probs_1.append(prob_1)
-        
-        # Update 2D plot
-        ax1.clear()
-        ax1.plot(range(len(probs_0)), probs_0, 'b-', label='|0⟩')
-        ax1.plot(range(len(probs_1)), probs_1, 'r-', label='|1⟩')
-        ax1.set_xlim(0, 20)
-        ax1.set_ylim(0, 1)
-        ax1.set_xlabel('Time Step')
-        ax1.set_ylabel('Probability')
-        ax1.set_title('Qubit Measurement Probabilities')
-        ax1.legend()
-        ax1.grid(True)
-        
-        # Update 3D Bloch sphere
-        ax2.clear()
-        
-        # Redraw sphere
-        u = np.linspace(0, 2 * np.pi, 20)
-        v = np.linspace(0, np.pi, 20)
-        x_sphere = np.outer(np.cos(u), np.sin(v))
-        y_sphere = np.outer(np.sin(u), np.sin(v))
-        z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
-        ax2.plot_surface(x_sphere, y_sphere, z_sphere, color='lightblue', alpha=0.3)
-        
-        # Calculate Bloch coordinates
-        alpha = qubit.state[0]
-        beta = qubit.state[1]
-        
-        x = 2 * np.real(alpha * np.conj(beta))
-        y = 2 * np.imag(alpha * np.conj(beta))
-        z = np.abs(alpha)**2 - np.abs(beta)**2
-        
-        # Draw state vector
-        ax2.quiver(0, 0, 0, x, y, z, color='red', linewidth=3, arrow_length_ratio=0.1)
-        ax2.scatter([x], [y], [z], color='red', s=100)
-        
-        # Add axes
-        ax2.quiver(0, 0, 0, 1.2, 0, 0, color='gray', alpha=0.6, arrow_length_ratio=0.1)
-        ax2.quiver(0, 0, 0, 0, 1.2, 0, color='gray', alpha=0.6, arrow_length_ratio=0.1)
-        ax2.quiver(0, 0, 0, 0, 0, 1.2, color='gray', alpha=0.6, arrow_length_ratio=0.1)
-        
-        ax2.text(0, 0, 1.3, '|0⟩', fontsize=12)
-        ax2.text(0, 0, -1.3, '|1⟩', fontsize=12)
-        
-        ax2.set_xlim([-1.5, 1.5])
-        ax2.set_ylim([-1.5, 1.5])
-        ax2.set_zlim([-1.5, 1.5])
-        ax2.set_title(f'Bloch Sphere (Frame {frame})')
-        
-        return []
-    
-    # Create animation
-    ani = FuncAnimation(fig, update, frames=20, init_func=init, 
-                       blit=False, interval=500, repeat=True)
-    
+        self.arrow, = ax2.plot([0, 0], [0, 0], [0, 1], color='red', linewidth=3, animated=True)
+        self.tip, = ax2.plot([0], [0], [1], 'o', color='red', markersize=10, animated=True)
+        self.label = ax2.text2D(0.02, 0.98, "", transform=ax2.transAxes,
+                                verticalalignment='top', animated=True)
+        self.artists = [self.line_0, self.line_1, self.arrow, self.tip, self.label]
+
+    def init(self):
+        return self.artists
+
+    def update(self, frame):
+        # Views into the precomputed arrays; nothing is recomputed per frame
+        end = frame + 1
+        self.line_0.set_data(self.steps[:end], self.probs[:end, 0])
+        self.line_1.set_data(self.steps[:end], self.probs[:end, 1])
+        x, y, z = self.x[frame], self.y[frame], self.z[frame]
+        self.arrow.set_data_3d([0, x], [0, y], [0, z])
+        self.tip.set_data_3d([x], [y], [z])
+        self.label.set_text(f'Frame {frame}')
+        return self.artists
+
+def _default_gates(gates):
+    return [H] * 20 if gates is None else gates
+
+def animate_qubit(gates=None, initial=None, interval=500, repeat=True, show=True):
+    """Animate qubit state evolution on Bloch sphere
+
+    `gates` is any sequence of 2x2 gates (default: H applied 20 times),
+    starting from `initial` (default |0⟩); one frame per gate.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    states = state_trajectory(_default_gates(gates), initial)
+    fig = plt.figure(figsize=(10, 5))
+    scene = _Scene(fig, states)
     plt.tight_layout()
-    plt.show()
-    
+
+    # Create animation
+    ani = FuncAnimation(fig, scene.update, frames=len(states), init_func=scene.init,
+                        blit=True, interval=interval, repeat=repeat)
+    if show:
+        plt.show()
+
     return ani
 
+class _GifStream:
+    """Write RGB frames to an animated GIF one at a time (shared palette, no buffering)"""
+
+    def __init__(self, path, fps):
+        self.file = open(path, 'wb')
+        self.duration = 1000 / fps
+        self.palette = None
+
+    def write(self, rgba):
+        from PIL import Image, GifImagePlugin
+        image = Image.fromarray(rgba[..., :3])
+        if self.palette is None:
+            # First frame fixes a global palette that every later frame reuses
+            self.palette = image.quantize(colors=256)
+            header, _ = GifImagePlugin.getheader(self.palette, info={'loop': 0})
+            self.file.write(b''.join(header))
+            frame = self.palette
+        else:
+            frame = image.quantize(palette=self.palette)
+        self.file.write(b''.join(GifImagePlugin.getdata(frame, duration=self.duration)))
+
+    def close(self):
+        self.file.write(b';')  # GIF trailer
+        self.file.close()
+
+class _FFmpegStream:
+    """Pipe raw RGBA frames into an ffmpeg process (MP4 and anything ffmpeg writes)"""
+
+    def __init__(self, path, fps, size):
+        from matplotlib.animation import FFMpegWriter
+        if not FFMpegWriter.isAvailable():
+            raise RuntimeError("ffmpeg is required to export video; install it or export a .gif")
+        width, height = size
+        command = [FFMpegWriter.bin_path(), '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}',
+                   '-r', str(fps), '-i', '-',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, rgba):
+        self.process.stdin.write(rgba.tobytes())
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+def export_animation(path, gates=None, initial=None, fps=20, dpi=100, figsize=(10, 5)):
+    """Render the animation to a .gif or video file without opening a window
+
+    Uses an offscreen Agg canvas: the static scene is drawn once and cached,
+    and each frame is blitted over it and streamed straight to the writer,
+    so memory stays flat however many frames there are. Returns the frame count.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    states = state_trajectory(_default_gates(gates), initial)
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    scene = _Scene(fig, states)
+    fig.tight_layout()
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+    if path.lower().endswith('.gif'):
+        stream = _GifStream(path, fps)
+    else:
+        stream = _FFmpegStream(path, fps, (width, height))
+    try:
+        for frame in range(len(states)):
+            canvas.restore_region(background)
+            for artist in scene.update(frame):
+                artist.axes.draw_artist(artist)
+            stream.write(np.asarray(canvas.buffer_rgba()))
+    finally:
+        stream.close()
+    return len(states)
+
 def plot_quantum_circuit():
     """Plot a simple quantum circuit diagram"""
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(8, 4))
     
     # Draw circuit lines
@@ -157,4 +216,9 @@ def plot_quantum_circuit():
     plt.show()
 
 if __name__ == "__main__":
-    animate_qubit()
\ No newline at end of file
+    import sys
+    if len(sys.argv) > 1:
+        # python -m visualization.animate out.gif: headless export
+        print(f"Wrote {export_animation(sys.argv[1])} frames to {sys.argv[1]}")
+    else:
+        animate_qubit()
\ No newline at end of file
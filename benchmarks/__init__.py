@@ -0,0 +1,4 @@
+"""Headless benchmark suite: `python -m quantum.benchmarks run|compare`.
+
+See runner.py for the timing/memory harness and cases.py for what is measured.
+"""
@@ -0,0 +1,49 @@
+"""Command line: run the suite to JSON, or compare two result files.
+
+    python -m quantum.benchmarks run -o results.json [--quick] [--case qft ...]
+    python -m quantum.benchmarks compare baseline.json results.json [--threshold 0.25]
+
+`compare` exits with status 1 when any case regressed, so it can gate a deploy.
+"""
+import argparse
+import sys
+from .cases import CASES
+from .runner import run_suite, write_results, load_results, compare, format_record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m quantum.benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='time the benchmark cases')
+    run.add_argument('-o', '--output', default='benchmark_results.json')
+    run.add_argument('--quick', action='store_true', help='small grids for CI gating')
+    run.add_argument('--case', action='append', choices=sorted(CASES), help='run only these cases')
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--min-time', type=float, default=0.05, help='seconds per timing sample')
+    cmp = commands.add_parser('compare', help='flag regressions against a baseline')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    cmp.add_argument('--memory-threshold', type=float, default=0.25, help='allowed relative peak-memory growth')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        document = run_suite(args.case, args.quick, args.repeat, args.min_time,
+                             log=lambda record: print(format_record(record), flush=True))
+        write_results(document, args.output)
+        print(f"Wrote {len(document['results'])} results to {args.output}")
+        return 0
+
+    rows = compare(load_results(args.baseline), load_results(args.current),
+                   args.threshold, memory_threshold=args.memory_threshold)
+    regressions = [row for row in rows if row['regression']]
+    for row in rows:
+        params = ' '.join(f"{k}={v}" for k, v in row['params'].items())
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f"{row['case']:<20} {params:<40} {row['metric']:<10} x{row['ratio']:6.2f} {flag}")
+    print(f"{len(regressions)} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
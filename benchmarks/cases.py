@@ -0,0 +1,200 @@
+"""Benchmark cases: each builds its inputs once and returns the timed callable.
+
+A case is `setup(**params) -> run`, registered with the parameter grid it is
+measured over. `quick` grids are small enough for a pre-deploy gate.
+"""
+import os
+import subprocess
+import sys
+import numpy as np
+from ..sweep import parameter_grid
+from ..precision import default_dtype
+from ..gates import H, X, Z, CNOT
+from ..gate_factory import ry
+from .. import parallel
+from ..register import QuantumRegister, BatchedRegister
+from ..state import Qubit
+from ..protocols import teleport, teleport_batch
+from ..algorithms import grovers_search, bernstein_vazirani
+from ..transforms import qft
+from ..circuit import Circuit
+from ..mps import MPSRegister
+from ..observables import expectation
+
+CASES = {}
+
+# Largest statevector (amplitudes x batch) a case may allocate
+MAX_AMPLITUDES = 2**22
+
+DTYPES = ['complex64', 'complex128']
+
+# Kernel thread counts for the scaling case, up to this machine's cores
+THREADS = [t for t in (1, 2, 4, 8, 16, 32) if t <= (os.cpu_count() or 1)]
+
+
+def case(name, full, quick):
+    """Register setup under `name` with its full and quick parameter grids."""
+    def register(setup):
+        CASES[name] = {'setup': setup, 'full': full, 'quick': quick}
+        return setup
+    return register
+
+
+def _fits(params):
+    return 2**params.get('n_qubits', 0) * params.get('batch_size', 1) <= MAX_AMPLITUDES
+
+
+def _grid(**axes):
+    return [p for p in parameter_grid(**axes) if _fits(p)]
+
+
+@case('apply_gate',
+      full=_grid(n_qubits=[10, 14, 18, 22], batch_size=[1, 64], dtype=DTYPES),
+      quick=_grid(n_qubits=[10, 16], batch_size=[1, 16], dtype=DTYPES))
+def apply_gate(n_qubits, batch_size, dtype):
+    if batch_size == 1:
+        register = QuantumRegister(n_qubits, dtype=dtype)
+    else:
+        register = BatchedRegister(n_qubits, batch_size=batch_size, dtype=dtype)
+    target = n_qubits // 2
+    return lambda: register.apply_gate(H, target)
+
+
+@case('apply_gate_threads',
+      full=_grid(n_qubits=[22], gate=['H', 'Z', 'X'], target=['high', 'low'], threads=THREADS),
+      quick=_grid(n_qubits=[20], gate=['H'], target=['high'], threads=THREADS[:3]))
+def apply_gate_threads(n_qubits, gate, target, threads):
+    # Dense, diagonal and permutation kernels; 'high' is qubit 0 (largest stride)
+    register = QuantumRegister(n_qubits)
+    op = {'H': H, 'Z': Z, 'X': X}[gate]
+    qubit = 0 if target == 'high' else n_qubits - 1
+
+    def run():
+        with parallel.num_threads(threads):
+            register.apply_gate(op, qubit)
+    return run
+
+
+@case('teleport',
+      full=_grid(batch_size=[1, 1024, 65536], dtype=DTYPES),
+      quick=_grid(batch_size=[1, 1024], dtype=DTYPES))
+def teleport_case(batch_size, dtype):
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(batch_size, 2)) + 1j * rng.normal(size=(batch_size, 2))
+    states /= np.linalg.norm(states, axis=1, keepdims=True)
+    if batch_size == 1:
+        def run():
+            with default_dtype(dtype):
+                return teleport(Qubit(states[0]), 'Alice', 'Bob')
+        return run
+
+    def run():
+        with default_dtype(dtype):
+            return teleport_batch(states, rng)
+    return run
+
+
+@case('grovers_search',
+      full=_grid(n_qubits=[8, 12, 16, 20], dtype=DTYPES),
+      quick=_grid(n_qubits=[8, 12], dtype=DTYPES))
+def grover_case(n_qubits, dtype):
+    target = [1, 0] * (n_qubits // 2)
+
+    def run():
+        with default_dtype(dtype):
+            return grovers_search(n_qubits, target_state=target, shots=100, rng=0)
+    return run
+
+
+@case('bernstein_vazirani',
+      full=_grid(n_bits=[16, 256, 2048]),
+      quick=_grid(n_bits=[16, 256]))
+def bernstein_vazirani_case(n_bits):
+    secret = ''.join(np.random.default_rng(0).choice(['0', '1'], n_bits))
+    return lambda: bernstein_vazirani(secret, rng=0)
+
+
+@case('qft',
+      full=_grid(n_qubits=[8, 12, 16, 20], method=['gates', 'fft'], dtype=DTYPES),
+      quick=_grid(n_qubits=[8, 12], method=['gates', 'fft'], dtype=DTYPES))
+def qft_case(n_qubits, method, dtype):
+    register = QuantumRegister(n_qubits, dtype=dtype)
+    return lambda: qft(register, method=method)
+
+
+@case('mps',
+      full=_grid(workload=['qft', 'brickwork'], width=[64, 128], max_bond=[16, 64]),
+      quick=_grid(workload=['qft', 'brickwork'], width=[32], max_bond=[16]))
+def mps_case(workload, width, max_bond):
+    # `width` rather than n_qubits: these sizes have no statevector to fit
+    if workload == 'qft':
+        # QFT of a basis state: every intermediate state is a product state
+        return lambda: qft(MPSRegister(width, max_bond=max_bond))
+    rng = np.random.default_rng(0)
+    circuit = Circuit(width)
+    for layer in range(8):
+        for q in range(width):
+            circuit.apply_gate(ry(rng.uniform(0, np.pi)), q)
+        for q in range(layer % 2, width - 1, 2):
+            circuit.apply_gate(CNOT, [q, q + 1])
+
+    def run():
+        register = circuit.run(MPSRegister(width, max_bond=max_bond))
+        return register.counts(100, rng=0)
+    return run
+
+
+@case('expectation',
+      full=_grid(n_qubits=[12, 16, 20], dtype=DTYPES),
+      quick=_grid(n_qubits=[12], dtype=DTYPES))
+def expectation_case(n_qubits, dtype):
+    # Heisenberg chain plus a transverse field: 4n - 3 terms in 2n flip groups
+    terms = {}
+    for q in range(n_qubits - 1):
+        for pair in ('XX', 'YY', 'ZZ'):
+            terms['I' * q + pair + 'I' * (n_qubits - q - 2)] = 1.0
+    for q in range(n_qubits):
+        terms['I' * q + 'X' + 'I' * (n_qubits - q - 1)] = 0.5
+    rng = np.random.default_rng(0)
+    register = QuantumRegister(n_qubits, rng.normal(size=2**n_qubits) + 0j, dtype=dtype)
+    return lambda: expectation(register, terms)
+
+
+# Package name as imported here (quantum, or whatever the checkout is called)
+_PACKAGE = __package__.rpartition('.')[0]
+
+
+@case('startup',
+      full=_grid(target=['numpy', 'register', 'protocols', 'algorithms', 'cli']),
+      quick=_grid(target=['numpy', 'protocols', 'cli']))
+def startup_case(target):
+    # A fresh interpreter per sample: module imports, or a whole one-shot CLI
+    # job; 'numpy' alone is the floor the others are read against
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(root), os.environ.get('PYTHONPATH', '')]))
+    if target == 'cli':
+        command = [sys.executable, '-m', _PACKAGE, 'ghz', '--shots', '1']
+    elif target == 'numpy':
+        command = [sys.executable, '-c', 'import numpy']
+    else:
+        command = [sys.executable, '-c', f'import {_PACKAGE}.{target}']
+    return lambda: subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+@case('bloch_render', full=_grid(path=['blit', 'full_draw']), quick=_grid(path=['blit']))
+def bloch_case(path):
+    # The widget's renderer on a headless Agg canvas
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from ..bloch import BlochRenderer
+    figure = Figure(figsize=(6, 6))
+    FigureCanvasAgg(figure)
+    renderer = BlochRenderer(figure)
+    states = [np.array([np.cos(t), np.exp(1j * t) * np.sin(t)]) for t in np.linspace(0, np.pi, 64)]
+    frame = iter(range(10**12))
+    if path == 'full_draw':
+        def run():
+            renderer.set_state(states[next(frame) % 64])
+            figure.canvas.draw()
+        return run
+    return lambda: renderer.update(states[next(frame) % 64])
@@ -0,0 +1,117 @@
+"""Timing and peak-memory harness, JSON results and baseline comparison."""
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+from ..sweep import jsonable
+from .cases import CASES
+
+
+def _key(record):
+    return record['case'] + json.dumps(record['params'], sort_keys=True)
+
+
+def measure(run, repeat=5, min_time=0.05):
+    """Best, median and mean wall time of `run` plus its peak traced bytes.
+
+    Each of the `repeat` samples loops run() until min_time has elapsed so
+    fast cases are not dominated by timer resolution. Memory is measured in
+    a separate call, since tracemalloc slows allocation-heavy code.
+    """
+    run()  # warm caches (gate tables, FFT plans, imports)
+    samples = []
+    for _ in range(repeat):
+        loops, start = 0, time.perf_counter()
+        while True:
+            run()
+            loops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        samples.append(elapsed / loops)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'best': min(samples), 'median': float(np.median(samples)),
+            'mean': float(np.mean(samples)), 'peak_bytes': peak}
+
+
+def run_suite(names=None, quick=False, repeat=5, min_time=0.05, log=None):
+    """Run the selected cases (all by default); returns a results document.
+
+    Cases whose optional dependencies are missing (the Bloch renderer needs
+    matplotlib, though it draws on an Agg canvas without Qt or a display)
+    are recorded as skipped rather than failing the suite.
+    """
+    records = []
+    for name in names or CASES:
+        spec = CASES[name]
+        for params in spec['quick' if quick else 'full']:
+            record = {'case': name, 'params': params}
+            try:
+                run = spec['setup'](**params)
+            except ImportError as exc:
+                record['skipped'] = str(exc)
+            else:
+                record.update(measure(run, repeat, min_time))
+            records.append(record)
+            if log is not None:
+                log(record)
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'quick': quick,
+        'results': records,
+    }
+
+
+def write_results(document, path):
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, default=jsonable)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.25, metric='median', memory_threshold=0.25,
+            min_bytes=2**20):
+    """Match results by (case, params) and flag slowdowns and memory growth.
+
+    Returns a list of rows with the baseline/current values, their ratio and
+    a 'regression' flag set when the ratio exceeds 1 + threshold. Peak memory
+    must also grow by at least `min_bytes`, so small allocations don't flap.
+    """
+    old = {_key(r): r for r in baseline['results'] if 'skipped' not in r}
+    rows = []
+    for record in current['results']:
+        ref = old.get(_key(record))
+        if ref is None or 'skipped' in record:
+            continue
+        for field, limit in ((metric, threshold), ('peak_bytes', memory_threshold)):
+            before, after = ref[field], record[field]
+            ratio = after / before if before else float('inf') if after else 1.0
+            regression = ratio > 1 + limit
+            if field == 'peak_bytes':
+                regression = regression and after - before >= min_bytes
+            rows.append({'case': record['case'], 'params': record['params'], 'metric': field,
+                         'baseline': before, 'current': after, 'ratio': ratio,
+                         'regression': regression})
+    return rows
+
+
+def format_record(record):
+    params = ' '.join(f"{k}={v}" for k, v in record['params'].items())
+    if 'skipped' in record:
+        return f"{record['case']:<20} {params:<40} skipped: {record['skipped']}"
+    return (f"{record['case']:<20} {params:<40} {record['median'] * 1e3:10.3f} ms "
+            f"{record['peak_bytes'] / 2**20:9.2f} MiB")
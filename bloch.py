@@ -0,0 +1,187 @@
+# visualization/bloch.py
+import numpy as np
+
+
+def bloch_vector(state):
+    """Bloch coordinates (x, y, z) of a single-qubit state α|0⟩ + β|1⟩
+
+    Broadcasts over leading axes: a (F, 2) array of states gives three (F,) arrays.
+    """
+    state = np.asarray(state)
+    state = state / np.linalg.norm(state, axis=-1, keepdims=True)
+    alpha, beta = state[..., 0], state[..., 1]
+    coherence = np.conj(alpha) * beta
+    return 2 * np.real(coherence), 2 * np.imag(coherence), np.abs(alpha)**2 - np.abs(beta)**2
+
+
+def draw_sphere(ax, resolution=50, labels=True):
+    """Draw the static Bloch sphere structure (surface, axes, labels) on a 3D axes"""
+    # Create sphere surface
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    x = np.outer(np.cos(u), np.sin(v))
+    y = np.outer(np.sin(u), np.sin(v))
+    z = np.outer(np.ones(np.size(u)), np.cos(v))
+
+    # Plot sphere with transparency
+    ax.plot_surface(x, y, z, color='lightblue', alpha=0.2)
+
+    # Add coordinate axes
+    ax.quiver(0, 0, 0, 1.2, 0, 0, color='gray', alpha=0.8, arrow_length_ratio=0.1)
+    ax.quiver(0, 0, 0, 0, 1.2, 0, color='gray', alpha=0.8, arrow_length_ratio=0.1)
+    ax.quiver(0, 0, 0, 0, 0, 1.2, color='gray', alpha=0.8, arrow_length_ratio=0.1)
+
+    if labels:
+        # Add axis labels and the |0⟩ / |1⟩ poles
+        ax.text(1.3, 0, 0, 'X', fontsize=12)
+        ax.text(0, 1.3, 0, 'Y', fontsize=12)
+        ax.text(0, 0, 1.3, 'Z', fontsize=12)
+        ax.text(0, 0, 1.1, '|0⟩', fontsize=14, ha='center')
+        ax.text(0, 0, -1.1, '|1⟩', fontsize=14, ha='center')
+
+    # Set equal aspect ratio and limits
+    ax.set_xlim([-1.5, 1.5])
+    ax.set_ylim([-1.5, 1.5])
+    ax.set_zlim([-1.5, 1.5])
+
+    # Remove axis ticks
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_zticks([])
+
+
+class BlochRenderer:
+    """Bloch sphere on a matplotlib figure, redrawn by blitting only the state.
+
+    The sphere, axes and labels are drawn once; every full draw (first show,
+    resize, mouse rotation) re-captures them as a cached background. The
+    state arrow, tip and text are persistent animated artists, so an update
+    restores the background, redraws those few artists and blits. Works on
+    any canvas, including the headless Agg one.
+    """
+
+    def __init__(self, figure, ax=None):
+        self.figure = figure
+        self.ax = ax if ax is not None else figure.add_subplot(111, projection='3d')
+        self._background = None
+        self.setup_sphere()
+
+        # Persistent state artists, excluded from normal draws (animated=True)
+        self.arrow, = self.ax.plot([0, 0], [0, 0], [0, 1], color='red', linewidth=3, animated=True)
+        self.tip, = self.ax.plot([0], [0], [1], 'o', color='red', markersize=10, alpha=0.8, animated=True)
+        self.state_text = self.ax.text2D(0.02, 0.98, "", transform=self.ax.transAxes,
+                                         fontsize=10, verticalalignment='top', animated=True,
+                                         bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.5))
+        self.coord_text = self.ax.text2D(0.02, 0.90, "", transform=self.ax.transAxes,
+                                         fontsize=10, verticalalignment='top', animated=True,
+                                         bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen", alpha=0.5))
+        self.artists = [self.arrow, self.tip, self.state_text, self.coord_text]
+        self.figure.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def setup_sphere(self):
+        """Draw the static Bloch sphere structure (called once)"""
+        draw_sphere(self.ax)
+
+    def set_state(self, state):
+        """Point the persistent artists at a new state without drawing"""
+        state = np.asarray(state) / np.linalg.norm(state)
+        x, y, z = bloch_vector(state)
+        self.arrow.set_data_3d([0, x], [0, y], [0, z])
+        self.tip.set_data_3d([x], [y], [z])
+        self.state_text.set_text(f"State: {state[0]:.3f}|0⟩ + {state[1]:.3f}|1⟩")
+        self.coord_text.set_text(f"Bloch coords: ({x:.3f}, {y:.3f}, {z:.3f})")
+
+    def _on_draw(self, event):
+        # A full draw just happened: cache it, then put the state back on top
+        canvas = self.figure.canvas
+        self._background = canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def update(self, state):
+        """Show a new state: blit over the cached background (full draw only if none yet)"""
+        self.set_state(state)
+        canvas = self.figure.canvas
+        if self._background is None:
+            canvas.draw()  # triggers _on_draw, which caches the background
+            return
+        canvas.restore_region(self._background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        canvas.blit(self.figure.bbox)
+
+
+class BlochGridRenderer:
+    """One small Bloch sphere per qubit, updated incrementally by blitting.
+
+    Static spheres are drawn once and cached with the rest of the figure.
+    An update compares the new Bloch vectors with those on screen and only
+    restores, redraws and blits the spheres that moved by more than
+    `tolerance`. An arrow shorter than 1 marks a mixed (entangled) qubit;
+    each sphere's label shows its purity.
+    """
+
+    def __init__(self, figure, n_qubits, cols=None, tolerance=1e-3):
+        self.figure = figure
+        self.n_qubits = n_qubits
+        self.tolerance = tolerance
+        cols = cols or int(np.ceil(np.sqrt(n_qubits)))
+        rows = int(np.ceil(n_qubits / cols))
+        self.axes, self.arrows, self.tips, self.labels = [], [], [], []
+        for q in range(n_qubits):
+            ax = figure.add_subplot(rows, cols, q + 1, projection='3d')
+            draw_sphere(ax, resolution=12, labels=False)
+            arrow, = ax.plot([0, 0], [0, 0], [0, 1], color='red', linewidth=2, animated=True)
+            tip, = ax.plot([0], [0], [1], 'o', color='red', markersize=4, animated=True)
+            label = ax.text2D(0.5, 0.98, f"q{q}  purity 1.00", transform=ax.transAxes, ha='center',
+                              va='top', fontsize=8, animated=True)
+            self.axes.append(ax)
+            self.arrows.append(arrow)
+            self.tips.append(tip)
+            self.labels.append(label)
+        self.vectors = np.tile([0.0, 0.0, 1.0], (n_qubits, 1))  # on screen (|0⟩ initially)
+        self._backgrounds = None  # one cached region per sphere
+        self._cid = self.figure.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def disconnect(self):
+        """Stop caching backgrounds, e.g. before the figure is cleared for a new grid"""
+        self.figure.canvas.mpl_disconnect(self._cid)
+
+    def _draw_qubit(self, q):
+        ax = self.axes[q]
+        for artist in (self.arrows[q], self.tips[q], self.labels[q]):
+            ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        # A full draw just happened: cache each sphere, then put every state back on top
+        canvas = self.figure.canvas
+        self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in self.axes]
+        for q in range(self.n_qubits):
+            self._draw_qubit(q)
+
+    def set_vectors(self, vectors, purities=None):
+        """Move the artists of qubits whose vector changed; returns their indices"""
+        vectors = np.asarray(vectors, dtype=float).reshape(self.n_qubits, 3)
+        if purities is None:
+            purities = (1 + np.sum(vectors**2, axis=-1)) / 2
+        changed = np.flatnonzero(np.max(np.abs(vectors - self.vectors), axis=-1) > self.tolerance)
+        for q in changed:
+            x, y, z = vectors[q]
+            self.arrows[q].set_data_3d([0, x], [0, y], [0, z])
+            self.tips[q].set_data_3d([x], [y], [z])
+            self.labels[q].set_text(f"q{q}  purity {purities[q]:.2f}")
+        self.vectors[changed] = vectors[changed]
+        return changed
+
+    def update(self, vectors, purities=None):
+        """Show new Bloch vectors (n, 3), redrawing only the spheres that changed"""
+        changed = self.set_vectors(vectors, purities)
+        canvas = self.figure.canvas
+        if self._backgrounds is None:
+            canvas.draw()  # triggers _on_draw, which caches the backgrounds
+            return changed
+        for q in changed:
+            canvas.restore_region(self._backgrounds[q])
+            self._draw_qubit(q)
+            canvas.blit(self.axes[q].bbox)
+        return changed
@@ -1,100 +1,131 @@
 # visualization/bloch_qt.py
+import time
 import numpy as np
 from PyQt5.QtWidgets import QVBoxLayout, QWidget, QLabel
+from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 from mpl_toolkits.mplot3d import Axes3D
+from .bloch import BlochRenderer, BlochGridRenderer
+
+class FrameCoalescer:
+    """Call `render(payload)` at most `fps` times per second.
+
+    Payloads arriving faster than the frame interval replace the pending
+    one; a single-shot timer renders whichever is newest when it fires.
+    """
+
+    def __init__(self, parent, render, fps=60):
+        self.render = render
+        self.frame_interval = 1.0 / fps
+        self._pending = None
+        self._last_frame = 0.0
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def submit(self, payload):
+        self._pending = payload
+        if self._timer.isActive():
+            return
+        wait = self._last_frame + self.frame_interval - time.perf_counter()
+        if wait <= 0:
+            self.flush()
+        else:
+            self._timer.start(int(wait * 1000) + 1)
+
+    def flush(self):
+        """Render the pending payload now"""
+        if self._pending is None:
+            return
+        payload, self._pending = self._pending, None
+        self._last_frame = time.perf_counter()
+        self.render(payload)
 
 class BlochSphereWidget(QWidget):
-    def __init__(self, parent=None):
+    """Live Bloch sphere: blitted updates, coalesced to at most `fps` frames per second"""
+
+    def __init__(self, parent=None, fps=60):
         super().__init__(parent)
         self.figure = Figure(figsize=(6, 6))
         self.canvas = FigureCanvasQTAgg(self.figure)
-        self.ax = self.figure.add_subplot(111, projection='3d')
-        
+        self.renderer = BlochRenderer(self.figure)
+        self.ax = self.renderer.ax
+
         # Add title label
         self.title_label = QLabel("Bloch Sphere Visualization")
         self.title_label.setStyleSheet("font-size: 14px; font-weight: bold; margin: 5px;")
-        
+
         layout = QVBoxLayout()
         layout.addWidget(self.title_label)
         layout.addWidget(self.canvas)
         self.setLayout(layout)
-        
-        self.setup_sphere()
-        
-    def setup_sphere(self):
-        """Set up the basic Bloch sphere structure"""
-        self.ax.clear()
-        
-        # Create sphere surface
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi, 50)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-        
-        # Plot sphere with transparency
-        self.ax.plot_surface(x, y, z, color='lightblue', alpha=0.2)
-        
-        # Add coordinate axes
-        self.ax.quiver(0, 0, 0, 1.2, 0, 0, color='gray', alpha=0.8, arrow_length_ratio=0.1)
-        self.ax.quiver(0, 0, 0, 0, 1.2, 0, color='gray', alpha=0.8, arrow_length_ratio=0.1)
-        self.ax.quiver(0, 0, 0, 0, 0, 1.2, color='gray', alpha=0.8, arrow_length_ratio=0.1)
-        
-        # Add labels
-        self.ax.text(1.3, 0, 0, 'X', fontsize=12)
-        self.ax.text(0, 1.3, 0, 'Y', fontsize=12)
-        self.ax.text(0, 0, 1.3, 'Z', fontsize=12)
-        
-        # Add |0⟩ and |1⟩ labels
-        self.ax.text(0, 0, 1.1, '|0⟩', fontsize=14, ha='center')
-        self.ax.text(0, 0, -1.1, '|1⟩', fontsize=14, ha='center')
-        
-        # Set equal aspect ratio and limits
-        self.ax.set_xlim([-1.5, 1.5])
-        self.ax.set_ylim([-1.5, 1.5])
-        self.ax.set_zlim([-1.5, 1.5])
-        
-        # Remove axis ticks
-        self.ax.set_xticks([])
-        self.ax.set_yticks([])
-        self.ax.set_zticks([])
-        
+
+        self.frames = FrameCoalescer(self, self._render, fps)
+
     def plot_qubit(self, state):
-        """Plot a qubit state on the Bloch sphere"""
-        self.setup_sphere()
-        
-        # Normalize state if needed
-        state = state / np.linalg.norm(state)
-        
-        # Extract amplitudes
-        alpha = state[0]  # |0⟩ amplitude
-        beta = state[1]   # |1⟩ amplitude
-        
-        # Calculate Bloch sphere coordinates
-        # For a qubit state |ψ⟩ = α|0⟩ + β|1⟩
-        # Bloch coordinates are:
-        x = 2 * np.real(alpha * np.conj(beta))
-        y = 2 * np.imag(alpha * np.conj(beta))
-        z = np.abs(alpha)**2 - np.abs(beta)**2
-        
-        # Plot the state vector
-        self.ax.quiver(0, 0, 0, x, y, z, 
-                      color='red', linewidth=3, arrow_length_ratio=0.1)
-        
-        # Add a point at the tip
-        self.ax.scatter([x], [y], [z], color='red', s=100, alpha=0.8)
-        
-        # Add state information as text
-        state_info = f"State: {alpha:.3f}|0⟩ + {beta:.3f}|1⟩"
-        coord_info = f"Bloch coords: ({x:.3f}, {y:.3f}, {z:.3f})"
-        self.ax.text2D(0.02, 0.98, state_info, transform=self.ax.transAxes, 
-                       fontsize=10, verticalalignment='top',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.5))
-        self.ax.text2D(0.02, 0.90, coord_info, transform=self.ax.transAxes, 
-                       fontsize=10, verticalalignment='top',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen", alpha=0.5))
-        
-        # Update canvas
-        self.canvas.draw()
\ No newline at end of file
+        """Plot a qubit state on the Bloch sphere (coalesced to the frame rate)"""
+        self.frames.submit(np.asarray(state))
+
+    def flush(self):
+        """Render the pending state now"""
+        self.frames.flush()
+
+    def _render(self, state):
+        if self.canvas.isVisible():
+            self.renderer.update(state)
+        else:
+            # Not shown yet: just update the artists; the first paint draws them
+            self.renderer.set_state(state)
+            self.canvas.draw_idle()
+
+class BlochGridWidget(QWidget):
+    """Live grid of per-qubit Bloch spheres for a whole register.
+
+    Each update redraws only the spheres whose Bloch vector moved, and
+    updates are coalesced to at most `fps` frames per second. The grid is
+    rebuilt when a register of a different size arrives.
+    """
+
+    def __init__(self, parent=None, fps=15):
+        super().__init__(parent)
+        self.figure = Figure(figsize=(6, 6))
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.renderer = None
+
+        self.title_label = QLabel("Register Bloch Vectors")
+        self.title_label.setStyleSheet("font-size: 14px; font-weight: bold; margin: 5px;")
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+        self.frames = FrameCoalescer(self, self._render, fps)
+
+    def plot_register(self, register):
+        """Plot every qubit of a QuantumRegister or DensityMatrix"""
+        self.plot_vectors(register.bloch_vectors(), register.purities())
+
+    def plot_vectors(self, vectors, purities=None):
+        """Plot precomputed (n, 3) Bloch vectors (coalesced to the frame rate)"""
+        self.frames.submit((np.asarray(vectors), purities))
+
+    def flush(self):
+        """Render the pending vectors now"""
+        self.frames.flush()
+
+    def _render(self, payload):
+        vectors, purities = payload
+        if self.renderer is None or self.renderer.n_qubits != len(vectors):
+            if self.renderer is not None:
+                self.renderer.disconnect()
+            self.figure.clear()
+            self.renderer = BlochGridRenderer(self.figure, len(vectors))
+            self.renderer.set_vectors(vectors, purities)
+            self.canvas.draw_idle()
+        elif self.canvas.isVisible():
+            self.renderer.update(vectors, purities)
+        else:
+            self.renderer.set_vectors(vectors, purities)
+            self.canvas.draw_idle()
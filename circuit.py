@@ -0,0 +1,366 @@
+from collections import namedtuple
+import numpy as np
+from .gates import H, X, Z, CNOT, SWAP, is_diagonal
+from .gate_factory import fused
+from . import instrument
+from .register import QuantumRegister, BatchedRegister, _as_targets
+from .sampling import sample_indices, indices_to_bits, counts_from_bits
+from .stabilizer import StabilizerState, clifford_decomposition
+from .mps import MPSRegister
+
+# Measurements have gate=None and write their outcomes to `clbits`; a gate with
+# a `condition` (clbits, value) only runs when those classical bits read `value`
+Operation = namedtuple('Operation', ['name', 'gate', 'targets', 'controls', 'condition', 'clbits'],
+                       defaults=(None, ()))
+
+
+_NAMED_GATES = [('H', H), ('X', X), ('Z', Z), ('CNOT', CNOT), ('SWAP', SWAP)]
+
+
+def _gate_name(gate):
+    for name, known in _NAMED_GATES:
+        if gate.shape == known.shape and np.allclose(gate, known):
+            return name
+    return f"U{gate.shape[0]}"
+
+
+def _is_identity(gate):
+    return np.allclose(gate, np.eye(gate.shape[0]), rtol=0, atol=1e-12)
+
+
+def _is_barrier(op):
+    # Measurements and classically conditioned gates are never fused or moved
+    return op.gate is None or op.condition is not None
+
+
+def _read_value(clbits, bits):
+    """Integer read from the listed classical bits (bits[0] most significant)"""
+    weights = 1 << np.arange(len(bits) - 1, -1, -1)
+    return clbits[..., list(bits)] @ weights
+
+
+def _apply_operation(register, op, clbits, rng):
+    """Apply one operation; measurements write their bits into `clbits` in place"""
+    if op.gate is None:
+        clbits[..., list(op.clbits)] = register.measure_qubits(op.targets, rng)
+        return
+    if op.condition is not None:
+        fire = _read_value(clbits, op.condition[0]) == op.condition[1]
+        if not np.any(fire):
+            return
+        if not np.all(fire):
+            # Batch members disagree: run the gate on the members that fired
+            sub = BatchedRegister(register.n_qubits, register.state[fire], dtype=register.dtype)
+            _apply_operation(sub, op._replace(condition=None), clbits[fire], rng)
+            register.state[fire] = sub.state
+            return
+    if op.controls:
+        register.apply_controlled(op.gate, op.controls, op.targets)
+    else:
+        register.apply_gate(op.gate, op.targets)
+
+
+class Circuit:
+    """Recorded list of gate operations on an n-qubit register.
+
+    Exposes the same apply_gate/apply_controlled interface as QuantumRegister,
+    so code written against a register can record into a circuit instead and
+    have the circuit optimized before it is executed.
+
+    Circuits may also measure qubits mid-circuit into `n_clbits` classical
+    bits and condition later gates on them (feed-forward); see execute() for
+    one shot and BranchCache for many.
+    """
+
+    def __init__(self, n_qubits, n_clbits=0):
+        self.n_qubits = n_qubits
+        self.n_clbits = n_clbits
+        self.operations = []
+        self.stats = None
+
+    def apply_gate(self, gate, targets, name=None, condition=None):
+        """Record a gate on the target qubits."""
+        return self.apply_controlled(gate, (), targets, name, condition)
+
+    def apply_controlled(self, gate, controls, targets, name=None, condition=None):
+        """Record a gate on targets, conditioned on all controls being |1⟩.
+
+        With `condition=(clbits, value)` the gate only runs when the classical
+        bits (an index or a sequence, first most significant) read `value`.
+        """
+        controls = _as_targets(controls)
+        targets = _as_targets(targets)
+        gate = np.asarray(gate)
+        if gate.shape != (2**len(targets),) * 2:
+            raise ValueError(f"Gate dimension {gate.shape} incompatible with targets {targets}")
+        if condition is not None:
+            bits, value = condition
+            bits = _as_targets(bits)
+            if not 0 <= value < 2**len(bits):
+                raise ValueError(f"Condition value {value} does not fit {len(bits)} classical bits")
+            self.n_clbits = max(self.n_clbits, max(bits) + 1)
+            condition = (bits, int(value))
+        self.operations.append(Operation(name or _gate_name(gate), gate, targets, controls, condition))
+        return self
+
+    def measure(self, qubits, clbits=None):
+        """Record a projective Z measurement of qubits into classical bits (default: same indices)."""
+        qubits = _as_targets(qubits)
+        clbits = qubits if clbits is None else _as_targets(clbits)
+        if len(clbits) != len(qubits):
+            raise ValueError(f"{len(qubits)} qubits cannot be measured into {len(clbits)} classical bits")
+        self.n_clbits = max(self.n_clbits, max(clbits) + 1)
+        self.operations.append(Operation('measure', None, qubits, (), None, clbits))
+        return self
+
+    @property
+    def has_measurements(self):
+        return any(op.gate is None for op in self.operations)
+
+    @property
+    def gate_count(self):
+        return len(self.operations)
+
+    def __len__(self):
+        return len(self.operations)
+
+    def optimize(self):
+        """Return an equivalent circuit with fused, cancelled and merged gates.
+
+        - runs of single-qubit gates on the same wire are fused into one 2x2
+        - adjacent operations on the same wires whose product is the identity
+          (H·H, X·X, CNOT·CNOT, ...) are dropped
+        - adjacent diagonal operations on the same wires are merged into one
+        The reduction is reported in the returned circuit's `stats`.
+        """
+        out = []
+        pending = {}  # wire -> accumulated single-qubit gate
+        last = {}  # wire -> index in `out` of the last operation touching it
+        stats = {'gates_before': len(self.operations), 'fused': 0, 'cancelled': 0, 'merged': 0}
+
+        def emit(op):
+            wires = op.controls + op.targets
+            prev = {last.get(w) for w in wires}
+            if len(prev) == 1 and None not in prev and not _is_barrier(op):
+                i = prev.pop()
+                old = out[i]
+                if old is not None and not _is_barrier(old) and old.targets == op.targets \
+                        and set(old.controls) == set(op.controls):
+                    product = fused(old.gate, op.gate)
+                    if _is_identity(product):
+                        out[i] = None
+                        stats['cancelled'] += 2
+                        for w in wires:
+                            del last[w]
+                        return
+                    if is_diagonal(old.gate) and is_diagonal(op.gate):
+                        out[i] = old._replace(name=f"{old.name}·{op.name}", gate=product)
+                        stats['merged'] += 1
+                        return
+            out.append(op)
+            for w in wires:
+                last[w] = len(out) - 1
+
+        def flush(wire):
+            if wire in pending:
+                name, gate, count = pending.pop(wire)
+                if _is_identity(gate):
+                    stats['cancelled'] += count
+                else:
+                    stats['fused'] += count - 1
+                    emit(Operation(name, gate, (wire,), ()))
+
+        for op in self.operations:
+            if not op.controls and len(op.targets) == 1 and not _is_barrier(op):
+                wire = op.targets[0]
+                if wire in pending:
+                    name, gate, count = pending[wire]
+                    pending[wire] = (f"{name}·{op.name}", fused(gate, op.gate), count + 1)
+                else:
+                    pending[wire] = (op.name, op.gate, 1)
+                continue
+            for wire in op.controls + op.targets:
+                flush(wire)
+            emit(op)
+        for wire in sorted(pending):
+            flush(wire)
+
+        optimized = Circuit(self.n_qubits, self.n_clbits)
+        optimized.operations = [op for op in out if op is not None]
+        stats['gates_after'] = len(optimized.operations)
+        optimized.stats = stats
+        return optimized
+
+    def is_clifford(self):
+        """True if every operation is a Clifford gate (H, S, X, Y, Z, CX, CY, CZ, SWAP...)."""
+        return all(op.gate is None or clifford_decomposition(op.gate, op.controls, op.targets) is not None
+                   for op in self.operations)
+
+    def run(self, register=None, optimize=True, dtype=None, backend='auto', rng=None):
+        """Execute the circuit and return the final state.
+
+        Without a register the circuit starts from |0...0⟩ on the chosen
+        backend: 'statevector' (a QuantumRegister of `dtype`), 'stabilizer'
+        (a StabilizerState tableau), 'mps' (an MPSRegister without bond
+        limit; pass your own register to set max_bond/cutoff), or 'auto',
+        which picks the stabilizer backend whenever the (optimized) circuit
+        is Clifford-only. All support measure/sample/counts. Use execute() to also get the
+        classical bits of mid-circuit measurements.
+        """
+        return self.execute(register, optimize, dtype, backend, rng)[0]
+
+    def execute(self, register=None, optimize=True, dtype=None, backend='auto', rng=None):
+        """Run one shot (one per member of a BatchedRegister); returns (register, clbits).
+
+        Measurements collapse the register in place and write a uint8 array
+        of `n_clbits` classical bits ((B, n_clbits) for a batch), which
+        conditional gates read as they are reached.
+        """
+        with instrument.span('circuit.optimize'):
+            circuit = self.optimize() if optimize else self
+        if register is None:
+            if backend == 'auto':
+                backend = 'stabilizer' if circuit.is_clifford() else 'statevector'
+            if backend == 'stabilizer':
+                register = StabilizerState(self.n_qubits)
+            elif backend == 'statevector':
+                register = QuantumRegister(self.n_qubits, dtype=dtype)
+            elif backend == 'mps':
+                register = MPSRegister(self.n_qubits, dtype=dtype)
+            else:
+                raise ValueError(f"Unknown backend {backend!r}")
+        rng = np.random.default_rng(rng)
+        lead = register.state.shape[:-1] if isinstance(register, QuantumRegister) else ()
+        clbits = np.zeros(lead + (self.n_clbits,), dtype=np.uint8)
+        with instrument.span('circuit.run', gates=len(circuit.operations), backend=type(register).__name__):
+            for op in circuit.operations:
+                _apply_operation(register, op, clbits, rng)
+        return register, clbits
+
+    def __str__(self):
+        """One line per operation."""
+        lines = [f"Circuit({self.n_qubits} qubits, {len(self.operations)} gates)"]
+        for op in self.operations:
+            if op.gate is None:
+                lines.append(f"  measure {list(op.targets)} -> c{list(op.clbits)}")
+                continue
+            ctrl = f" ctrl={list(op.controls)}" if op.controls else ""
+            cond = f" if c{list(op.condition[0])}=={op.condition[1]}" if op.condition else ""
+            lines.append(f"  {op.name} on {list(op.targets)}{ctrl}{cond}")
+        return "\n".join(lines)
+
+
+class _Branch:
+    # One node of the branch tree: the register just before a measurement
+    # (or at the end of the circuit) and the classical bits that led there
+    __slots__ = ('position', 'register', 'clbits', 'probs', 'children')
+
+    def __init__(self, position, register, clbits, probs):
+        self.position, self.register, self.clbits, self.probs = position, register, clbits, probs
+        self.children = {}
+
+
+class BranchCache:
+    """Many-shot sampling of a circuit with mid-circuit measurement and feed-forward.
+
+    Shots only diverge at measurements, so the circuit is simulated once per
+    distinct branch instead of once per shot. Each branch stores its
+    pre-measurement state and outcome probabilities; a batch of shots is
+    split over the outcomes with one multinomial draw, and only outcomes
+    that were actually drawn get a collapsed copy simulated onward. Terminal
+    measurements (nothing but measurements after them) are sampled straight
+    from the final marginal without branching. The cache persists across
+    sample() calls, so later batches re-simulate nothing.
+    """
+
+    def __init__(self, circuit, register=None, optimize=True, dtype=None):
+        self.circuit = circuit.optimize() if optimize else circuit
+        self.n_clbits = circuit.n_clbits
+        operations = self.circuit.operations
+        # Index of the first operation after which only measurements remain
+        self._terminal = len(operations)
+        while self._terminal and operations[self._terminal - 1].gate is None:
+            self._terminal -= 1
+        # Qubits read by the terminal measurements, without repeats
+        self._final_qubits = []
+        for op in operations[self._terminal:]:
+            self._final_qubits.extend(q for q in op.targets if q not in self._final_qubits)
+        register = register if register is not None else QuantumRegister(circuit.n_qubits, dtype=dtype)
+        self.branches = 0
+        self.root = self._advance(register, 0, np.zeros(self.n_clbits, dtype=np.uint8))
+
+    def _advance(self, register, position, clbits):
+        """Run from `position` up to the next branching measurement (or the end)"""
+        operations = self.circuit.operations
+        while position < self._terminal and operations[position].gate is not None:
+            _apply_operation(register, operations[position], clbits, None)
+            position += 1
+        self.branches += 1
+        if position < self._terminal:
+            probs = register.marginal_probabilities(operations[position].targets)
+        elif self._final_qubits:
+            probs = register.marginal_probabilities(self._final_qubits)
+        else:
+            probs = None
+        return _Branch(position, register, clbits, probs)
+
+    def _child(self, branch, outcome):
+        """The branch after `outcome` of branch's measurement, simulated once and cached"""
+        child = branch.children.get(outcome)
+        if child is None:
+            op = self.circuit.operations[branch.position]
+            register = QuantumRegister(branch.register.n_qubits, branch.register.state, branch.register.dtype)
+            register._collapse(op.targets, np.asarray(outcome), branch.probs)
+            clbits = branch.clbits.copy()
+            clbits[list(op.clbits)] = indices_to_bits(np.array([outcome]), len(op.targets))[0]
+            child = branch.children[outcome] = self._advance(register, branch.position + 1, clbits)
+        return child
+
+    def _terminal_bits(self, branch, indices):
+        """(shots, n_clbits) classical bits for terminal outcomes drawn at a leaf"""
+        qubits = self._final_qubits
+        bits = indices_to_bits(indices, len(qubits))
+        clbits = np.repeat(branch.clbits[None], len(indices), axis=0)
+        for op in self.circuit.operations[self._terminal:]:
+            clbits[:, list(op.clbits)] = bits[:, [qubits.index(q) for q in op.targets]]
+        return clbits
+
+    def sample(self, shots, rng=None):
+        """Run `shots` shots; returns a {classical bitstring: count} dict (bit 0 first)."""
+        rng = np.random.default_rng(rng)
+        counts = {}
+        stack = [(self.root, shots)]
+        while stack:
+            branch, n = stack.pop()
+            if branch.position == self._terminal:
+                if branch.probs is None:
+                    key = ''.join(map(str, branch.clbits))
+                    counts[key] = counts.get(key, 0) + n
+                    continue
+                clbits = self._terminal_bits(branch, sample_indices(branch.probs, n, rng))
+                for key, hit in counts_from_bits(clbits).items():
+                    counts[key] = counts.get(key, 0) + hit
+                continue
+            probs = branch.probs / branch.probs.sum()
+            for outcome, m in enumerate(rng.multinomial(n, probs)):
+                if m:
+                    stack.append((self._child(branch, outcome), m))
+        return counts
+
+    def outcomes(self, atol=1e-12):
+        """Every branch up to the terminal measurements, exactly.
+
+        Returns {classical bitstring: (probability, register)}, with the bits
+        of terminal measurements not yet set. Builds the whole branch tree.
+        """
+        result = {}
+        stack = [(self.root, 1.0)]
+        while stack:
+            branch, p = stack.pop()
+            if branch.position == self._terminal:
+                result[''.join(map(str, branch.clbits))] = (p, branch.register)
+                continue
+            probs = branch.probs / branch.probs.sum()
+            for outcome in np.flatnonzero(probs > atol):
+                stack.append((self._child(branch, int(outcome)), p * float(probs[outcome])))
+        return result
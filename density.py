@@ -0,0 +1,152 @@
+import numpy as np
+from .precision import resolve_dtype
+from .register import apply_gate_inplace, bloch_components, _as_targets, _check_targets, _controlled_gate
+from .observables import expectation
+from . import instrument
+from .sampling import sample_indices, indices_to_bits, counts_from_indices
+
+
+class DensityMatrix:
+    """Mixed state of n qubits stored as a (2^n, 2^n) density matrix.
+
+    The matrix is viewed as a (2,)*2n tensor whose first n axes are the row
+    (ket) qubits and last n axes the column (bra) qubits. Gates and Kraus
+    operators are contracted into those axes directly, so a channel on k
+    qubits costs O(4^n) per Kraus operator and no superoperator is ever built.
+    """
+
+    def __init__(self, n_qubits, rho=None, dtype=None):
+        self.n_qubits = n_qubits
+        dtype = resolve_dtype(dtype)
+        dim = 2**n_qubits
+        if rho is None:
+            rho = np.zeros((dim, dim), dtype=dtype)
+            rho[0, 0] = 1  # |0...0⟩⟨0...0|
+        rho = np.array(rho, dtype=dtype)
+        if rho.shape != (dim, dim):
+            raise ValueError(f"Density matrix shape {rho.shape} incompatible with {n_qubits} qubits")
+        self.rho = rho
+
+    @classmethod
+    def from_state(cls, state, dtype=None):
+        """Pure state |ψ⟩⟨ψ| from a statevector (or anything with .state)."""
+        state = np.asarray(getattr(state, 'state', state))
+        n_qubits = int(np.log2(len(state)))
+        return cls(n_qubits, np.outer(state, np.conj(state)), dtype)
+
+    @property
+    def tensor(self):
+        """View of rho with one row axis and one column axis per qubit."""
+        return self.rho.reshape((2,) * (2 * self.n_qubits))
+
+    def _conjugate(self, tensor, op, targets):
+        # rho -> op · rho · op†: op on the row axes, conj(op) on the column axes
+        apply_gate_inplace(tensor, op, targets)
+        apply_gate_inplace(tensor, np.conj(op), tuple(t + self.n_qubits for t in targets))
+        return tensor
+
+    def apply_gate(self, gate, targets):
+        """Unitary evolution rho -> U rho U† on the target qubits."""
+        targets = _as_targets(targets)
+        _check_targets(targets, self.n_qubits)
+        gate = np.asarray(gate)
+        if gate.shape != (2**len(targets),) * 2:
+            raise ValueError(f"Gate dimension {gate.shape} incompatible with targets {targets}")
+        with instrument.gate(gate, self.rho):
+            self._conjugate(self.tensor, gate, targets)
+        return self
+
+    def apply_controlled(self, gate, controls, targets):
+        """Apply gate to targets on the subspace where all controls are |1⟩."""
+        return self.apply_gate(*_controlled_gate(gate, controls, targets, self.rho.dtype))
+
+    def apply_channel(self, kraus, targets):
+        """CPTP map rho -> Σ_K K rho K† given by Kraus operators on the targets."""
+        targets = _as_targets(targets)
+        _check_targets(targets, self.n_qubits)
+        with instrument.span('density.channel', kraus=len(kraus), targets=list(targets)):
+            result = np.zeros_like(self.rho)
+            for op in kraus:
+                term = self.rho.copy()
+                self._conjugate(term.reshape(self.tensor.shape), np.asarray(op), targets)
+                result += term
+            self.rho = result
+        return self
+
+    def probabilities(self):
+        """Probability of each computational basis state (the diagonal)."""
+        return np.clip(np.real(np.diagonal(self.rho)), 0, None)
+
+    def marginal_probabilities(self, qubits):
+        """Probabilities over the listed qubits (in that order), others traced out."""
+        return np.real(np.diagonal(self.reduced(qubits))).clip(0, None)
+
+    def reduced(self, qubits):
+        """Reduced density matrix of the listed qubits (partial trace over the rest)."""
+        qubits = _as_targets(qubits)
+        _check_targets(qubits, self.n_qubits)
+        n = self.n_qubits
+        rows = list(range(n))
+        cols = [q + n if q in qubits else q for q in range(n)]  # traced qubits share labels
+        out = list(qubits) + [q + n for q in qubits]
+        reduced = np.einsum(self.tensor, rows + cols, out)
+        dim = 2**len(qubits)
+        return reduced.reshape(dim, dim)
+
+    def reduced_density_matrices(self):
+        """Every qubit's reduced density matrix as an (n, 2, 2) array.
+
+        Each partial trace is one einsum with the traced row and column
+        labels shared, so only the diagonal blocks of rho are read.
+        """
+        n = self.n_qubits
+        rdms = np.empty((n, 2, 2), dtype=self.rho.dtype)
+        for q in range(n):
+            view = self.rho.reshape(2**q, 2, 2**(n - q - 1), 2**q, 2, 2**(n - q - 1))
+            rdms[q] = np.einsum('aibajb->ij', view)
+        return rdms
+
+    def bloch_vectors(self):
+        """(n, 3) Bloch vector of every qubit."""
+        return bloch_components(self.reduced_density_matrices())
+
+    def purities(self):
+        """(n,) purity Tr(rho_q²) of every qubit's reduced state."""
+        return (1 + np.sum(self.bloch_vectors()**2, axis=-1)) / 2
+
+    def expectation(self, paulis, coeffs=None):
+        """Exact ⟨P⟩ of Pauli strings or a {string: coeff} Hamiltonian (see observables.expectation)."""
+        return expectation(self, paulis, coeffs)
+
+    def purity(self):
+        """Tr(rho²): 1 for pure states, 1/2^n for the maximally mixed state."""
+        return float(np.real(np.vdot(self.rho.conj().T, self.rho)))
+
+    def fidelity(self, state):
+        """⟨ψ|rho|ψ⟩ against a pure statevector."""
+        state = np.asarray(getattr(state, 'state', state))
+        return float(np.real(np.conj(state) @ self.rho @ state))
+
+    def measure(self, rng=None):
+        """Sample one basis state; returns the list of qubit outcomes."""
+        return [int(b) for b in self.sample(1, rng)[0]]
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw all shots at once; returns a (shots, n_measured) array of bits."""
+        probs, n = self._measured_probabilities(qubits)
+        return indices_to_bits(sample_indices(probs, shots, rng), n)
+
+    def counts(self, shots, rng=None, qubits=None):
+        """Measurement histogram over `shots` as a {bitstring: count} dict."""
+        probs, n = self._measured_probabilities(qubits)
+        return counts_from_indices(sample_indices(probs, shots, rng), n)
+
+    def _measured_probabilities(self, qubits):
+        if qubits is None:
+            return self.probabilities(), self.n_qubits
+        qubits = _as_targets(qubits)
+        return self.marginal_probabilities(qubits), len(qubits)
+
+    def __str__(self):
+        """String representation of the density matrix."""
+        return f"DensityMatrix({self.n_qubits} qubits, purity={self.purity():.3f})"
@@ -0,0 +1,177 @@
+"""Memoized gate construction and a cache of expanded/fused operators.
+
+Parameterized gates are built once per (kind, parameters, dtype) and shared
+as read-only arrays, so loops such as the QFT's controlled phases stop
+allocating after the first pass. Dense operators derived from a gate (its
+expansion to the full register, a controlled form, a dtype cast) go in a
+second cache keyed by the gate's bytes and where it acts. Both caches are
+LRU-evicted against an entry count and a byte budget.
+"""
+from collections import OrderedDict
+import numpy as np
+from .precision import resolve_dtype
+
+
+class GateCache:
+    """Bounded LRU cache of read-only arrays with hit/miss statistics."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, build):
+        """Cached value for key, calling build() on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = build()
+        entry.setflags(write=False)
+        if entry.nbytes > self.max_bytes:
+            return entry  # too large to keep; hand it out uncached
+        self._entries[key] = entry
+        self.nbytes += entry.nbytes
+        self._evict()
+        return entry
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self.evictions += 1
+
+    def configure(self, max_entries=None, max_bytes=None):
+        """Change the limits, evicting least recently used entries to fit."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.nbytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+gate_cache = GateCache(max_entries=4096, max_bytes=16 * 2**20)
+operator_cache = GateCache(max_entries=256, max_bytes=64 * 2**20)
+
+
+def _phase(angle):
+    return np.array([[1, 0], [0, np.exp(1j * angle)]])
+
+def _rx(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+def _ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+def _rz(theta):
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+def _u3(theta, phi, lam):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -np.exp(1j * lam) * s],
+                     [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c]])
+
+GATE_BUILDERS = {'phase': _phase, 'rx': _rx, 'ry': _ry, 'rz': _rz, 'u3': _u3}
+
+
+def make_gate(kind, *params, dtype=None):
+    """Shared read-only gate of a registered kind (see GATE_BUILDERS)."""
+    dtype = resolve_dtype(dtype)
+    params = tuple(float(p) for p in params)
+    return gate_cache.get((kind, params, dtype),
+                          lambda: GATE_BUILDERS[kind](*params).astype(dtype))
+
+def phase(angle, dtype=None):
+    """Phase rotation diag(1, e^(i*angle))"""
+    return make_gate('phase', angle, dtype=dtype)
+
+def rx(theta, dtype=None):
+    """Rotation exp(-iθX/2) about the X axis"""
+    return make_gate('rx', theta, dtype=dtype)
+
+def ry(theta, dtype=None):
+    """Rotation exp(-iθY/2) about the Y axis"""
+    return make_gate('ry', theta, dtype=dtype)
+
+def rz(theta, dtype=None):
+    """Rotation exp(-iθZ/2) about the Z axis"""
+    return make_gate('rz', theta, dtype=dtype)
+
+def u3(theta, phi, lam, dtype=None):
+    """General single-qubit gate Rz(φ)·Ry(θ)·Rz(λ) up to global phase"""
+    return make_gate('u3', theta, phi, lam, dtype=dtype)
+
+
+def _key(gate):
+    # Arrays are unhashable; their raw bytes plus shape and dtype identify them
+    return gate.tobytes(), gate.shape, gate.dtype
+
+def as_dtype(gate, dtype):
+    """gate cast to dtype; the cast copy is cached so repeated casts are free."""
+    gate = np.asarray(gate)
+    dtype = np.dtype(dtype)
+    if gate.dtype == dtype:
+        return gate
+    return operator_cache.get(('cast', _key(gate), dtype), lambda: gate.astype(dtype))
+
+def controlled(gate, n_controls=1, dtype=None):
+    """diag(I, ..., I, U): gate with n_controls leading control qubits."""
+    gate = np.asarray(gate)
+    dtype = gate.dtype if dtype is None else np.dtype(dtype)
+
+    def build():
+        size = 2**n_controls * gate.shape[0]
+        full = np.eye(size, dtype=dtype)
+        full[size - gate.shape[0]:, size - gate.shape[0]:] = gate
+        return full
+    return operator_cache.get(('controlled', _key(gate), n_controls, dtype), build)
+
+def expanded(gate, targets, n_qubits):
+    """Full 2^n x 2^n operator acting as gate on targets (qubit 0 most significant)."""
+    gate = np.asarray(gate)
+    targets = tuple(int(t) for t in targets)
+
+    def build():
+        k = len(targets)
+        dim = 2**n_qubits
+        identity = np.eye(dim, dtype=gate.dtype).reshape((2,) * n_qubits + (dim,))
+        op = gate.reshape((2,) * (2 * k))
+        result = np.tensordot(op, identity, axes=(list(range(k, 2 * k)), list(targets)))
+        return np.moveaxis(result, list(range(k)), list(targets)).reshape(dim, dim)
+    return operator_cache.get(('expanded', _key(gate), targets, n_qubits), build)
+
+def fused(*gates):
+    """Matrix product gates[-1] @ ... @ gates[0] (gates applied in order)."""
+    gates = [np.asarray(g) for g in gates]
+
+    def build():
+        product = gates[0]
+        for gate in gates[1:]:
+            product = gate @ product
+        return np.array(product)
+    return operator_cache.get(('fused',) + tuple(_key(g) for g in gates), build)
+
+
+def cache_stats():
+    """Hit/miss/eviction counters and sizes of both caches."""
+    return {'gates': gate_cache.stats(), 'operators': operator_cache.stats()}
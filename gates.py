@@ -1,9 +1,11 @@
 import numpy as np
+from .gate_factory import phase, rx, ry, rz, u3, controlled
+from . import instrument
 
-# Single-qubit gates
-H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
-X = np.array([[0, 1], [1, 0]])
-Z = np.array([[1, 0], [0, -1]])
+# Single-qubit gates (complex128; gate_factory.as_dtype caches casts to other dtypes)
+H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
 
 # Two-qubit gates
 CNOT = np.array([
@@ -11,10 +13,69 @@ CNOT = np.array([
     [0, 1, 0, 0],
     [0, 0, 0, 1],
     [0, 0, 1, 0]
-])
+], dtype=complex)
+SWAP = np.array([
+    [1, 0, 0, 0],
+    [0, 0, 1, 0],
+    [0, 1, 0, 0],
+    [0, 0, 0, 1]
+], dtype=complex)
+
+# Structure tags used to pick a specialised kernel
+DIAGONAL = 'diagonal'
+PERMUTATION = 'permutation'
+CONTROLLED = 'controlled'
+GENERAL = 'general'
+
+def is_diagonal(gate):
+    """True if every off-diagonal entry is zero"""
+    return not np.any(gate - np.diag(np.diagonal(gate)))
+
+def permutation_of(gate):
+    """Row -> column map if gate is a 0/1 permutation matrix, else None"""
+    if not np.all((gate == 0) | (gate == 1)):
+        return None
+    if not (np.all(gate.sum(axis=0) == 1) and np.all(gate.sum(axis=1) == 1)):
+        return None
+    return np.argmax(gate, axis=1)
+
+def controlled_decomposition(gate):
+    """Peel leading controls off a gate of the form diag(I, U).
+
+    Returns (n_controls, U); n_controls is 0 when the gate is not controlled.
+    The controls are the gate's leading (most significant) qubits.
+    """
+    n_controls = 0
+    while gate.shape[0] > 2:
+        half = gate.shape[0] // 2
+        if not (np.array_equal(gate[:half, :half], np.eye(half))
+                and not np.any(gate[:half, half:]) and not np.any(gate[half:, :half])):
+            break
+        gate = gate[half:, half:]
+        n_controls += 1
+    return n_controls, gate
+
+def gate_structure(gate):
+    """Classify a gate as CONTROLLED, DIAGONAL, PERMUTATION or GENERAL"""
+    gate = np.asarray(gate)
+    if controlled_decomposition(gate)[0]:
+        return CONTROLLED
+    if is_diagonal(gate):
+        return DIAGONAL
+    if permutation_of(gate) is not None:
+        return PERMUTATION
+    return GENERAL
 
 def apply_gate(state, gate):
     """Safe gate application with dimension check"""
     if gate.shape[1] != state.shape[0]:
         raise ValueError(f"Gate dimension {gate.shape} incompatible with state {state.shape}")
-    return np.dot(gate, state)
\ No newline at end of file
+    with instrument.gate(gate, state):
+        # Diagonal and permutation gates need no matmul
+        if is_diagonal(gate):
+            diagonal = np.diagonal(gate)
+            return (diagonal[:, None] if state.ndim == 2 else diagonal) * state
+        perm = permutation_of(gate)
+        if perm is not None:
+            return state[perm]
+        return np.dot(gate, state)
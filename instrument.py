@@ -0,0 +1,169 @@
+"""Opt-in profiling of gate applications and protocol phases.
+
+Instrumented call sites wrap their work in `gate(...)` or `span(...)`. While
+no profiler is active both return one shared no-op context, so the disabled
+cost is a global lookup per call and nothing is recorded or allocated:
+
+    with instrument.profile(memory=True) as prof:
+        teleport(Qubit(), "Alice", "Bob")
+    print(prof.format_summary())
+    prof.export_chrome_trace("teleport.json")  # open in chrome://tracing or Perfetto
+"""
+from contextlib import contextmanager, nullcontext
+import os
+import threading
+import time
+import tracemalloc
+import numpy as np
+
+active = None  # the running Profiler, or None when instrumentation is off
+
+_NULL = nullcontext()
+
+
+def gate_label(gate):
+    """Name of a known gate, else its kernel structure and width (e.g. 'diagonal/2q')."""
+    from .gates import H, X, Z, CNOT, SWAP, gate_structure  # gates imports this module
+    gate = np.asarray(gate)
+    for name, known in (('H', H), ('X', X), ('Z', Z), ('CNOT', CNOT), ('SWAP', SWAP)):
+        if gate.shape == known.shape and np.allclose(gate, known):
+            return name
+    return f"{gate_structure(gate)}/{int(np.log2(gate.shape[0]))}q"
+
+
+class _Timer:
+    # Minimal context manager; cheaper than a generator-based contextmanager
+    __slots__ = ('profiler', 'name', 'cat', 'args', 'state', 'start', 'mem')
+
+    def __init__(self, profiler, name, cat, args, state=None):
+        self.profiler, self.name, self.cat, self.args, self.state = profiler, name, cat, args, state
+
+    def __enter__(self):
+        if self.profiler.memory:
+            self.mem = tracemalloc.get_traced_memory()[0]
+            if self.cat == 'gate':  # gates are leaves, so resetting the peak is safe
+                tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        allocated = None
+        if self.profiler.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = (peak if self.cat == 'gate' else current) - self.mem
+        self.profiler._record(self, end, allocated)
+        return False
+
+
+class Profiler:
+    """Aggregates per-gate-type counters and keeps a bounded list of trace events.
+
+    For every gate type: calls, cumulative seconds, bytes allocated and the
+    largest state it touched. Spans are aggregated the same way under their
+    names. Bytes are only tracked with memory=True (via tracemalloc): a gate
+    reports its transient peak, a span the memory it left allocated. At most
+    `max_events` events are kept for the trace.
+    """
+
+    def __init__(self, memory=False, max_events=100_000):
+        self.memory = memory
+        self.max_events = max_events
+        self.stats = {}
+        self.events = []
+        self.dropped = 0
+        self.origin = time.perf_counter()
+
+    def gate(self, gate, state=None):
+        return _Timer(self, gate_label(gate), 'gate', None, state)
+
+    def span(self, name, **args):
+        return _Timer(self, name, 'span', args or None)
+
+    def _record(self, timer, end, allocated):
+        seconds = end - timer.start
+        entry = self.stats.get((timer.cat, timer.name))
+        if entry is None:
+            entry = self.stats[(timer.cat, timer.name)] = {
+                'kind': timer.cat, 'name': timer.name, 'calls': 0, 'seconds': 0.0,
+                'bytes': 0, 'state_bytes': 0}
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        if allocated is not None:
+            entry['bytes'] += allocated
+        if timer.state is not None:
+            entry['state_bytes'] = max(entry['state_bytes'], timer.state.nbytes)
+        if len(self.events) < self.max_events:
+            args = dict(timer.args or {})
+            if timer.state is not None:
+                args['state_bytes'] = timer.state.nbytes
+            if allocated is not None:
+                args['bytes'] = allocated
+            self.events.append((timer.name, timer.cat, timer.start, seconds,
+                                threading.get_ident(), args))
+        else:
+            self.dropped += 1
+
+    def summary(self):
+        """Aggregated rows, slowest first."""
+        return sorted(self.stats.values(), key=lambda row: row['seconds'], reverse=True)
+
+    def format_summary(self):
+        """The summary as a fixed-width text table."""
+        lines = [f"{'kind':<5} {'name':<28} {'calls':>8} {'total ms':>10} "
+                 f"{'mean us':>10} {'alloc KiB':>10} {'state KiB':>10}"]
+        for row in self.summary():
+            mean = row['seconds'] / row['calls'] * 1e6
+            alloc = f"{row['bytes'] / 1024:10.1f}" if self.memory else f"{'-':>10}"
+            lines.append(f"{row['kind']:<5} {row['name']:<28} {row['calls']:>8} "
+                         f"{row['seconds'] * 1e3:10.3f} {mean:10.1f} {alloc} "
+                         f"{row['state_bytes'] / 1024:10.1f}")
+        if self.dropped:
+            lines.append(f"({self.dropped} events beyond max_events were aggregated but not traced)")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Events in Chrome trace format (complete 'X' events, microseconds)."""
+        pid = os.getpid()
+        return {'traceEvents': [
+            {'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+             'ts': (start - self.origin) * 1e6, 'dur': seconds * 1e6, 'args': args}
+            for name, cat, start, seconds, tid, args in self.events],
+            'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        import json
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def gate(gate, state=None):
+    """Context timing one gate application (no-op unless profiling)."""
+    if active is None:
+        return _NULL
+    return active.gate(gate, state)
+
+
+def span(name, **args):
+    """Context timing a named protocol phase (no-op unless profiling)."""
+    if active is None:
+        return _NULL
+    return active.span(name, **args)
+
+
+@contextmanager
+def profile(memory=False, max_events=100_000):
+    """Enable instrumentation inside a with-block; yields the Profiler."""
+    global active
+    previous = active
+    profiler = Profiler(memory, max_events)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    active = profiler
+    try:
+        yield profiler
+    finally:
+        active = previous
+        if started:
+            tracemalloc.stop()
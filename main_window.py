@@ -1,119 +1,394 @@
 import sys
+import itertools
+import multiprocessing
+import threading
+import time
 import numpy as np
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, 
-                            QVBoxLayout, QWidget, QLabel, QHBoxLayout)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton,
+                            QVBoxLayout, QWidget, QLabel, QHBoxLayout,
+                            QListWidget, QListWidgetItem, QSpinBox, QProgressBar,
+                            QTabWidget)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from quantum.state import Qubit
-from quantum.gates import H, X, Z, CNOT, apply_gate
+from quantum.gates import H, rx, rz
 from quantum.protocols import teleport
 from quantum.algorithms import grovers_search
-from visualization.bloch_qt import BlochSphereWidget
+from visualization.bloch_qt import BlochSphereWidget, BlochGridWidget
+from visualization.animate import state_trajectory
+
+# Grover runs from this many qubits go to a worker process instead of a thread
+PROCESS_QUBITS = 18
+# Worker processes are spawned: forking a process that runs Qt threads is unsafe
+PROCESSES = multiprocessing.get_context('spawn')
+
+
+class Cancelled(Exception):
+    """Raised inside a job once its cancel flag is set"""
+
+
+class JobSignals(QObject):
+    """Signals a job emits from its worker thread; Qt queues them onto the UI thread"""
+    # job id, fraction, message, state: a (2,) qubit state, (n, 3) Bloch vectors or None
+    progress = pyqtSignal(int, float, str, object)
+    result = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+    finished = pyqtSignal(int)
+
+
+class SimulationJob(QRunnable):
+    """Run `func(job, *args)` on a QThreadPool thread.
+
+    The function reports through job.report(), which is throttled to
+    `min_interval` seconds so a fast loop cannot flood the UI thread, and
+    which raises Cancelled once cancel() was called (job.check() does the
+    same without reporting). A job cancelled while still queued never runs.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, func, *args, min_interval=1 / 30):
+        super().__init__()
+        self.setAutoDelete(False)  # the window keeps the job until it finishes
+        self.id = next(self._ids)
+        self.name = name
+        self.func = func
+        self.args = args
+        self.min_interval = min_interval
+        self.signals = JobSignals()
+        self._cancel = threading.Event()
+        self._last_report = 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def due(self):
+        """Whether report() would send now; lets a job skip building a costly state"""
+        return time.perf_counter() - self._last_report >= self.min_interval
+
+    def report(self, fraction, message="", state=None):
+        """Send progress, at most every min_interval.
+
+        `state` is optional: a qubit state for the Bloch sphere or an (n, 3)
+        array of per-qubit Bloch vectors for the register grid.
+        """
+        self.check()
+        now = time.perf_counter()
+        if fraction >= 1 or now - self._last_report >= self.min_interval:
+            self._last_report = now
+            self.signals.progress.emit(self.id, fraction, message, state)
+
+    def run(self):
+        try:
+            self.check()
+            result = self.func(self, *self.args)
+        except Cancelled:
+            self.signals.cancelled.emit(self.id)
+        except Exception as e:
+            self.signals.error.emit(self.id, str(e))
+        else:
+            self.signals.result.emit(self.id, result)
+        finally:
+            self.signals.finished.emit(self.id)
+
+
+def _process_main(conn, func, args):
+    # Worker process entry point: send back (True, result) or (False, error message)
+    try:
+        conn.send((True, func(*args)))
+    except Exception as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def in_process(job, func, *args):
+    """Run a picklable func in its own worker process, polling the job's cancel flag.
+
+    Cancelling the job terminates the process, so an abandoned run stops
+    computing at once rather than holding a core until it finishes.
+    """
+    receiver, sender = PROCESSES.Pipe(duplex=False)
+    process = PROCESSES.Process(target=_process_main, args=(sender, func, args), daemon=True)
+    process.start()
+    sender.close()  # the child holds the only write end, so its exit reads as EOF
+    try:
+        while not receiver.poll(0.05):
+            if job.cancelled:
+                raise Cancelled()
+        try:
+            ok, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"worker process exited with code {process.exitcode}") from None
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+    if not ok:
+        raise RuntimeError(value)
+    return value
+
+
+def teleport_job(job, trials):
+    """Teleport `trials` random states, streaming Bob's states to the Bloch sphere"""
+    rng = np.random.default_rng()
+    fidelities = []
+    for i in range(trials):
+        state = rng.normal(size=2) + 1j * rng.normal(size=2)
+        original_qubit = Qubit(state / np.linalg.norm(state))
+        result = teleport(original_qubit, "Alice", "Bob")
+        fidelities.append(np.abs(np.vdot(original_qubit.state, result.state))**2)
+        job.report((i + 1) / trials, f"trial {i + 1}/{trials}", result.state)
+    return {'original': original_qubit.state, 'result': result.state,
+            'fidelities': np.array(fidelities)}
+
+
+def grover_with_bloch(n_qubits):
+    """Grover search for |1...1⟩ returning (result, final per-qubit Bloch vectors)"""
+    final = {}
+
+    def keep_final(i, total, register):
+        if i == total:
+            final['vectors'] = register.bloch_vectors()
+
+    result = grovers_search(n_qubits, target_state=[1] * n_qubits, progress=keep_final)
+    return result, final['vectors']
+
+
+def grover_job(job, n_qubits):
+    """Grover search for |1...1⟩, streaming per-qubit Bloch vectors to the register grid
+
+    Large registers run in a worker process and only send their final vectors.
+    """
+    job.report(0, f"{n_qubits} qubits")
+    if n_qubits >= PROCESS_QUBITS:
+        result, vectors = in_process(job, grover_with_bloch, n_qubits)
+        job.report(1, "done", vectors)
+        return result
+
+    def progress(i, total, register):
+        job.check()
+        if i == total or job.due():  # only reduce the register when it will be shown
+            job.report(i / total, f"iteration {i}/{total}", register.bloch_vectors())
+
+    return grovers_search(n_qubits, target_state=[1] * n_qubits, progress=progress)
+
+
+def animation_job(job, gates, fps):
+    """Precompute a gate sequence's trajectory, then play it back at `fps`"""
+    states = state_trajectory(gates)
+    for frame, state in enumerate(states):
+        job.report((frame + 1) / len(states), f"frame {frame + 1}/{len(states)}", state)
+        time.sleep(1 / fps)
+    return states[-1]
+
 
 class QuantumGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Quantum Simulator")
-        self.setGeometry(100, 100, 800, 600)
-        
+        self.setGeometry(100, 100, 900, 600)
+
+        # Simulations run on the pool; the UI thread only handles their signals
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.jobs = {}  # job id -> (job, list item, result handler)
+
         # Create main widget and layout
         main_widget = QWidget()
         main_layout = QHBoxLayout()
-        
+
         # Left side - controls
         left_layout = QVBoxLayout()
-        
+
         # Widgets
         self.btn_teleport = QPushButton("Run Teleportation", self)
         self.btn_grover = QPushButton("Run Grover's Search", self)
+        self.grover_qubits = QSpinBox(self)
+        self.grover_qubits.setRange(2, 26)
+        self.grover_qubits.setValue(2)
+        self.grover_qubits.setPrefix("Grover qubits: ")
         self.btn_animate = QPushButton("Show Animation", self)
+        self.job_list = QListWidget(self)
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 1000)
+        self.btn_cancel = QPushButton("Cancel Selected", self)
+        self.btn_cancel_all = QPushButton("Cancel All", self)
         self.output_label = QLabel("Results will appear here", self)
         self.output_label.setAlignment(Qt.AlignTop)
         self.output_label.setStyleSheet("font-size: 12px; margin: 10px; padding: 10px; border: 1px solid gray;")
         self.output_label.setWordWrap(True)
-        
+
         # Add widgets to left layout
         left_layout.addWidget(self.btn_teleport)
+        left_layout.addWidget(self.grover_qubits)
         left_layout.addWidget(self.btn_grover)
         left_layout.addWidget(self.btn_animate)
+        left_layout.addWidget(QLabel("Running and queued jobs:", self))
+        left_layout.addWidget(self.job_list)
+        left_layout.addWidget(self.progress_bar)
+        cancel_layout = QHBoxLayout()
+        cancel_layout.addWidget(self.btn_cancel)
+        cancel_layout.addWidget(self.btn_cancel_all)
+        left_layout.addLayout(cancel_layout)
         left_layout.addWidget(self.output_label)
-        
-        # Right side - Bloch sphere
+
+        # Right side - single-qubit Bloch sphere and per-qubit register grid
         self.bloch_widget = BlochSphereWidget()
-        
+        self.register_widget = BlochGridWidget()
+        self.view_tabs = QTabWidget(self)
+        self.view_tabs.addTab(self.bloch_widget, "Qubit")
+        self.view_tabs.addTab(self.register_widget, "Register")
+
         # Create left container
         left_container = QWidget()
         left_container.setLayout(left_layout)
         left_container.setMaximumWidth(400)
-        
+
         # Add to main layout
         main_layout.addWidget(left_container)
-        main_layout.addWidget(self.bloch_widget)
-        
+        main_layout.addWidget(self.view_tabs)
+
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
-        
+
         # Connect buttons
         self.btn_teleport.clicked.connect(self.run_teleportation)
         self.btn_grover.clicked.connect(self.run_grover)
         self.btn_animate.clicked.connect(self.run_animation)
-        
+        self.btn_cancel.clicked.connect(self.cancel_selected)
+        self.btn_cancel_all.clicked.connect(self.cancel_all)
+
         # Initialize with default qubit
         default_qubit = Qubit()
         self.bloch_widget.plot_qubit(default_qubit.state)
 
+    def submit(self, job, on_result, view=None):
+        """Queue a job on the pool and track it in the job list
+
+        `view` is the tab the job draws on; it is brought forward once, here,
+        rather than on every progress update.
+        """
+        if view is not None:
+            self.view_tabs.setCurrentWidget(view)
+        item = QListWidgetItem(f"#{job.id} {job.name}: queued")
+        self.job_list.addItem(item)
+        self.jobs[job.id] = (job, item, on_result)
+        job.signals.progress.connect(self.on_progress)
+        job.signals.result.connect(self.on_result)
+        job.signals.error.connect(self.on_error)
+        job.signals.cancelled.connect(self.on_cancelled)
+        job.signals.finished.connect(self.on_finished)
+        self.pool.start(job)
+        return job
+
+    def on_progress(self, job_id, fraction, message, state):
+        if job_id not in self.jobs:
+            return
+        job, item, _ = self.jobs[job_id]
+        item.setText(f"#{job_id} {job.name}: {fraction:.0%} {message}")
+        self.progress_bar.setValue(int(fraction * 1000))
+        # Both widgets coalesce updates to their own frame rate
+        if state is not None and np.ndim(state) == 2:
+            self.register_widget.plot_vectors(state)
+        elif state is not None:
+            self.bloch_widget.plot_qubit(state)
+
+    def on_result(self, job_id, result):
+        if job_id in self.jobs:
+            try:
+                self.jobs[job_id][2](result)
+            except Exception as e:
+                self.output_label.setText(f"Error displaying result: {str(e)}")
+
+    def on_error(self, job_id, message):
+        name = self.jobs[job_id][0].name if job_id in self.jobs else "job"
+        self.output_label.setText(f"Error in {name}: {message}")
+
+    def on_cancelled(self, job_id):
+        if job_id in self.jobs:
+            self.output_label.setText(f"{self.jobs[job_id][0].name} cancelled")
+
+    def on_finished(self, job_id):
+        job, item, _ = self.jobs.pop(job_id)
+        self.job_list.takeItem(self.job_list.row(item))
+        if not self.jobs:
+            self.progress_bar.setValue(0)
+
+    def cancel_selected(self):
+        selected = {id(item) for item in self.job_list.selectedItems()}
+        for job, item, _ in self.jobs.values():
+            if id(item) in selected:
+                job.cancel()
+                item.setText(f"#{job.id} {job.name}: cancelling")
+
+    def cancel_all(self):
+        for job, item, _ in self.jobs.values():
+            job.cancel()
+            item.setText(f"#{job.id} {job.name}: cancelling")
+
     def run_teleportation(self):
         """Demonstrate quantum teleportation"""
-        try:
-            original_qubit = Qubit(np.array([1, 1])/np.sqrt(2))  # |+⟩ state
-            result = teleport(original_qubit, "Alice", "Bob", verbose=True)
-            
+        def show(outcome):
+            original, result = outcome['original'], outcome['result']
+            fidelities = outcome['fidelities']
+
             # Display results
             self.output_label.setText(
                 f"TELEPORTATION RESULTS:\n"
-                f"Original state: {np.round(original_qubit.state, 3)}\n"
-                f"Teleported state: {np.round(result.state, 3)}\n"
-                f"Fidelity: {np.abs(np.dot(original_qubit.state.conj(), result.state))**2:.3f}\n"
-                f"Success: {np.allclose(original_qubit.state, result.state, atol=0.1)}"
+                f"Original state: {np.round(original, 3)}\n"
+                f"Teleported state: {np.round(result, 3)}\n"
+                f"Fidelity: {fidelities[-1]:.3f} (mean over {len(fidelities)} runs: {fidelities.mean():.3f})\n"
+                f"Success: {np.allclose(fidelities, 1, atol=0.1)}"
             )
-            
+
             # Update Bloch sphere
-            self.bloch_widget.plot_qubit(result.state)
-            
-        except Exception as e:
-            self.output_label.setText(f"Error in teleportation: {str(e)}")
+            self.bloch_widget.plot_qubit(result)
+
+        self.submit(SimulationJob("Teleportation", teleport_job, 100), show, self.bloch_widget)
 
     def run_grover(self):
         """Run Grover's search algorithm"""
-        try:
-            result = grovers_search(n_qubits=2)
-            
+        n_qubits = self.grover_qubits.value()
+        target = [1] * n_qubits
+
+        def show(result):
             # Display results
             self.output_label.setText(
-                f"GROVER'S SEARCH RESULTS:\n"
+                f"GROVER'S SEARCH RESULTS ({n_qubits} qubits):\n"
                 f"Measurement result: {result}\n"
-                f"Found target |11⟩: {result == [1, 1]}\n"
+                f"Found target |{'1' * n_qubits}⟩: {result == target}\n"
                 f"Search completed successfully!"
             )
-            
-            # Create a qubit representing the found state
-            if result == [1, 1]:
-                found_state = np.array([0, 1])  # |1⟩ state
-            else:
-                found_state = np.array([1, 0])  # |0⟩ state
-            
-            self.bloch_widget.plot_qubit(found_state)
-            
-        except Exception as e:
-            self.output_label.setText(f"Error in Grover's search: {str(e)}")
+            # The register tab already shows the final per-qubit Bloch vectors
+
+        self.submit(SimulationJob(f"Grover ({n_qubits} qubits)", grover_job, n_qubits), show,
+                    self.register_widget)
 
     def run_animation(self):
-        """Show qubit animation"""
-        try:
-            from visualization.animate import animate_qubit
-            animate_qubit()
-            self.output_label.setText("Animation window opened!\nClose the matplotlib window to continue.")
-        except Exception as e:
-            self.output_label.setText(f"Error in animation: {str(e)}")
+        """Play a qubit animation on the Bloch sphere"""
+        gates = [H] + [rx(np.pi / 60)] * 120 + [rz(np.pi / 60)] * 120 + [H]
+
+        def show(final_state):
+            self.output_label.setText(f"Animation finished.\nFinal state: {np.round(final_state, 3)}")
+
+        self.submit(SimulationJob("Animation", animation_job, gates, 30), show, self.bloch_widget)
+
+    def closeEvent(self, event):
+        # Cancelled jobs stop at their next report; worker processes are terminated
+        self.cancel_all()
+        self.pool.waitForDone(2000)
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
@@ -122,4 +397,4 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,273 @@
+"""Matrix product state (MPS) backend for low-entanglement circuits.
+
+The state is a chain of site tensors A[s] of shape (left, 2, right):
+
+    ψ[b0 b1 ... b(n-1)] = A[0][:, b0, :] · A[1][:, b1, :] ··· A[n-1][:, b(n-1), :]
+
+so memory is O(n·χ²) for bond dimension χ instead of O(2^n). One-qubit
+gates are contracted into their site. Multi-qubit gates are applied to
+adjacent sites and split back with an SVD that keeps at most `max_bond`
+singular values and drops the tail whose weight is below `cutoff`; the
+discarded weight is accumulated in `truncation_error`.
+
+Qubits are not pinned to sites. A gate on distant qubits moves one of them
+next to the other with SWAPs and leaves it there, and a SWAP gate only
+relabels sites, so QFT-like and fan-in circuits cost O(1) swaps per gate.
+"""
+import numpy as np
+from .gates import SWAP
+from .gate_factory import as_dtype
+from .precision import resolve_dtype
+from .register import _as_targets, _check_targets, _controlled_gate
+from .sampling import counts_from_bits
+from . import instrument
+
+
+class MPSRegister:
+    """n-qubit register stored as a matrix product state.
+
+    Supports the QuantumRegister gate and measurement API (apply_gate,
+    apply_controlled, measure_qubits, measure, sample, counts), so it can be
+    passed to Circuit.run or selected with backend='mps'. The state stays
+    exact while no singular values are discarded; `truncation_error` bounds
+    the infidelity to first order once they are.
+    """
+
+    def __init__(self, n_qubits, max_bond=None, cutoff=1e-12, dtype=None):
+        if max_bond is not None and max_bond < 1:
+            raise ValueError(f"max_bond must be at least 1, got {max_bond}")
+        self.n_qubits = n_qubits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.truncation_error = 0.0
+        dtype = resolve_dtype(dtype)
+        zero = np.zeros((1, 2, 1), dtype=dtype)
+        zero[0, 0, 0] = 1
+        self.tensors = [zero.copy() for _ in range(n_qubits)]
+        self.order = list(range(n_qubits))  # site -> qubit
+        self.site = list(range(n_qubits))  # qubit -> site
+        self.center = 0  # sites left of it are left-, right of it right-orthonormal
+        self._hot = ()  # qubits of the last multi-qubit gate
+
+    @classmethod
+    def from_qubits(cls, qubits, max_bond=None, cutoff=1e-12, dtype=None):
+        """Product state of Qubit objects (or 2-vectors), qubit 0 first."""
+        register = cls(len(qubits), max_bond, cutoff, dtype)
+        for s, qubit in enumerate(qubits):
+            state = np.asarray(getattr(qubit, 'state', qubit), dtype=register.dtype)
+            register.tensors[s] = (state / np.linalg.norm(state)).reshape(1, 2, 1)
+        return register
+
+    @property
+    def dtype(self):
+        return self.tensors[0].dtype
+
+    @property
+    def nbytes(self):
+        return sum(A.nbytes for A in self.tensors)
+
+    def bond_dimensions(self):
+        """Bond dimension between each pair of neighbouring sites."""
+        return [A.shape[2] for A in self.tensors[:-1]]
+
+    def copy(self):
+        other = MPSRegister.__new__(MPSRegister)
+        other.__dict__.update(self.__dict__)
+        other.tensors = [A.copy() for A in self.tensors]
+        other.order, other.site = list(self.order), list(self.site)
+        return other
+
+    def apply_gate(self, gate, targets):
+        """Apply a 2^k x 2^k gate to the k target qubits (in gate order)."""
+        targets = _as_targets(targets)
+        _check_targets(targets, self.n_qubits)
+        gate = np.asarray(gate)
+        k = len(targets)
+        if gate.shape != (2**k,) * 2:
+            raise ValueError(f"Gate dimension {gate.shape} incompatible with targets {targets}")
+        gate = as_dtype(gate, self.dtype)
+        with instrument.gate(gate):
+            if k == 1:
+                # A unitary on one site keeps both orthonormal halves intact
+                s = self.site[targets[0]]
+                self.tensors[s] = np.einsum('ij,ajb->aib', gate, self.tensors[s])
+            elif k == 2 and np.array_equal(gate, SWAP):
+                a, b = targets
+                sa, sb = self.site[a], self.site[b]
+                self._relabel(sb, a)
+                self._relabel(sa, b)
+            else:
+                start = self._gather(targets)
+                block = self.order[start:start + k]
+                perm = [targets.index(q) for q in block]
+                if perm != list(range(k)):
+                    # Reorder the gate's qubit axes to the order of the sites
+                    gate = gate.reshape((2,) * (2 * k)).transpose(perm + [k + p for p in perm])
+                    gate = gate.reshape(2**k, 2**k)
+                self._apply_block(gate, start, k)
+                self._hot = targets
+        return self
+
+    def apply_controlled(self, gate, controls, targets):
+        """Apply gate to targets only on the subspace where all controls are |1⟩."""
+        return self.apply_gate(*_controlled_gate(gate, controls, targets, self.dtype))
+
+    def _relabel(self, s, qubit):
+        self.order[s] = qubit
+        self.site[qubit] = s
+
+    def _gather(self, targets):
+        """Swap the targets onto adjacent sites; returns the first of them.
+
+        For two qubits only one moves: the one shared with the previous
+        multi-qubit gate if there is one, else the leftmost.
+        """
+        sites = [self.site[q] for q in targets]
+        if len(targets) == 2:
+            a, b = sites
+            if abs(a - b) == 1:
+                return min(a, b)
+            if (targets[0] in self._hot) != (targets[1] in self._hot):
+                mover = 0 if targets[0] in self._hot else 1
+            else:
+                mover = 0 if a < b else 1
+            source, other = sites[mover], sites[1 - mover]
+            self._move(source, other - 1 if source < other else other + 1)
+            return min(self.site[q] for q in targets)
+        first = min(sites)
+        for i, q in enumerate(sorted(targets, key=self.site.__getitem__)):
+            self._move(self.site[q], first + i)
+        return first
+
+    def _move(self, source, dest):
+        """Carry the qubit at site `source` to `dest` with adjacent SWAPs."""
+        step = 1 if dest > source else -1
+        for s in range(source, dest, step):
+            left = min(s, s + step)
+            self._apply_block(as_dtype(SWAP, self.dtype), left, 2)
+            a, b = self.order[left], self.order[left + 1]
+            self._relabel(left, b)
+            self._relabel(left + 1, a)
+
+    def _move_center(self, site):
+        """Shift the orthogonality center to `site` with QR sweeps."""
+        tensors = self.tensors
+        while self.center < site:
+            c = self.center
+            left, _, right = tensors[c].shape
+            q, r = np.linalg.qr(tensors[c].reshape(left * 2, right))
+            tensors[c] = q.reshape(left, 2, -1)
+            tensors[c + 1] = np.tensordot(r, tensors[c + 1], axes=(1, 0))
+            self.center += 1
+        while self.center > site:
+            c = self.center
+            left, _, right = tensors[c].shape
+            q, r = np.linalg.qr(tensors[c].reshape(left, 2 * right).T)
+            tensors[c] = q.T.reshape(-1, 2, right)
+            tensors[c - 1] = np.tensordot(tensors[c - 1], r.T, axes=(2, 0))
+            self.center -= 1
+
+    def _split(self, matrix):
+        """Truncated SVD matrix ≈ U · (S V†); U is left-orthonormal.
+
+        Keeps at most `max_bond` singular values and drops the smallest ones
+        while their total weight stays within `cutoff`. The kept values are
+        rescaled so the state stays normalised.
+        """
+        u, s, vh = np.linalg.svd(matrix, full_matrices=False)
+        weights = s**2
+        total = weights.sum()
+        # tail[i]: weight of singular values i.. that would be dropped
+        tail = np.cumsum(weights[::-1])[::-1] / total
+        keep = max(1, int(np.count_nonzero(tail > self.cutoff)))
+        if self.max_bond is not None:
+            keep = min(keep, self.max_bond)
+        if keep < len(s):
+            kept = weights[:keep].sum()
+            self.truncation_error += float((total - kept) / total)
+            s = s[:keep] * np.sqrt(total / kept)
+        return u[:, :keep], s[:, None].astype(matrix.dtype) * vh[:keep]
+
+    def _apply_block(self, gate, start, k):
+        """Apply a k-qubit gate to sites start..start+k-1 and re-split them."""
+        self._move_center(start)
+        tensors = self.tensors
+        theta = tensors[start]
+        for s in range(start + 1, start + k):
+            theta = np.tensordot(theta, tensors[s], axes=(theta.ndim - 1, 0))
+        op = gate.reshape((2,) * (2 * k))
+        theta = np.tensordot(op, theta, axes=(list(range(k, 2 * k)), list(range(1, k + 1))))
+        theta = np.moveaxis(theta, k, 0)  # (left, 2, ..., 2, right)
+        for s in range(start, start + k - 1):
+            left = theta.shape[0]
+            u, rest = self._split(theta.reshape(left * 2, -1))
+            tensors[s] = u.reshape(left, 2, -1)
+            theta = rest.reshape((-1,) + theta.shape[2:])
+        tensors[start + k - 1] = theta
+        self.center = start + k - 1
+
+    def measure_qubits(self, qubits, rng=None):
+        """Projective measurement of the listed qubits; the MPS collapses in place."""
+        rng = np.random.default_rng(rng)
+        bits = []
+        for q in _as_targets(qubits):
+            s = self.site[q]
+            self._move_center(s)
+            A = self.tensors[s]
+            p = np.sum(np.abs(A)**2, axis=(0, 2))
+            bit = int(rng.random() * p.sum() >= p[0])
+            collapsed = np.zeros_like(A)
+            collapsed[:, bit] = A[:, bit] / np.sqrt(p[bit])
+            self.tensors[s] = collapsed
+            bits.append(bit)
+        return bits
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw all shots at once; returns a (shots, n_measured) array of bits.
+
+        Sites are sampled left to right from the conditional probabilities,
+        carrying one boundary vector per shot. With the orthogonality center
+        on the first site everything to the right contracts to the identity,
+        so sampling stops at the last measured site and never collapses the
+        state.
+        """
+        rng = np.random.default_rng(rng)
+        qubits = tuple(range(self.n_qubits)) if qubits is None else _as_targets(qubits)
+        self._move_center(0)
+        bits = np.zeros((shots, self.n_qubits), dtype=np.uint8)
+        env = np.ones((shots, 1), dtype=self.dtype)
+        rows = np.arange(shots)
+        last = max((self.site[q] for q in qubits), default=-1)
+        for s in range(last + 1):
+            branches = np.einsum('ta,aib->tib', env, self.tensors[s])
+            p = np.sum(np.abs(branches)**2, axis=2)
+            bit = (rng.random(shots) * p.sum(axis=1) >= p[:, 0]).astype(np.uint8)
+            env = branches[rows, bit] / np.sqrt(p[rows, bit])[:, None]
+            bits[:, self.order[s]] = bit
+        return bits[:, list(qubits)]
+
+    def counts(self, shots, rng=None, qubits=None):
+        """sample() tallied into a {bitstring: count} dict."""
+        return counts_from_bits(self.sample(shots, rng, qubits))
+
+    def measure(self, rng=None):
+        """Sample one basis state; returns the list of qubit outcomes."""
+        return [int(b) for b in self.sample(1, rng)[0]]
+
+    def to_statevector(self):
+        """Dense 2^n statevector (qubit 0 most significant); small n only."""
+        psi = self.tensors[0]
+        for A in self.tensors[1:]:
+            psi = np.tensordot(psi, A, axes=(psi.ndim - 1, 0))
+        psi = psi.reshape((2,) * self.n_qubits)
+        return np.transpose(psi, self.site).reshape(-1)
+
+    def probabilities(self):
+        """Probability of each computational basis state (builds the statevector)."""
+        return np.abs(self.to_statevector())**2
+
+    def __str__(self):
+        """Register size, largest bond and accumulated truncation error."""
+        bond = max(self.bond_dimensions(), default=1)
+        return (f"MPSRegister({self.n_qubits} qubits, max bond {bond}, "
+                f"truncation error {self.truncation_error:.3g})")
@@ -0,0 +1,130 @@
+import numpy as np
+from .density import DensityMatrix
+from .register import BatchedRegister, apply_gate_inplace, _as_targets, _basis_slice
+from .sampling import sample_indices
+
+_I = np.eye(2, dtype=complex)
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+
+
+def depolarizing(p):
+    """Kraus operators for rho -> (1-p)·rho + p·I/2"""
+    return [np.sqrt(1 - 3 * p / 4) * _I, np.sqrt(p / 4) * _X,
+            np.sqrt(p / 4) * _Y, np.sqrt(p / 4) * _Z]
+
+
+def amplitude_damping(gamma):
+    """Kraus operators for energy relaxation |1⟩ -> |0⟩ with probability gamma"""
+    return [np.array([[1, 0], [0, np.sqrt(1 - gamma)]], dtype=complex),
+            np.array([[0, np.sqrt(gamma)], [0, 0]], dtype=complex)]
+
+
+def dephasing(p):
+    """Kraus operators that shrink coherences by (1-p) without changing populations"""
+    return [np.sqrt(1 - p / 2) * _I, np.sqrt(p / 2) * _Z]
+
+
+class NoiseModel:
+    """Single-qubit channels applied to every qubit a gate touches, after the gate."""
+
+    def __init__(self, *channels):
+        self.channels = [list(kraus) for kraus in channels]
+
+    def after(self, wires):
+        """(kraus, qubit) pairs to apply after a gate acting on `wires`."""
+        return [(kraus, q) for q in wires for kraus in self.channels]
+
+
+def _operations(circuit, optimize):
+    if circuit.has_measurements or any(op.condition is not None for op in circuit.operations):
+        raise ValueError("Noisy runs need a unitary circuit; defer measurements to controlled gates")
+    return (circuit.optimize() if optimize else circuit).operations
+
+
+def run_density(circuit, noise=None, rho=None, optimize=False):
+    """Execute a Circuit on a DensityMatrix, applying `noise` after every gate.
+
+    Circuits run unoptimized by default so the noise sees the gates as written.
+    """
+    rho = rho if rho is not None else DensityMatrix(circuit.n_qubits)
+    for op in _operations(circuit, optimize):
+        if op.controls:
+            rho.apply_controlled(op.gate, op.controls, op.targets)
+        else:
+            rho.apply_gate(op.gate, op.targets)
+        if noise is not None:
+            for kraus, q in noise.after(op.controls + op.targets):
+                rho.apply_channel(kraus, q)
+    return rho
+
+
+def _reduced_states(register, axes):
+    """(B, 2^k, 2^k) reduced density matrices of the target axes, one per member."""
+    tensor = register.tensor
+    dim = 2**len(axes)
+    slices = [tensor[_basis_slice(tensor.ndim, axes, i)] for i in range(dim)]
+    labels = list(range(slices[0].ndim))
+    rho = np.empty((register.batch_size, dim, dim), dtype=tensor.dtype)
+    for i in range(dim):
+        for j in range(i, dim):
+            rho[:, i, j] = np.einsum(slices[i], labels, np.conj(slices[j]), labels, labels[:1])
+            rho[:, j, i] = np.conj(rho[:, i, j])
+    return rho
+
+
+def apply_channel_trajectories(register, kraus, targets, rng=None):
+    """Stochastically apply a channel to every member of a BatchedRegister.
+
+    Each trajectory picks Kraus operator K with probability ||K|ψ⟩||², read
+    off the targets' reduced state as Tr(K†K ρ) (a constant for mixtures of
+    unitaries), so no branch is computed before the choice. The chosen
+    operator is then applied, renormalised, to its members only; operators
+    proportional to the identity leave their members untouched.
+    """
+    targets = _as_targets(targets)
+    axes = tuple(t + register._lead for t in targets)
+    kraus = [np.asarray(op) for op in kraus]
+    effects = [op.conj().T @ op for op in kraus]
+    dim = 2**len(targets)
+    if all(np.allclose(e, e[0, 0] * np.eye(dim)) for e in effects):
+        weights = np.tile([np.real(e[0, 0]) for e in effects], (register.batch_size, 1))
+    else:
+        rho = _reduced_states(register, axes)
+        weights = np.real(np.einsum('kij,bji->bk', np.array(effects), rho)).clip(0, None)
+    choice = sample_indices(weights, 1, rng)[:, 0]
+    for index, op in enumerate(kraus):
+        members = np.flatnonzero(choice == index)
+        if not len(members) or np.allclose(op, op[0, 0] * np.eye(dim)):
+            continue
+        norms = np.sqrt(weights[members, index])[:, None]
+        if len(members) == register.batch_size:
+            apply_gate_inplace(register.tensor, op, axes)
+            register.state /= norms
+            continue
+        block = register.state[members]
+        apply_gate_inplace(block.reshape((len(members),) + register.tensor.shape[1:]), op, axes)
+        block /= norms
+        register.state[members] = block
+    return register
+
+
+def run_trajectories(circuit, noise, trajectories, rng=None, register=None, optimize=False):
+    """Monte Carlo quantum trajectories: noisy statevectors evolved as one batch.
+
+    Needs only B·2^n amplitudes instead of the 4^n of a density matrix; the
+    batch average of |ψ⟩⟨ψ| converges to run_density's result as 1/√B.
+    """
+    rng = np.random.default_rng(rng)
+    if register is None:
+        register = BatchedRegister(circuit.n_qubits, batch_size=trajectories)
+    for op in _operations(circuit, optimize):
+        if op.controls:
+            register.apply_controlled(op.gate, op.controls, op.targets)
+        else:
+            register.apply_gate(op.gate, op.targets)
+        if noise is not None:
+            for kraus, q in noise.after(op.controls + op.targets):
+                apply_channel_trajectories(register, kraus, q, rng)
+    return register
@@ -0,0 +1,131 @@
+"""Exact expectation values of Pauli strings, without building Pauli matrices.
+
+A Pauli string P over n qubits acts on a basis state as
+
+    P|b⟩ = i^(#Y) · (-1)^popcount(b & z) · |b ^ x⟩
+
+where x marks the X/Y positions and z the Z/Y positions. So
+⟨ψ|P|ψ⟩ = i^(#Y) Σ_b conj(ψ[b^x]) ψ[b] (-1)^popcount(b & z): one flipped
+product per x mask, reduced against a parity pattern per z mask. Terms are
+grouped by x mask and each group makes a single pass over the state: the
+product is formed and summed down to the qubits the group's z masks touch
+in one einsum. A group with many z masks (e.g. all the diagonal terms of a
+Hamiltonian) then gets every parity sum from one Walsh-Hadamard transform.
+"""
+import numpy as np
+
+_PAULI_BITS = {'I': (0, 0), 'X': (1, 0), 'Y': (1, 1), 'Z': (0, 1)}
+
+
+def parse_pauli(pauli, n_qubits):
+    """(x positions, z positions, number of Ys) of a Pauli string like 'XIZY'
+
+    The first character acts on qubit 0.
+    """
+    pauli = pauli.upper()
+    if len(pauli) != n_qubits or any(c not in _PAULI_BITS for c in pauli):
+        raise ValueError(f"Expected a string of {n_qubits} characters from IXYZ, got {pauli!r}")
+    x = tuple(q for q, c in enumerate(pauli) if _PAULI_BITS[c][0])
+    z = tuple(q for q, c in enumerate(pauli) if _PAULI_BITS[c][1])
+    return x, z, pauli.count('Y')
+
+
+def group_by_flip(paulis, n_qubits):
+    """{x positions: [(term index, z positions, number of Ys), ...]}
+
+    Terms in one group flip the same qubits, so they share one product vector.
+    """
+    groups = {}
+    for k, pauli in enumerate(paulis):
+        x, z, n_y = parse_pauli(pauli, n_qubits)
+        groups.setdefault(x, []).append((k, z, n_y))
+    return groups
+
+
+def _walsh_hadamard(tensor, axes):
+    # In-place butterflies: afterwards tensor[z bits] = Σ_b v[b] (-1)^popcount(b & z)
+    for axis in axes:
+        zero = [slice(None)] * tensor.ndim
+        one = list(zero)
+        zero[axis], one[axis] = 0, 1
+        a, b = tensor[tuple(zero)], tensor[tuple(one)]
+        a += b           # a + b
+        b *= -2
+        b += a           # (a + b) - 2b = a - b
+    return tensor
+
+
+def _parity_sums(reduced, lead, touched, zs):
+    """Σ_b v[b] (-1)^popcount(b & z) for each z, given v summed down to the touched qubits
+
+    Signed differences per term, or one in-place Walsh-Hadamard transform
+    when the group has more terms than touched qubits.
+    """
+    axis_of = {q: lead + i for i, q in enumerate(touched)}
+    if len(zs) > len(touched):
+        spectrum = _walsh_hadamard(reduced, tuple(axis_of.values()))
+        return [spectrum[(Ellipsis,) + tuple(1 if q in z else 0 for q in touched)] for z in zs]
+    sums = []
+    for z in zs:
+        s = reduced.sum(axis=tuple(axis_of[q] for q in touched if q not in z))
+        for _ in z:
+            s = s.take(0, axis=lead) - s.take(1, axis=lead)
+        sums.append(s)
+    return sums
+
+
+def _operand(state):
+    # (kind, array): a density matrix, or statevector(s) with qubit axes last
+    if hasattr(state, 'rho'):
+        return 'density', np.asarray(state.rho)
+    return 'state', np.asarray(getattr(state, 'state', state))
+
+
+def expectation(state, paulis, coeffs=None):
+    """Exact ⟨P⟩ for one or many Pauli strings
+
+    `state` is a statevector or a batch (..., 2^n), anything with `.state`
+    (Qubit, QuantumRegister, BatchedRegister), or a DensityMatrix.
+    `paulis` is one string ('XZ'), a sequence of strings, or a
+    {string: coefficient} dict describing a Hamiltonian. Returns a float (or
+    batch) for one string, an array (..., n_terms) for a sequence, and
+    Σ c·⟨P⟩ for a dict or when `coeffs` is given.
+    """
+    single = isinstance(paulis, str)
+    if isinstance(paulis, dict):
+        paulis, coeffs = list(paulis), list(paulis.values())
+    terms = [paulis] if single else list(paulis)
+    kind, array = _operand(state)
+    dim = array.shape[-1]
+    n_qubits = dim.bit_length() - 1
+    if dim != 2**n_qubits:
+        raise ValueError(f"State dimension {dim} is not a power of two")
+
+    lead = 0 if kind == 'density' else array.ndim - 1
+    labels = list(range(lead + n_qubits))
+    values = np.empty(array.shape[:lead] + (len(terms),))
+    if kind == 'state':
+        tensor = array.reshape(array.shape[:lead] + (2,) * n_qubits)
+        conj = np.conj(tensor)
+    for x, group in group_by_flip(terms, n_qubits).items():
+        zs = [z for _, z, _ in group]
+        # Qubits no term in the group has a Z/Y on are summed out straight away
+        touched = sorted(set().union(*zs))
+        keep = labels[:lead] + [lead + q for q in touched]
+        if kind == 'density':
+            # Tr(ρP) = Σ_b phase(b) ρ[b, b^x]
+            flip = sum(1 << (n_qubits - 1 - q) for q in x)
+            basis = np.arange(dim)
+            reduced = np.einsum(array[basis, basis ^ flip].reshape((2,) * n_qubits), labels, keep)
+        else:
+            # conj(ψ[b^x]) ψ[b] multiplied and reduced in one einsum; the flip is a view
+            flipped = np.flip(conj, axis=tuple(lead + q for q in x)) if x else conj
+            reduced = np.einsum(flipped, labels, tensor, labels, keep)
+        for (k, _, n_y), s in zip(group, _parity_sums(reduced, lead, touched, zs)):
+            values[..., k] = np.real(1j**n_y * s)
+
+    if coeffs is not None:
+        return values @ np.asarray(coeffs, dtype=float)
+    if single:
+        return values[..., 0] if lead else float(values[0])
+    return values
@@ -0,0 +1,165 @@
+import os
+import tempfile
+import numpy as np
+from .precision import resolve_dtype
+from .register import QuantumRegister, apply_gate_inplace, _as_targets, _controlled_gate
+from . import instrument
+from .sampling import sample_indices, indices_to_bits, counts_from_indices
+
+
+class MemmapRegister(QuantumRegister):
+    """Register whose amplitudes live in an np.memmap file on local disk.
+
+    Gates are applied block by block: each block gathers the slabs of
+    trailing (low-order, contiguous) qubits that a gate couples, so a gate on
+    low qubits streams the file exactly once and a gate touching h high
+    qubits still reads and writes every amplitude once. `chunk_size` is the
+    number of amplitudes held in RAM per block and trades I/O against memory.
+
+    Without `path` the amplitudes go to a temporary file deleted by close().
+    An existing file at `path` is reopened in place when no `state` is given
+    (its size must match n_qubits and dtype); writing a new `state` over an
+    existing file requires overwrite=True. A new file starts as |0...0⟩.
+    """
+
+    def __init__(self, n_qubits, path=None, chunk_size=2**20, state=None, dtype=None, overwrite=False):
+        if chunk_size & (chunk_size - 1) or chunk_size < 8:
+            raise ValueError(f"chunk_size must be a power of two >= 8, got {chunk_size}")
+        self.n_qubits = n_qubits
+        self.chunk_size = min(chunk_size, 2**n_qubits)
+        self._owns_file = path is None
+        dtype = resolve_dtype(dtype)
+        reopen = False
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.amp')
+            os.close(fd)
+        elif os.path.exists(path):
+            if state is not None and not overwrite:
+                raise FileExistsError(f"{path} exists; pass overwrite=True to replace its amplitudes")
+            reopen = state is None
+        self.path = path
+        if reopen:
+            expected = 2**n_qubits * dtype.itemsize
+            if os.path.getsize(path) != expected:
+                raise ValueError(f"{path} holds {os.path.getsize(path)} bytes, expected {expected} "
+                                 f"for {n_qubits} qubits of {dtype}")
+            self.state = np.memmap(path, dtype=dtype, mode='r+', shape=(2**n_qubits,))
+            return
+        self.state = np.memmap(path, dtype=dtype, mode='w+', shape=(2**n_qubits,))
+        if state is None:
+            self.state[0] = 1  # |0...0⟩; the rest of a new file reads as zero
+        else:
+            state = np.asarray(state)
+            if state.shape != (2**n_qubits,):
+                raise ValueError(f"State shape {state.shape} incompatible with {n_qubits} qubits")
+            for start, stop in self._chunks():
+                self.state[start:stop] = state[start:stop]
+
+    def _chunks(self):
+        for start in range(0, len(self.state), self.chunk_size):
+            yield start, min(start + self.chunk_size, len(self.state))
+
+    def apply_gate(self, gate, targets):
+        """Apply a 2^k x 2^k gate to the k target qubits, one block at a time."""
+        targets = _as_targets(targets)
+        self._check_targets(targets)
+        gate = np.asarray(gate)
+        if gate.shape != (2**len(targets),) * 2:
+            raise ValueError(f"Gate dimension {gate.shape} incompatible with targets {targets}")
+        n = self.n_qubits
+        budget = int(np.log2(self.chunk_size))
+        if len(targets) > budget:
+            raise ValueError(f"chunk_size {self.chunk_size} too small for a {len(targets)}-qubit gate")
+        # Keep m trailing qubits whole inside a slab; the h targets above them
+        # select 2^h slabs, and a block of 2^(h+m) amplitudes must fit the budget
+        m = budget
+        high = sorted(t for t in targets if t < n - m)
+        while len(high) + m > budget:
+            m -= 1
+            high = sorted(t for t in targets if t < n - m)
+        rows = self.state.reshape(2**(n - m), 2**m)
+        prefix = n - m
+        others = [q for q in range(prefix) if q not in high]
+        # Row offsets of the 2^h slabs coupled by the high targets
+        offsets = np.zeros(1, dtype=np.int64)
+        for q in high:
+            offsets = (offsets[:, None] + np.array([0, 1 << (prefix - 1 - q)])).reshape(-1)
+        axes = tuple(high.index(t) if t in high else len(high) + t - prefix for t in targets)
+        with instrument.gate(gate, self.state):
+            for group in range(2**len(others)):
+                base = 0
+                for shift, q in enumerate(reversed(others)):
+                    base |= ((group >> shift) & 1) << (prefix - 1 - q)
+                index = base + offsets
+                block = np.array(rows[index])
+                apply_gate_inplace(block.reshape((2,) * (len(high) + m)), gate, axes)
+                rows[index] = block
+        return self
+
+    def apply_controlled(self, gate, controls, targets):
+        """Apply gate to targets on the subspace where all controls are |1⟩."""
+        return self.apply_gate(*_controlled_gate(gate, controls, targets, self.state.dtype))
+
+    def probabilities(self):
+        """Probability of each basis state (materialised in RAM)."""
+        probs = np.empty(len(self.state))
+        for start, stop in self._chunks():
+            probs[start:stop] = np.abs(self.state[start:stop])**2
+        return probs
+
+    def marginal_probabilities(self, qubits):
+        """Probabilities over the listed qubits, accumulated chunk by chunk."""
+        qubits = _as_targets(qubits)
+        self._check_targets(qubits)
+        shifts = [self.n_qubits - 1 - q for q in qubits]
+        marginal = np.zeros(2**len(qubits))
+        for start, stop in self._chunks():
+            basis = np.arange(start, stop)
+            key = np.zeros(len(basis), dtype=np.int64)
+            for shift in shifts:
+                key = (key << 1) | ((basis >> shift) & 1)
+            weights = np.abs(self.state[start:stop])**2
+            marginal += np.bincount(key, weights=weights, minlength=len(marginal))
+        return marginal
+
+    def _sample_indices(self, shots, rng):
+        # Pick a chunk per shot from the chunk totals, then sample within the
+        # chunks that were hit, so only one chunk is in RAM at a time
+        rng = np.random.default_rng(rng)
+        chunks = list(self._chunks())
+        totals = np.array([np.sum(np.abs(self.state[a:b])**2) for a, b in chunks])
+        picks = sample_indices(totals, shots, rng)
+        indices = np.empty(shots, dtype=np.int64)
+        for c in np.unique(picks):
+            start, stop = chunks[c]
+            hits = picks == c
+            probs = np.abs(self.state[start:stop])**2
+            indices[hits] = start + sample_indices(probs, int(hits.sum()), rng)
+        return indices
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw all shots; returns a (shots, n_measured) array of bits."""
+        if qubits is not None:
+            return super().sample(shots, rng, qubits)
+        return indices_to_bits(self._sample_indices(shots, rng), self.n_qubits)
+
+    def counts(self, shots, rng=None, qubits=None):
+        """Measurement histogram over `shots` as a {bitstring: count} dict."""
+        if qubits is not None:
+            return super().counts(shots, rng, qubits)
+        return counts_from_indices(self._sample_indices(shots, rng), self.n_qubits)
+
+    def flush(self):
+        """Write pending amplitude updates through to disk."""
+        self.state.flush()
+
+    def close(self):
+        """Release the mapping, deleting the backing file if it was temporary."""
+        self.state.flush()
+        del self.state
+        if self._owns_file and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __str__(self):
+        """String representation of the register."""
+        return f"MemmapRegister({self.n_qubits} qubits, {self.path}, chunk={self.chunk_size})"
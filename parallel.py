@@ -0,0 +1,113 @@
+"""Thread-parallel execution of gate kernels on large statevectors.
+
+A gate only mixes amplitudes along its target axes, so fixing every other
+(non-target) axis leaves independent blocks. apply_gate_inplace splits a
+large tensor over its most significant free axes (long contiguous runs)
+into a few blocks per thread and runs the ordinary kernel on each block
+from a shared thread pool. NumPy releases the GIL inside its elementwise,
+copy and BLAS loops, so the blocks really run concurrently.
+
+Off by default (one thread). Enable it globally, for a with-block, or
+through the QUANTUM_NUM_THREADS environment variable:
+
+    parallel.set_num_threads(8)
+    with parallel.num_threads(16):
+        register.apply_gate(H, 0)
+"""
+from contextlib import contextmanager
+import os
+import threading
+
+# Tensors smaller than this stay on the calling thread; below it the
+# per-block dispatch costs more than the kernel itself
+MIN_PARALLEL_AMPLITUDES = 2**16
+
+# Blocks per thread, so uneven blocks still balance across the pool
+BLOCKS_PER_THREAD = 4
+
+_num_threads = max(1, int(os.environ.get('QUANTUM_NUM_THREADS', 1)))
+_pool = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_num_threads():
+    """Number of threads gate kernels may use (1: serial)."""
+    return _num_threads
+
+
+def set_num_threads(n):
+    """Set the kernel thread count; None means one per CPU."""
+    global _num_threads, _pool
+    n = (os.cpu_count() or 1) if n is None else int(n)
+    if n < 1:
+        raise ValueError(f"Thread count must be at least 1, got {n}")
+    with _pool_lock:
+        if _pool is not None and n != _num_threads:
+            _pool.shutdown(wait=True)
+            _pool = None
+        _num_threads = n
+
+
+@contextmanager
+def num_threads(n):
+    """Temporarily use `n` kernel threads inside a with-block."""
+    previous = _num_threads
+    set_num_threads(n)
+    try:
+        yield _num_threads
+    finally:
+        set_num_threads(previous)
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Imported on first use: concurrent.futures is a noticeable share of startup
+            from concurrent.futures import ThreadPoolExecutor
+            _pool = ThreadPoolExecutor(_num_threads, thread_name_prefix='quantum-kernel',
+                                       initializer=_mark_worker)
+        return _pool
+
+
+def _mark_worker():
+    _local.worker = True
+
+
+def blocks(shape, axes):
+    """Split a tensor into independent blocks for a gate on `axes`.
+
+    Returns None when the work should stay serial (one thread, small tensor,
+    or called from a kernel thread), else a list of (index, block_axes):
+    `tensor[index]` is a block and `block_axes` the gate axes inside it.
+    """
+    size = 1
+    for dim in shape:
+        size *= dim
+    if _num_threads == 1 or size < MIN_PARALLEL_AMPLITUDES or getattr(_local, 'worker', False):
+        return None
+    free = [a for a in range(len(shape)) if a not in axes]
+    split, count = [], 1
+    for a in free:
+        if count >= _num_threads * BLOCKS_PER_THREAD or size // (count * shape[a]) < MIN_PARALLEL_AMPLITUDES // 4:
+            break
+        split.append(a)
+        count *= shape[a]
+    if count == 1:
+        return None
+    block_axes = tuple(a - sum(s < a for s in split) for a in axes)
+    result = []
+    for b in range(count):
+        index = [slice(None)] * len(shape)
+        for a in reversed(split):
+            b, index[a] = divmod(b, shape[a])
+        result.append((tuple(index), block_axes))
+    return result
+
+
+def run(func, items):
+    """Call func(item) for every item on the kernel pool and wait for all."""
+    futures = [_executor().submit(func, item) for item in items]
+    for future in futures:
+        future.result()  # re-raises the first kernel error
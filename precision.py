@@ -0,0 +1,43 @@
+"""Precision policy for states and gate tables (see README: Precision).
+
+Registers resolve their dtype once at construction and gate tables are cast
+to that dtype before use, so no kernel silently upcasts to complex128.
+"""
+from contextlib import contextmanager
+import numpy as np
+
+SUPPORTED_DTYPES = (np.dtype(np.complex64), np.dtype(np.complex128))
+
+_default_dtype = np.dtype(np.complex128)
+
+
+def resolve_dtype(dtype=None):
+    """Validate a dtype, falling back to the global default for None."""
+    if dtype is None:
+        return _default_dtype
+    dtype = np.dtype(dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported state dtype {dtype}; use complex64 or complex128")
+    return dtype
+
+
+def get_default_dtype():
+    """Dtype used by states and registers created without an explicit dtype."""
+    return _default_dtype
+
+
+def set_default_dtype(dtype):
+    """Set the global state dtype (complex64 or complex128)."""
+    global _default_dtype
+    _default_dtype = resolve_dtype(dtype)
+
+
+@contextmanager
+def default_dtype(dtype):
+    """Temporarily switch the global state dtype inside a with-block."""
+    previous = _default_dtype
+    set_default_dtype(dtype)
+    try:
+        yield _default_dtype
+    finally:
+        set_default_dtype(previous)
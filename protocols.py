@@ -1,43 +1,173 @@
 import numpy as np
 from .gates import H, X, Z, CNOT, apply_gate
 from .state import Qubit
+from .register import QuantumRegister, BatchedRegister, fidelity
+from .precision import get_default_dtype
+from .circuit import Circuit, BranchCache
+from .density import DensityMatrix
+from .noise import run_density, run_trajectories
+from . import instrument
 
-def teleport(qubit, sender, receiver, verbose=False):
-    """Fixed teleportation protocol with proper gate dimensions"""
+def teleport(qubit, sender, receiver, verbose=False, rng=None):
+    """Teleportation protocol on a 3-qubit register"""
     if verbose: print(f"\n=== Teleporting qubit from {sender} to {receiver} ===")
-    
+
     # Step 1: Create Bell pair (|00> + |11>)/√2
-    alice = Qubit(np.array([1, 0]))
-    bob = Qubit(np.array([1, 0]))
-    alice.state = apply_gate(alice.state, H)
-    bell_state = apply_gate(np.kron(alice.state, bob.state), CNOT)
-    if verbose: 
-        print(f"1. Bell pair created: {np.round(bell_state, 3)}")
-    
+    with instrument.span('teleport.bell_pair'):
+        bell = QuantumRegister(2)
+        bell.apply_gate(H, 0)
+        bell.apply_gate(CNOT, [0, 1])
+    if verbose:
+        print(f"1. Bell pair created: {np.round(bell.state, 3)}")
+
     # Step 2: Combine with input qubit (|ψ⟩⊗(|00⟩+|11⟩)/√2)
-    combined = np.kron(qubit.state, bell_state)
+    # System ordering: |ψ⟩|a⟩|b⟩
+    with instrument.span('teleport.combine'):
+        combined = QuantumRegister(3, np.kron(qubit.state, bell.state))
     if verbose:
-        print(f"2. Combined state (|ψ⟩⊗Bell):\n{np.round(combined, 3)}")
-    
+        print(f"2. Combined state (|ψ⟩⊗Bell):\n{np.round(combined.state, 3)}")
+
     # Step 3: Alice's operations (CNOT then H on her qubits)
-    # System ordering: |ψ⟩|a⟩|b⟩
-    cnot_gate = np.kron(CNOT, np.eye(2))  # CNOT on ψ and a
-    hadamard_gate = np.kron(np.kron(H, np.eye(2)), np.eye(2))  # H on ψ
-    combined = apply_gate(combined, cnot_gate)
-    combined = apply_gate(combined, hadamard_gate)
+    with instrument.span('teleport.alice'):
+        combined.apply_gate(CNOT, [0, 1])  # CNOT on ψ and a
+        combined.apply_gate(H, 0)  # H on ψ
     if verbose:
-        print(f"3. After Alice's operations:\n{np.round(combined, 3)}")
-    
-    # Step 4: Measurement simulation (simplified)
-    m1 = 0 if np.random.random() < 0.5 else 1  # ψ measurement
-    m2 = 0 if np.random.random() < 0.5 else 1  # a measurement
+        print(f"3. After Alice's operations:\n{np.round(combined.state, 3)}")
+
+    # Step 4: Measure ψ and a; the register collapses in place
+    with instrument.span('teleport.measure'):
+        m1, m2 = combined.measure_qubits([0, 1], rng)
     if verbose:
         print(f"4. Measurement results: m1={m1}, m2={m2}")
-    
-    # Step 5: Bob's correction
-    if m2: bob.state = apply_gate(bob.state, X)
-    if m1: bob.state = apply_gate(bob.state, Z)
+
+    # Step 5: Bob's correction on the post-measurement state of b
+    with instrument.span('teleport.correct'):
+        bob = Qubit(combined.tensor[m1, m2].copy())
+        if m2: bob.state = apply_gate(bob.state, X)
+        if m1: bob.state = apply_gate(bob.state, Z)
     if verbose:
         print(f"5. Bob's final state: {np.round(bob.state, 3)}")
-    
-    return bob
\ No newline at end of file
+
+    return bob
+
+def teleport_batch(states, rng=None):
+    """Teleport a (B, 2) array of input states in one vectorized pass.
+
+    Every step of `teleport` is applied to the whole batch at once and each
+    member gets its own measurement outcome; returns Bob's (B, 2) states.
+    """
+    states = np.asarray(states, dtype=get_default_dtype())
+    batch = len(states)
+
+    # Steps 1-2: |ψ⟩ ⊗ (|00⟩+|11⟩)/√2 for every member
+    with instrument.span('teleport.bell_pair', batch=batch):
+        zero = np.tile(np.array([1, 0], dtype=states.dtype), (batch, 1))
+        register = BatchedRegister.from_qubit_states(states, zero, zero, dtype=states.dtype)
+        register.apply_gate(H, 1)
+        register.apply_gate(CNOT, [1, 2])
+
+    # Step 3: Alice's operations
+    with instrument.span('teleport.alice', batch=batch):
+        register.apply_gate(CNOT, [0, 1])
+        register.apply_gate(H, 0)
+
+    # Step 4: one measurement of (ψ, a) per member, collapsing each in place
+    with instrument.span('teleport.measure', batch=batch):
+        m1, m2 = register.measure_qubits([0, 1], rng).T
+
+    # Step 5: Bob's collapsed qubit and his corrections
+    with instrument.span('teleport.correct', batch=batch):
+        bob = register.tensor[np.arange(batch), m1, m2]
+        bob[m2 == 1] = bob[m2 == 1][:, ::-1]  # X
+        bob[m1 == 1, 1] *= -1  # Z
+    return bob
+
+def teleport_fidelity(states, rng=None):
+    """Per-member fidelity of `teleport_batch` against the input states."""
+    states = np.asarray(states, dtype=get_default_dtype())
+    states = states / np.linalg.norm(states, axis=1, keepdims=True)
+    return fidelity(teleport_batch(states, rng), states)
+
+def teleport_circuit():
+    """Teleportation with deferred measurement: Bob's X/Z corrections become
+    CNOT(a -> b) and CZ(ψ -> b), so the whole protocol is one unitary circuit"""
+    circuit = Circuit(3)
+    circuit.apply_gate(H, 1)
+    circuit.apply_gate(CNOT, [1, 2])
+    circuit.apply_gate(CNOT, [0, 1])
+    circuit.apply_gate(H, 0)
+    circuit.apply_controlled(X, 1, 2)
+    circuit.apply_controlled(Z, 0, 2)
+    return circuit
+
+def teleport_feedforward_circuit(measure_bob=True):
+    """Teleportation with real mid-circuit measurement of ψ and a into c0, c1
+
+    Bob's X and Z corrections are classically conditioned on c1 and c0. With
+    `measure_bob` his qubit is finally measured into c2.
+    """
+    circuit = Circuit(3, n_clbits=2)
+    circuit.apply_gate(H, 1)
+    circuit.apply_gate(CNOT, [1, 2])
+    circuit.apply_gate(CNOT, [0, 1])
+    circuit.apply_gate(H, 0)
+    circuit.measure([0, 1], [0, 1])
+    circuit.apply_gate(X, 2, condition=(1, 1))
+    circuit.apply_gate(Z, 2, condition=(0, 1))
+    if measure_bob:
+        circuit.measure(2, 2)
+    return circuit
+
+def teleport_shots(state, shots, rng=None, cache=None):
+    """Teleport `state` `shots` times with feed-forward and measure Bob's qubit.
+
+    Uses a BranchCache, so the circuit is simulated once per measurement
+    branch (at most four) rather than once per shot. Returns the
+    {'c0c1c2': count} histogram and the cache, which can be passed back in
+    to draw more shots without any further simulation.
+    """
+    if cache is None:
+        state = np.asarray(getattr(state, 'state', state), dtype=get_default_dtype())
+        register = QuantumRegister(3, np.kron(state / np.linalg.norm(state), [1, 0, 0, 0]))
+        cache = BranchCache(teleport_feedforward_circuit(), register)
+    return cache.sample(shots, rng), cache
+
+def teleport_chain_circuit(hops, prepare=H):
+    """Teleport qubit 0 along a chain of `hops` Bell pairs (1 + 2*hops qubits).
+
+    Each hop is the deferred-measurement teleport_circuit, so the chain is
+    Clifford whenever `prepare` is, and Circuit.run simulates it on the
+    stabilizer backend in polynomial time. The input ends on the last qubit.
+    """
+    circuit = Circuit(1 + 2 * hops)
+    circuit.apply_gate(prepare, 0)
+    source = 0
+    for hop in range(hops):
+        a, b = 1 + 2 * hop, 2 + 2 * hop
+        circuit.apply_gate(H, a)
+        circuit.apply_gate(CNOT, [a, b])
+        circuit.apply_gate(CNOT, [source, a])
+        circuit.apply_gate(H, source)
+        circuit.apply_controlled(X, a, b)
+        circuit.apply_controlled(Z, source, b)
+        source = b
+    return circuit
+
+def noisy_teleport_fidelity(state, noise, trajectories=None, rng=None):
+    """Fidelity of Bob's qubit with the input under a NoiseModel.
+
+    Uses the exact density-matrix backend, or `trajectories` Monte Carlo
+    statevector trajectories when given.
+    """
+    state = np.asarray(getattr(state, 'state', state), dtype=complex)
+    state = state / np.linalg.norm(state)
+    initial = np.kron(state, [1, 0, 0, 0])
+    if trajectories is None:
+        rho = run_density(teleport_circuit(), noise, DensityMatrix.from_state(initial))
+        return float(np.real(np.conj(state) @ rho.reduced([2]) @ state))
+    register = BatchedRegister(3, np.tile(initial, (trajectories, 1)))
+    register = run_trajectories(teleport_circuit(), noise, trajectories, rng, register)
+    # Bob's reduced state averaged over trajectories: ⟨ψ|rho_b|ψ⟩
+    bob = register.tensor.reshape(trajectories, 4, 2)
+    overlaps = np.abs(np.einsum('j,bij->bi', np.conj(state), bob))**2
+    return float(overlaps.sum(axis=1).mean())
@@ -0,0 +1,410 @@
+import numpy as np
+from .gates import is_diagonal, permutation_of, controlled_decomposition
+from .gate_factory import as_dtype, controlled
+from .observables import expectation
+from . import instrument, parallel
+from .precision import resolve_dtype
+from .sampling import sample_indices, indices_to_bits, counts_from_indices, batch_counts
+
+
+def _as_targets(targets):
+    """Normalise a target spec (int or sequence of ints) to a tuple"""
+    if np.isscalar(targets):
+        return (int(targets),)
+    return tuple(int(t) for t in targets)
+
+
+def _check_targets(targets, n_qubits):
+    """Raise ValueError unless targets are distinct qubit indices below n_qubits"""
+    for t in targets:
+        if not 0 <= t < n_qubits:
+            raise ValueError(f"Qubit index {t} out of range for {n_qubits} qubits")
+    if len(set(targets)) != len(targets):
+        raise ValueError(f"Duplicate qubit indices in {targets}")
+
+
+def _controlled_gate(gate, controls, targets, dtype):
+    """(diag(I, ..., U), controls + targets) for registers that apply it as one gate.
+
+    apply_gate_inplace recognises the controlled structure, so applying the
+    expanded gate only touches the slice where the controls are |1⟩.
+    """
+    controls = _as_targets(controls)
+    return controlled(np.asarray(gate), len(controls), dtype), controls + _as_targets(targets)
+
+
+def apply_gate_to_axes(tensor, gate, targets, out=None):
+    """Contract a k-qubit gate into the target axes of a (2,)*n state tensor.
+
+    Only the target axes are touched, so the cost is O(2^n) per gate instead
+    of the O(4^n) needed to build and apply the full kron-expanded operator.
+    With `out` the result is written into that preallocated array.
+    """
+    k = len(targets)
+    op = np.asarray(gate).reshape((2,) * (2 * k))
+    if out is not None:
+        # einsum labels: the target axes are summed over fresh input labels
+        axes = list(range(tensor.ndim))
+        inputs = list(axes)
+        for i, t in enumerate(targets):
+            inputs[t] = tensor.ndim + i
+        op_labels = list(targets) + [inputs[t] for t in targets]
+        return np.einsum(op, op_labels, tensor, inputs, axes, out=out)
+    result = np.tensordot(op, tensor, axes=(list(range(k, 2 * k)), list(targets)))
+    # tensordot puts the gate's output axes first; move them back in place
+    return np.moveaxis(result, list(range(k)), list(targets))
+
+
+def _basis_slice(ndim, axes, i):
+    """Index selecting basis state i of the given axes (axes[0] most significant)"""
+    index = [slice(None)] * ndim
+    for shift, axis in enumerate(reversed(axes)):
+        index[axis] = (i >> shift) & 1
+    return tuple(index)
+
+
+def _permute_inplace(tensor, perm, axes):
+    """out[i] = in[perm[i]] over the target axes, moving slices cycle by cycle"""
+    seen = set()
+    for start in range(len(perm)):
+        if start in seen or perm[start] == start:
+            continue
+        cycle = [start]
+        j = perm[start]
+        while j != start:
+            cycle.append(j)
+            j = perm[j]
+        seen.update(cycle)
+        first = tensor[_basis_slice(tensor.ndim, axes, cycle[0])].copy()
+        for a, b in zip(cycle, cycle[1:]):
+            tensor[_basis_slice(tensor.ndim, axes, a)] = tensor[_basis_slice(tensor.ndim, axes, b)]
+        tensor[_basis_slice(tensor.ndim, axes, cycle[-1])] = first
+
+
+def apply_gate_inplace(tensor, gate, axes, scratch=None):
+    """Apply a gate to the given axes of tensor in place, picking a kernel by structure.
+
+    - controlled-U: only the slice where the controls are |1⟩ is touched
+    - diagonal: broadcast elementwise multiply
+    - permutation: slice moves, no arithmetic at all
+    - anything else: dense contraction, written into `scratch` (an array
+      shaped like tensor) when given instead of a freshly allocated result
+    The gate is cast to the tensor's dtype first (cached, see gate_factory)
+    so nothing is upcast. With more than one kernel thread configured, large
+    tensors are split into independent blocks over the non-target axes and
+    the blocks run on the thread pool (see parallel).
+    """
+    gate = as_dtype(gate, tensor.dtype)
+    axes = tuple(axes)
+    split = parallel.blocks(tensor.shape, axes)
+    if split is None:
+        return _apply_inplace(tensor, gate, axes, scratch)
+
+    def apply_block(block):
+        index, block_axes = block
+        _apply_inplace(tensor[index], gate, block_axes, None if scratch is None else scratch[index])
+
+    parallel.run(apply_block, split)
+    return tensor
+
+
+def _apply_inplace(tensor, gate, axes, scratch):
+    # Serial kernel dispatch for apply_gate_inplace
+    n_controls, sub = controlled_decomposition(gate)
+    if n_controls:
+        controls = axes[:n_controls]
+        index = [slice(None)] * tensor.ndim
+        for axis in controls:
+            index[axis] = 1
+        # Integer indexing drops the control axes; shift the remaining targets
+        remaining = tuple(a - sum(c < a for c in controls) for a in axes[n_controls:])
+        index = tuple(index)
+        _apply_inplace(tensor[index], sub, remaining,
+                       None if scratch is None else scratch[index])
+    elif is_diagonal(gate):
+        diag = np.diagonal(gate).reshape((2,) * len(axes))
+        diag = np.transpose(diag, np.argsort(axes))
+        shape = [1] * tensor.ndim
+        for axis in axes:
+            shape[axis] = 2
+        tensor *= diag.reshape(shape)
+    else:
+        perm = permutation_of(gate)
+        if perm is not None:
+            _permute_inplace(tensor, perm, axes)
+        else:
+            tensor[...] = apply_gate_to_axes(tensor, gate, axes, out=scratch)
+    return tensor
+
+
+def bloch_components(rdms):
+    """Bloch vectors (..., 3) from single-qubit density matrices (..., 2, 2)
+
+    rho = (I + xX + yY + zZ)/2, so x = 2·Re rho10, y = 2·Im rho10, z = rho00 - rho11.
+    """
+    rdms = np.asarray(rdms)
+    coherence = rdms[..., 1, 0]
+    return np.stack([2 * coherence.real, 2 * coherence.imag,
+                     (rdms[..., 0, 0] - rdms[..., 1, 1]).real], axis=-1)
+
+
+class QuantumRegister:
+    """n-qubit register holding a single 2^n amplitude vector.
+
+    Qubit 0 is the most significant bit, matching the np.kron ordering used
+    throughout the simulator (|q0 q1 ... q(n-1)⟩).
+    """
+
+    def __init__(self, n_qubits, state=None, dtype=None):
+        self.n_qubits = n_qubits
+        dtype = resolve_dtype(dtype)
+        if state is None:
+            state = np.zeros(2**n_qubits, dtype=dtype)
+            state[0] = 1  # |0...0⟩ by default
+        state = np.array(state, dtype=dtype)
+        if state.shape != (2**n_qubits,):
+            raise ValueError(f"State shape {state.shape} incompatible with {n_qubits} qubits")
+        self.state = state
+        self._scratch = None
+
+    @classmethod
+    def from_qubits(cls, qubits, dtype=None):
+        """Build a register from the product state of a list of qubits."""
+        dtype = resolve_dtype(dtype)
+        state = np.ones(1, dtype=dtype)
+        for q in qubits:
+            state = np.kron(state, np.asarray(q.state, dtype=dtype))
+        return cls(len(qubits), state, dtype)
+
+    @property
+    def dtype(self):
+        return self.state.dtype
+
+    def _scratch_for(self, gate, index=()):
+        # Reusable out= buffer for dense contractions. Diagonal and
+        # permutation gates work in place, so they never allocate one.
+        sub = controlled_decomposition(gate)[1]
+        if is_diagonal(sub) or permutation_of(sub) is not None:
+            return None
+        if self._scratch is None or self._scratch.shape != self.state.shape \
+                or self._scratch.dtype != self.state.dtype:
+            self._scratch = np.empty_like(self.state)
+        return self._scratch.reshape(self.tensor.shape)[index]
+
+    @property
+    def tensor(self):
+        """View of the amplitudes with one axis per qubit."""
+        return self.state.reshape(self.state.shape[:-1] + (2,) * self.n_qubits)
+
+    @property
+    def _lead(self):
+        # Number of leading (batch) axes in front of the qubit axes
+        return self.state.ndim - 1
+
+    def _check_targets(self, targets):
+        _check_targets(targets, self.n_qubits)
+
+    def apply_gate(self, gate, targets):
+        """Apply a 2^k x 2^k gate to the k target qubits (in gate order)."""
+        targets = _as_targets(targets)
+        self._check_targets(targets)
+        gate = np.asarray(gate)
+        if gate.shape != (2**len(targets),) * 2:
+            raise ValueError(f"Gate dimension {gate.shape} incompatible with targets {targets}")
+        axes = tuple(t + self._lead for t in targets)
+        with instrument.gate(gate, self.state):
+            apply_gate_inplace(self.tensor, gate, axes, self._scratch_for(gate))
+        return self
+
+    def apply_controlled(self, gate, controls, targets):
+        """Apply gate to targets only on the subspace where all controls are |1⟩."""
+        controls = _as_targets(controls)
+        targets = _as_targets(targets)
+        self._check_targets(controls + targets)
+        # Fixing the control axes to 1 leaves a view over the remaining qubits
+        lead = self._lead
+        index = (slice(None),) * lead + tuple(1 if q in controls else slice(None) for q in range(self.n_qubits))
+        free = [q for q in range(self.n_qubits) if q not in controls]
+        sub_targets = tuple(lead + free.index(t) for t in targets)
+        gate = np.asarray(gate)
+        with instrument.gate(gate, self.state):
+            apply_gate_inplace(self.tensor[index], gate, sub_targets, self._scratch_for(gate, index))
+        return self
+
+    def probabilities(self):
+        """Probability of each computational basis state."""
+        return np.abs(self.state)**2
+
+    def marginal_probabilities(self, qubits):
+        """Probabilities over the listed qubits (in that order), others traced out.
+
+        |ψ|² is reduced in one einsum over a real view of the amplitudes, so
+        no 2^n probability array is allocated.
+        """
+        qubits = _as_targets(qubits)
+        self._check_targets(qubits)
+        lead = self._lead
+        parts = np.ascontiguousarray(self.state).view(self.state.real.dtype)
+        parts = parts.reshape(self.state.shape[:-1] + (2,) * self.n_qubits + (2,))
+        labels = list(range(parts.ndim))
+        keep = labels[:lead] + [lead + q for q in qubits]
+        return np.einsum(parts, labels, parts, labels, keep).reshape(self.state.shape[:-1] + (-1,))
+
+    def project(self, qubits, outcome):
+        """Collapse onto `outcome` of the listed qubits in place and renormalise.
+
+        `outcome` is the value read from the qubits, qubits[0] most significant
+        (one value per member for a batch). Returns its probability.
+        """
+        qubits = _as_targets(qubits)
+        return self._collapse(qubits, np.asarray(outcome), self.marginal_probabilities(qubits))
+
+    def measure_qubits(self, qubits, rng=None):
+        """Projective measurement of the listed qubits; the state collapses in place.
+
+        Returns the outcome bits in `qubits` order, a (B, k) array for a batch.
+        """
+        qubits = _as_targets(qubits)
+        probs = self.marginal_probabilities(qubits)
+        outcome = sample_indices(probs, 1, rng)[..., 0]
+        self._collapse(qubits, outcome, probs)
+        bits = indices_to_bits(np.atleast_1d(outcome), len(qubits))
+        return [int(b) for b in bits[0]] if self._lead == 0 else bits
+
+    def _collapse(self, qubits, outcome, probs):
+        # One in-place multiply by a (..., 2^k) table broadcast over the
+        # measured axes: 1/sqrt(p) on the outcome, 0 on every other branch
+        outcome = outcome[..., None]
+        p = np.take_along_axis(probs, outcome, axis=-1)
+        if np.any(p <= 0):
+            raise ValueError(f"Outcome {outcome.ravel()} has zero probability on qubits {qubits}")
+        scale = np.zeros(probs.shape, dtype=probs.dtype)
+        np.put_along_axis(scale, outcome, 1 / np.sqrt(p), axis=-1)
+        lead = self._lead
+        scale = scale.reshape(probs.shape[:-1] + (2,) * len(qubits))
+        order = tuple(range(lead)) + tuple(lead + i for i in np.argsort(qubits))
+        shape = self.state.shape[:-1] + tuple(2 if q in qubits else 1 for q in range(self.n_qubits))
+        tensor = self.tensor
+        tensor *= np.transpose(scale, order).reshape(shape)
+        return float(p[0]) if lead == 0 else p[..., 0]
+
+    def reduced_density_matrices(self):
+        """Every qubit's reduced density matrix as a (..., n, 2, 2) array.
+
+        Populations come from one pass over the probabilities: peeling off the
+        leading qubit halves the array each step, ~2·2^n adds for all qubits.
+        Each coherence rho10 = Σ ψ(..1..)·conj ψ(..0..) is one product over the
+        two halves of a (2^q, 2, 2^(n-q-1)) reshape view. No partial trace
+        of a 4^n density matrix is ever formed.
+        """
+        n = self.n_qubits
+        lead = self.state.shape[:-1]
+        rdms = np.empty(lead + (n, 2, 2), dtype=self.state.dtype)
+        probs = self.probabilities()
+        for q in range(n):
+            split = probs.reshape(lead + (2, -1))
+            rdms[..., q, 0, 0], rdms[..., q, 1, 1] = np.moveaxis(split.sum(axis=-1), -1, 0)
+            probs = split.sum(axis=-2)  # trace out qubit q for the next step
+            view = self.state.reshape(lead + (2**q, 2, 2**(n - q - 1)))
+            coherence = np.sum(view[..., 1, :] * np.conj(view[..., 0, :]), axis=(-2, -1))
+            rdms[..., q, 1, 0] = coherence
+            rdms[..., q, 0, 1] = np.conj(coherence)
+        return rdms
+
+    def bloch_vectors(self):
+        """(..., n, 3) Bloch vector of every qubit; length < 1 means entangled/mixed."""
+        return bloch_components(self.reduced_density_matrices())
+
+    def purities(self):
+        """(..., n) purity Tr(rho_q²) = (1 + |r_q|²)/2 of every qubit's reduced state."""
+        return (1 + np.sum(self.bloch_vectors()**2, axis=-1)) / 2
+
+    def expectation(self, paulis, coeffs=None):
+        """Exact ⟨P⟩ of Pauli strings or a {string: coeff} Hamiltonian (see observables.expectation)."""
+        return expectation(self, paulis, coeffs)
+
+    def measure(self, rng=None):
+        """Sample one basis state; returns the list of qubit outcomes."""
+        return [int(b) for b in self.sample(1, rng)[0]]
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw all shots at once; returns a (shots, n_measured) array of bits."""
+        probs, n = self._measured_probabilities(qubits)
+        return indices_to_bits(sample_indices(probs, shots, rng), n)
+
+    def counts(self, shots, rng=None, qubits=None):
+        """Measurement histogram over `shots` as a {bitstring: count} dict."""
+        probs, n = self._measured_probabilities(qubits)
+        return counts_from_indices(sample_indices(probs, shots, rng), n)
+
+    def _measured_probabilities(self, qubits):
+        if qubits is None:
+            return self.probabilities(), self.n_qubits
+        qubits = _as_targets(qubits)
+        return self.marginal_probabilities(qubits), len(qubits)
+
+    def __str__(self):
+        """String representation of the register state."""
+        return f"QuantumRegister({self.n_qubits} qubits): {self.state}"
+
+
+class BatchedRegister(QuantumRegister):
+    """B independent n-qubit states evolved together as one (B, 2^n) array.
+
+    Every gate is applied to the whole batch in a single vectorized call, so
+    sweeping many input states costs a handful of NumPy kernels rather than a
+    Python loop over registers.
+    """
+
+    def __init__(self, n_qubits, states=None, batch_size=None, dtype=None):
+        self.n_qubits = n_qubits
+        dtype = resolve_dtype(dtype)
+        if states is None:
+            if batch_size is None:
+                raise ValueError("Either states or batch_size is required")
+            states = np.zeros((batch_size, 2**n_qubits), dtype=dtype)
+            states[:, 0] = 1  # every member starts in |0...0⟩
+        states = np.array(states, dtype=dtype)
+        if states.ndim != 2 or states.shape[1] != 2**n_qubits:
+            raise ValueError(f"States shape {states.shape} incompatible with (B, {2**n_qubits})")
+        self.state = states
+        self._scratch = None
+
+    @classmethod
+    def from_qubit_states(cls, *columns, dtype=None):
+        """Product states from per-qubit (B, 2) arrays, one array per qubit."""
+        dtype = resolve_dtype(dtype)
+        states = np.ones((len(columns[0]), 1), dtype=dtype)
+        for column in columns:
+            column = np.asarray(column, dtype=dtype)
+            states = np.einsum('bi,bj->bij', states, column).reshape(len(states), -1)
+        return cls(len(columns), states, dtype=dtype)
+
+    @property
+    def batch_size(self):
+        return self.state.shape[0]
+
+    def measure(self, rng=None):
+        """One shot per batch member; returns a (B, n_qubits) array of bits."""
+        return self.sample(1, rng)[:, 0]
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw shots for every member at once; returns (B, shots, n_measured) bits."""
+        probs, n = self._measured_probabilities(qubits)
+        indices = sample_indices(probs, shots, rng)
+        return indices_to_bits(indices.reshape(-1), n).reshape(indices.shape + (n,))
+
+    def counts(self, shots, rng=None, qubits=None):
+        """Per-member measurement histograms as a list of {bitstring: count} dicts."""
+        probs, n = self._measured_probabilities(qubits)
+        return batch_counts(sample_indices(probs, shots, rng), n)
+
+    def __str__(self):
+        """String representation of the batch."""
+        return f"BatchedRegister({self.batch_size} x {self.n_qubits} qubits)"
+
+
+def fidelity(states, reference):
+    """|⟨reference|state⟩|² along the last axis; broadcasts over batches."""
+    overlap = np.sum(np.conj(reference) * states, axis=-1)
+    return np.abs(overlap)**2
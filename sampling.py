@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def sample_indices(probs, shots, rng=None):
+    """Draw `shots` basis-state indices from a probability vector in one call.
+
+    `rng` may be a numpy Generator, a seed, or None for fresh entropy. The
+    cumulative distribution is built once and all shots are located with a
+    single vectorized searchsorted. A (B, dim) array of probability rows
+    gives a (B, shots) array of indices.
+    """
+    rng = np.random.default_rng(rng)
+    cdf = np.cumsum(probs, axis=-1, dtype=float)
+    if cdf.ndim == 1:
+        draws = rng.random(shots) * cdf[-1]  # scaling absorbs rounding in the norm
+        return np.minimum(np.searchsorted(cdf, draws, side='right'), len(cdf) - 1)
+    # Offset row b's normalised CDF by b so one searchsorted covers every row
+    batch, dim = cdf.shape
+    rows = np.arange(batch)[:, None]
+    cdf = cdf / cdf[:, -1:] + rows
+    draws = rng.random((batch, shots)) + rows
+    flat = np.searchsorted(cdf.ravel(), draws.ravel(), side='right').reshape(batch, shots)
+    return np.minimum(flat - rows * dim, dim - 1)
+
+
+def indices_to_bits(indices, n_qubits):
+    """Convert basis indices to a (shots, n_qubits) array of bits, qubit 0 first."""
+    shifts = np.arange(n_qubits - 1, -1, -1)
+    return ((np.asarray(indices)[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+def counts_from_indices(indices, n_qubits):
+    """Histogram of basis indices as a {bitstring: count} dict."""
+    values, counts = np.unique(indices, return_counts=True)
+    return {np.binary_repr(v, width=n_qubits): int(c) for v, c in zip(values, counts)}
+
+
+def counts_from_bits(bits):
+    """Histogram of a (shots, k) bit array as a {bitstring: count} dict."""
+    rows, counts = np.unique(np.asarray(bits), axis=0, return_counts=True)
+    return {''.join(map(str, row)): int(c) for row, c in zip(rows, counts)}
+
+
+def batch_counts(indices, n_qubits):
+    """Histograms of a (B, shots) index array as a list of B count dicts."""
+    batch = len(indices)
+    dim = 2**n_qubits
+    rows = np.arange(batch)[:, None]
+    # One unique() over row-offset keys instead of a histogram per row
+    keys, counts = np.unique(indices + rows * dim, return_counts=True)
+    result = [{} for _ in range(batch)]
+    for key, count in zip(keys, counts):
+        row, value = divmod(int(key), dim)
+        result[row][np.binary_repr(value, width=n_qubits)] = int(count)
+    return result
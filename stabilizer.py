@@ -0,0 +1,260 @@
+from functools import lru_cache
+import numpy as np
+from .gates import H, X, Z, controlled_decomposition
+from .register import _as_targets
+from .sampling import counts_from_bits
+from . import instrument
+
+_ONE = np.uint64(1)
+_S = np.array([[1, 0], [0, 1j]])
+_Y = np.array([[0, -1j], [1j, 0]])
+
+
+def _popcount(words):
+    """Per-element number of set bits of a uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _phase_key(matrix):
+    # Hashable form of a matrix with its global phase removed
+    flat = np.asarray(matrix, dtype=complex).ravel()
+    lead = flat[np.flatnonzero(np.abs(flat) > 1e-9)[0]]
+    flat = flat / (lead / abs(lead))
+    return tuple(np.round(flat, 6) + 0)  # + 0 folds -0.0 into 0.0
+
+
+@lru_cache(maxsize=None)
+def _single_qubit_cliffords():
+    """Breadth-first table of the 24 single-qubit Cliffords as H/S words.
+
+    Built on first use rather than at import.
+    """
+    table = {_phase_key(np.eye(2)): []}
+    frontier = [(np.eye(2, dtype=complex), [])]
+    while frontier:
+        matrix, word = frontier.pop(0)
+        for name, gate in (('h', H), ('s', _S)):
+            product = gate @ matrix
+            key = _phase_key(product)
+            if key not in table:
+                table[key] = word + [name]
+                frontier.append((product, word + [name]))
+    return table
+
+
+
+def clifford_decomposition(gate, controls, targets):
+    """Rewrite a (controlled) gate as primitive ('h'|'s', q) / ('cnot', c, t) steps.
+
+    Returns None when the operation is not Clifford. Single-qubit gates are
+    matched up to global phase (so fused gates from Circuit.optimize are
+    recognised); controlled gates must be exactly CX, CY or CZ.
+    """
+    gate = np.asarray(gate)
+    controls, targets = tuple(controls), tuple(targets)
+    n_controls, sub = controlled_decomposition(gate)
+    if n_controls:
+        controls, targets = controls + targets[:n_controls], targets[n_controls:]
+        gate = sub
+    if not controls:
+        if len(targets) == 1:
+            word = _single_qubit_cliffords().get(_phase_key(gate))
+            return None if word is None else [(name, targets[0]) for name in word]
+        if len(targets) == 2 and np.allclose(gate, np.eye(4)[[0, 2, 1, 3]]):
+            a, b = targets
+            return [('cnot', a, b), ('cnot', b, a), ('cnot', a, b)]
+        return None
+    if len(controls) != 1 or len(targets) != 1:
+        return None
+    c, t = controls[0], targets[0]
+    if np.allclose(gate, X):
+        return [('cnot', c, t)]
+    if np.allclose(gate, Z):
+        return [('h', t), ('cnot', c, t), ('h', t)]
+    if np.allclose(gate, _Y):
+        return [('s', t)] * 3 + [('cnot', c, t), ('s', t)]
+    return None
+
+
+class StabilizerState:
+    """CHP stabilizer tableau for Clifford-only circuits.
+
+    Rows 0..n-1 are destabilizers and rows n..2n-1 stabilizers. Each row's X
+    and Z bits are packed 64 qubits per uint64 word, so gates update one word
+    column across all rows and row products are word-wide XORs; memory and
+    per-gate time are polynomial in n rather than 2^n.
+    """
+
+    def __init__(self, n_qubits):
+        self.n_qubits = n_qubits
+        words = (n_qubits + 63) // 64
+        self.x = np.zeros((2 * n_qubits, words), dtype=np.uint64)
+        self.z = np.zeros((2 * n_qubits, words), dtype=np.uint64)
+        self.r = np.zeros(2 * n_qubits, dtype=np.uint8)
+        for q in range(n_qubits):
+            w, bit = q >> 6, _ONE << np.uint64(q & 63)
+            self.x[q, w] |= bit  # destabilizer X_q
+            self.z[n_qubits + q, w] |= bit  # stabilizer Z_q  (|0...0⟩)
+
+    def copy(self):
+        other = StabilizerState.__new__(StabilizerState)
+        other.n_qubits = self.n_qubits
+        other.x, other.z, other.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return other
+
+    @staticmethod
+    def _column(matrix, q):
+        return ((matrix[:, q >> 6] >> np.uint64(q & 63)) & _ONE).astype(np.uint8)
+
+    # Primitive Clifford gates, each vectorized over all 2n rows
+    def h(self, a):
+        w, bit = a >> 6, _ONE << np.uint64(a & 63)
+        self.r ^= self._column(self.x, a) & self._column(self.z, a)
+        swap = (self.x[:, w] ^ self.z[:, w]) & bit
+        self.x[:, w] ^= swap
+        self.z[:, w] ^= swap
+        return self
+
+    def s(self, a):
+        w, bit = a >> 6, _ONE << np.uint64(a & 63)
+        self.r ^= self._column(self.x, a) & self._column(self.z, a)
+        self.z[:, w] ^= self.x[:, w] & bit
+        return self
+
+    def cnot(self, a, b):
+        xa, za = self._column(self.x, a), self._column(self.z, a)
+        xb, zb = self._column(self.x, b), self._column(self.z, b)
+        self.r ^= xa & zb & (xb ^ za ^ 1)
+        self.x[:, b >> 6] ^= xa.astype(np.uint64) << np.uint64(b & 63)
+        self.z[:, a >> 6] ^= zb.astype(np.uint64) << np.uint64(a & 63)
+        return self
+
+    def apply_gate(self, gate, targets):
+        """Apply a Clifford gate; raises ValueError for non-Clifford gates."""
+        return self.apply_controlled(gate, (), targets)
+
+    def apply_controlled(self, gate, controls, targets):
+        """Apply a controlled Clifford (CX, CY, CZ) or plain Clifford gate."""
+        steps = clifford_decomposition(gate, _as_targets(controls), _as_targets(targets))
+        if steps is None:
+            raise ValueError("Gate is not Clifford; use the statevector backend")
+        with instrument.gate(gate):
+            for name, *qubits in steps:
+                getattr(self, name)(*qubits)
+        return self
+
+    def _multiply_rows(self, x1, z1, r1, x2, z2, r2):
+        """Pauli product row1 · row2 for one row1 against many rows2 (CHP rowsum)."""
+        pos = (x1 & z1 & z2 & ~x2) | (x1 & ~z1 & x2 & z2) | (~x1 & z1 & x2 & ~z2)
+        neg = (x1 & z1 & x2 & ~z2) | (x1 & ~z1 & ~x2 & z2) | (~x1 & z1 & x2 & z2)
+        g = _popcount(pos).sum(axis=-1) - _popcount(neg).sum(axis=-1)
+        phase = (2 * r2.astype(np.int64) + 2 * int(r1) + g) % 4
+        return x2 ^ x1, z2 ^ z1, (phase // 2).astype(np.uint8)
+
+    def measure_qubit(self, a, rng=None, forced=None):
+        """Projective Z measurement of qubit a; collapses the tableau."""
+        n = self.n_qubits
+        xa = self._column(self.x, a)
+        stabilizers = np.flatnonzero(xa[n:])
+        if len(stabilizers):
+            # Random outcome: p anticommutes with Z_a
+            p = stabilizers[0] + n
+            rows = np.flatnonzero(xa)
+            rows = rows[rows != p]
+            if len(rows):
+                self.x[rows], self.z[rows], self.r[rows] = self._multiply_rows(
+                    self.x[p], self.z[p], self.r[p], self.x[rows], self.z[rows], self.r[rows])
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            outcome = int(np.random.default_rng(rng).integers(2)) if forced is None else int(forced)
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, a >> 6] = _ONE << np.uint64(a & 63)
+            self.r[p] = outcome
+            return outcome
+        # Deterministic outcome: product of the stabilizers paired with Z_a
+        x, z, r = np.zeros_like(self.x[0]), np.zeros_like(self.z[0]), np.uint8(0)
+        for i in np.flatnonzero(xa[:n]):
+            x, z, r = self._multiply_rows(self.x[i + n], self.z[i + n], self.r[i + n], x, z, r)
+        return int(r)
+
+    def measure_qubits(self, qubits, rng=None):
+        """Measure the listed qubits in turn, collapsing the tableau; returns the bits."""
+        rng = np.random.default_rng(rng)
+        return [self.measure_qubit(q, rng) for q in _as_targets(qubits)]
+
+    def _canonical_support(self):
+        """Affine support of the state: (offset bits x0, packed basis of X parts).
+
+        A stabilizer state is a uniform superposition (up to phases) over
+        x0 ⊕ span(basis), found by Gaussian elimination of the stabilizers.
+        """
+        n = self.n_qubits
+        x, z, r = self.x[n:].copy(), self.z[n:].copy(), self.r[n:].copy()
+        row = 0
+        for q in range(n):
+            bits = self._column(x, q)
+            candidates = np.flatnonzero(bits[row:])
+            if not len(candidates):
+                continue
+            p = candidates[0] + row
+            x[[row, p]], z[[row, p]], r[[row, p]] = x[[p, row]], z[[p, row]], r[[p, row]]
+            others = np.flatnonzero(self._column(x, q))
+            others = others[others != row]
+            if len(others):
+                x[others], z[others], r[others] = self._multiply_rows(
+                    x[row], z[row], r[row], x[others], z[others], r[others])
+            row += 1
+        k = row
+        # Remaining rows are ±Z^v: each fixes the parity v·x = r; reduce them
+        # to row echelon form and read off a particular solution
+        x0 = np.zeros(n, dtype=np.uint8)
+        zrows, rz = z[k:], r[k:]
+        row = 0
+        pivots = []
+        for q in range(n):
+            bits = self._column(zrows, q)
+            candidates = np.flatnonzero(bits[row:])
+            if not len(candidates):
+                continue
+            p = candidates[0] + row
+            zrows[[row, p]], rz[[row, p]] = zrows[[p, row]], rz[[p, row]]
+            others = np.flatnonzero(self._column(zrows, q))
+            others = others[others != row]
+            zrows[others] ^= zrows[row]
+            rz[others] ^= rz[row]
+            pivots.append(q)
+            row += 1
+        for j, q in enumerate(pivots):
+            x0[q] = rz[j]
+        return x0, x[:k]
+
+    def sample(self, shots, rng=None, qubits=None):
+        """Draw all shots at once; returns a (shots, n_measured) array of bits.
+
+        Sampling never collapses the tableau: each shot is x0 XOR a uniformly
+        random combination of the support basis, built with packed XORs.
+        """
+        rng = np.random.default_rng(rng)
+        x0, basis = self._canonical_support()
+        packed = np.zeros((shots, self.x.shape[1]), dtype=np.uint64)
+        coefficients = rng.integers(0, 2, size=(shots, len(basis)), dtype=np.uint8)
+        for j, row in enumerate(basis):
+            packed[coefficients[:, j] == 1] ^= row
+        qs = np.arange(self.n_qubits) if qubits is None else np.asarray(_as_targets(qubits))
+        bits = ((packed[:, qs >> 6] >> (qs & 63).astype(np.uint64)) & _ONE).astype(np.uint8)
+        return bits ^ x0[qs]
+
+    def counts(self, shots, rng=None, qubits=None):
+        """sample() tallied into a {bitstring: count} dict."""
+        return counts_from_bits(self.sample(shots, rng, qubits))
+
+    def measure(self, rng=None):
+        """Sample one basis state; returns the list of qubit outcomes."""
+        return [int(b) for b in self.sample(1, rng)[0]]
+
+    def __str__(self):
+        """String representation of the tableau size."""
+        return f"StabilizerState({self.n_qubits} qubits)"
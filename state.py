@@ -1,14 +1,32 @@
 import numpy as np
+from .precision import get_default_dtype
+from .sampling import sample_indices, counts_from_indices
 
 class Qubit:
     def __init__(self, state=None):
         # Fixed the missing space in the comment
-        self.state = state if state is not None else np.array([1, 0])  # |0⟩ by default
+        self.state = state if state is not None else np.array([1, 0], dtype=get_default_dtype())  # |0⟩ by default
 
-    def measure(self):
-        """Collapse the state to |0⟩ or |1⟩ probabilistically."""
-        prob_0 = np.abs(self.state[0])**2
-        return 0 if np.random.random() < prob_0 else 1
+    def measure(self, rng=None):
+        """Collapse the state to |0⟩ or |1⟩; `rng` is a Generator, a seed or None."""
+        prob_0 = np.abs(self.state[0])**2 / np.sum(np.abs(self.state)**2)
+        draw = np.random.default_rng(rng).random()
+        outcome = 0 if draw < prob_0 else 1
+        # A new array: the old one may be shared with the caller
+        collapsed = np.zeros_like(self.state)
+        collapsed[outcome] = 1
+        self.state = collapsed
+        return outcome
+
+    def sample(self, shots, rng=None):
+        """Draw `shots` measurement outcomes (0/1) in one vectorized call."""
+        probs = np.abs(self.state)**2
+        return sample_indices(probs, shots, rng).astype(np.uint8)
+
+    def counts(self, shots, rng=None):
+        """Measurement histogram over `shots` as a {'0': n0, '1': n1} dict."""
+        probs = np.abs(self.state)**2
+        return counts_from_indices(sample_indices(probs, shots, rng), 1)
 
     def tensor_product(self, other):
         """Combine two qubits (for multi-qubit systems)."""
@@ -0,0 +1,88 @@
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+
+def parameter_grid(**axes):
+    """Cartesian product of keyword value lists as a list of parameter dicts."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def jsonable(value):
+    """Fallback JSON encoder for NumPy scalars and arrays."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _run_chunk(func, tasks):
+    """Worker entry point: run one chunk of (index, params, seed) tasks."""
+    records = []
+    for index, params, seed in tasks:
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+        result = func(**params, rng=rng)
+        records.append({
+            'index': index,
+            'params': params,
+            'result': result,
+            'seconds': time.perf_counter() - start,
+            'pid': os.getpid(),
+        })
+    return records
+
+
+def iter_sweep(func, grid, max_workers=None, chunksize=1, seed=None):
+    """Yield one record per grid point as soon as its chunk finishes.
+
+    `func` must be a module-level callable (so it can be pickled) taking the
+    grid parameters as keyword arguments plus `rng`. Every task gets its own
+    Generator spawned from one SeedSequence, so results are reproducible for
+    a given `seed` regardless of worker count or completion order.
+    `max_workers=1` runs everything in-process.
+    """
+    grid = list(grid)
+    seeds = np.random.SeedSequence(seed).spawn(len(grid))
+    tasks = list(zip(range(len(grid)), grid, seeds))
+    chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+    if max_workers == 1:
+        for chunk in chunks:
+            yield from _run_chunk(func, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_chunk, func, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def sweep(func, grid, max_workers=None, chunksize=1, seed=None, output=None):
+    """Run `func` over a parameter grid on a process pool.
+
+    Records stream to `output` (a JSONL path) as they complete; the returned
+    list is ordered by grid index. Each record holds the index, parameters,
+    result, wall time in seconds and the worker pid.
+    """
+    records = []
+    sink = open(output, 'w') if output is not None else None
+    try:
+        for record in iter_sweep(func, grid, max_workers, chunksize, seed):
+            records.append(record)
+            if sink is not None:
+                sink.write(json.dumps(record, default=jsonable) + '\n')
+                sink.flush()
+    finally:
+        if sink is not None:
+            sink.close()
+    return sorted(records, key=lambda record: record['index'])
+
+
+def timing_table(records):
+    """Structured array of (index, seconds, pid) for quick analysis."""
+    table = np.zeros(len(records), dtype=[('index', 'i8'), ('seconds', 'f8'), ('pid', 'i8')])
+    for row, record in zip(table, records):
+        row['index'], row['seconds'], row['pid'] = record['index'], record['seconds'], record['pid']
+    return table
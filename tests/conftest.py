@@ -0,0 +1,21 @@
+"""Make the checkout importable as the `quantum` package.
+
+The modules live at the top of the repository and import each other
+relatively, so the tests import them through a `quantum` symlink to the
+checkout. The GUI modules import the Bloch widgets from `visualization`,
+which is the same directory here. Worker processes spawned by the tests
+inherit sys.path and import the package the same way.
+"""
+import atexit
+import pathlib
+import shutil
+import sys
+import tempfile
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+_links = pathlib.Path(tempfile.mkdtemp(prefix='quantum-tests-'))
+atexit.register(shutil.rmtree, _links, ignore_errors=True)
+for name in ('quantum', 'visualization'):
+    (_links / name).symlink_to(ROOT, target_is_directory=True)
+sys.path.insert(0, str(_links))
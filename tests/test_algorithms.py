@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from quantum.algorithms import (_shor_samples, controlled_modexp, grover_circuit, grover_success_probability,
+                                grovers_search, marked_basis, period_from_samples, shors_factor,
+                                shors_period_finding)
+
+
+def _dense_shor_distribution(N, a, t):
+    # Counting-register distribution with the work register traced out,
+    # one full inverse DFT per work value
+    work = np.ones(2**t, dtype=np.int64)
+    for k in range(t):
+        controlled_modexp(work, N, a, k)
+    probs = np.zeros(2**t)
+    for value in np.unique(work):
+        branch = (work == value) / np.sqrt(2**t)
+        probs += np.abs(np.fft.ifft(branch, norm='ortho'))**2
+    return probs
+
+
+@pytest.mark.parametrize('N, a', [(15, 7), (21, 2)])
+def test_shor_samples_follow_the_qft_distribution(N, a):
+    samples, t = _shor_samples(N, a, 200000, rng=3)
+    expected = _dense_shor_distribution(N, a, t)
+    observed = np.bincount(samples, minlength=2**t) / len(samples)
+    assert np.abs(observed - expected).sum() / 2 < 0.01
+
+
+def test_period_and_factors():
+    bits = shors_period_finding(21, 2, shots=32, rng=0)
+    t = bits.shape[1]
+    values = bits.astype(np.int64) @ (1 << np.arange(t - 1, -1, -1))
+    assert period_from_samples(values, t, 21, 2) == 6
+    assert shors_factor(15, rng=1) == (3, 5)
+    assert shors_factor(391, rng=1) == (17, 23)
+
+
+def test_grover_rejects_empty_marked_set():
+    with pytest.raises(ValueError):
+        grovers_search(4, marked=[])
+    with pytest.raises(ValueError):
+        grovers_search(4, marked=lambda x: x < 0)
+
+
+
+def _final_grover_state(*args, **kwargs):
+    final = []
+    grovers_search(*args, progress=lambda i, total, register: final.append(register.state.copy()), **kwargs)
+    return final[-1]
+
+
+@pytest.mark.parametrize('n, marked, iterations', [
+    (6, ['101100'], None), (8, [3, 77, 200], None), (5, [[1, 0, 0, 1, 1]], 7), (7, range(0, 128, 9), 2),
+])
+def test_grover_success_matches_the_analytic_curve(n, marked, iterations):
+    indices = marked_basis(n, marked)
+    state = _final_grover_state(n, iterations, marked=marked)
+    k = iterations if iterations is not None else int(np.pi / 4 * np.sqrt(2**n / len(indices)))
+    success = np.sum(np.abs(state[indices])**2)
+    np.testing.assert_allclose(success, grover_success_probability(n, len(indices), k)[k], atol=1e-10)
+
+
+def test_marked_basis_accepts_bits_strings_integers_and_predicates():
+    expected = [3, 5, 12]
+    assert marked_basis(4, ['0011', [0, 1, 0, 1], 12, 5]).tolist() == expected
+    assert marked_basis(4, lambda x: np.isin(x, expected)).tolist() == expected
+    with pytest.raises(ValueError):
+        marked_basis(4, ['011'])
+
+
+def test_grover_circuit_matches_the_fast_path():
+    target = [1, 0, 1, 1]
+    gates = grover_circuit(4, target_state=target).run(backend='statevector').state
+    fast = _final_grover_state(4, target_state=target)
+    # Equal up to a global phase
+    np.testing.assert_allclose(abs(np.vdot(gates, fast)), 1, atol=1e-10)
+
+
+def test_grover_counts_concentrate_on_the_target():
+    counts = grovers_search(8, target_state='11010010', shots=500, rng=2)
+    assert sum(counts.values()) == 500
+    assert counts['11010010'] > 490
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from quantum.animate import export_animation, state_trajectory
+from quantum.gates import H, X
+from quantum.gate_factory import rx, rz, u3
+
+
+@pytest.mark.parametrize('frames', [1, 2, 7, 33])
+def test_trajectory_matches_sequential_application(frames):
+    rng = np.random.default_rng(frames)
+    gates = [u3(*rng.uniform(0, np.pi, 3)) for _ in range(frames)]
+    initial = np.array([0.6, 0.8j])
+    expected, state = [], initial
+    for gate in gates:
+        state = gate @ state
+        expected.append(state)
+    np.testing.assert_allclose(state_trajectory(gates, initial), expected, atol=1e-12)
+
+
+def test_trajectory_defaults_and_validation():
+    np.testing.assert_allclose(state_trajectory([H, X, rz(0.5)])[:2], [[2**-0.5, 2**-0.5]] * 2)
+    with pytest.raises(ValueError):
+        state_trajectory([np.eye(4)])
+
+
+def test_gif_export_streams_every_frame(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    pytest.importorskip('matplotlib')
+    path = str(tmp_path / 'rx.gif')
+    assert export_animation(path, [rx(0.3)] * 5, fps=10, dpi=30) == 5
+    with Image.open(path) as image:
+        assert image.n_frames == 5
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from quantum.gates import H, CNOT
+from quantum.gate_factory import rx, u3
+from quantum.protocols import teleport_batch, teleport_fidelity
+from quantum.register import BatchedRegister, QuantumRegister, fidelity
+
+rng = np.random.default_rng(2)
+
+
+def random_states(batch, n):
+    states = rng.normal(size=(batch, 2**n)) + 1j * rng.normal(size=(batch, 2**n))
+    return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def test_batch_matches_one_register_per_member():
+    states = random_states(6, 3)
+    batch = BatchedRegister(3, states)
+    batch.apply_gate(H, 1).apply_gate(CNOT, [2, 0]).apply_controlled(u3(0.3, 0.1, 0.2), [0], [1])
+    for state, row in zip(states, batch.state):
+        single = QuantumRegister(3, state)
+        single.apply_gate(H, 1).apply_gate(CNOT, [2, 0]).apply_controlled(u3(0.3, 0.1, 0.2), [0], [1])
+        np.testing.assert_allclose(row, single.state, atol=1e-12)
+    np.testing.assert_allclose(batch.marginal_probabilities([2]),
+                               [QuantumRegister(3, row).marginal_probabilities([2]) for row in batch.state])
+
+
+def test_from_qubit_states_builds_per_member_products():
+    a, b = random_states(4, 1), random_states(4, 1)
+    batch = BatchedRegister.from_qubit_states(a, b)
+    np.testing.assert_allclose(batch.state, [np.kron(x, y) for x, y in zip(a, b)])
+
+
+def test_batch_sampling_shapes_and_seeds():
+    batch = BatchedRegister(2, batch_size=3).apply_gate(rx(np.pi), 0)
+    assert batch.sample(5, rng=0).shape == (3, 5, 2)
+    assert batch.measure(rng=0).tolist() == [[1, 0]] * 3
+    assert batch.counts(10, rng=0) == [{'10': 10}] * 3
+    with pytest.raises(ValueError):
+        BatchedRegister(2)
+
+
+def test_teleport_batch_reproduces_every_input():
+    states = random_states(500, 1)
+    np.testing.assert_allclose(teleport_fidelity(states, rng=4), 1, atol=1e-12)
+    np.testing.assert_allclose(fidelity(teleport_batch(states, rng=4), states), 1, atol=1e-12)
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from quantum.benchmarks import runner
+from quantum.benchmarks.cases import CASES
+
+
+def _missing_dependency():
+    raise ImportError('needs matplotlib')
+
+
+def test_run_suite_measures_and_skips(monkeypatch, tmp_path):
+    monkeypatch.setitem(CASES, 'tiny', {'setup': lambda size: lambda: bytearray(size),
+                                        'full': [], 'quick': [{'size': 10}, {'size': 2**20}]})
+    monkeypatch.setitem(CASES, 'missing', {'setup': _missing_dependency, 'full': [], 'quick': [{}]})
+    logged = []
+    document = runner.run_suite(['tiny', 'missing'], quick=True, repeat=2, min_time=0.001, log=logged.append)
+    small, large, skipped = document['results']
+    assert logged == document['results']
+    assert small['best'] <= small['median'] and small['peak_bytes'] < large['peak_bytes']
+    assert large['peak_bytes'] >= 2**20
+    assert skipped == {'case': 'missing', 'params': {}, 'skipped': 'needs matplotlib'}
+    path = tmp_path / 'results.json'
+    runner.write_results(document, path)
+    assert runner.load_results(path) == json.loads(json.dumps(document))
+
+
+def _document(**fields):
+    return {'results': [dict({'case': 'c', 'params': {'n': 1}}, **fields)]}
+
+
+@pytest.mark.parametrize('after, flagged', [
+    ({'median': 1.2, 'peak_bytes': 2**21}, set()),
+    ({'median': 1.5, 'peak_bytes': 2**21}, {'median'}),
+    ({'median': 1.0, 'peak_bytes': 2**22}, {'peak_bytes'}),
+    # Relative growth alone doesn't count below min_bytes
+    ({'median': 1.0, 'peak_bytes': 2**21 + 2**19}, set()),
+])
+def test_compare_flags_regressions(after, flagged):
+    rows = runner.compare(_document(median=1.0, peak_bytes=2**21), _document(**after))
+    assert {row['metric'] for row in rows} == {'median', 'peak_bytes'}
+    assert {row['metric'] for row in rows if row['regression']} == flagged
+
+
+def test_compare_ignores_unmatched_and_skipped_records():
+    baseline = _document(median=1.0, peak_bytes=0)
+    assert runner.compare(baseline, _document(skipped='no Qt')) == []
+    assert runner.compare(baseline, {'results': [{'case': 'c', 'params': {'n': 2}, 'median': 9.0,
+                                                   'peak_bytes': 0}]}) == []
+
+
+def test_quick_grids_are_registered_for_every_case():
+    assert CASES and all(spec['quick'] for spec in CASES.values())
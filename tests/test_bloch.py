@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from quantum.bloch import bloch_vector
+
+s = 1 / np.sqrt(2)
+
+
+@pytest.mark.parametrize('state, expected', [
+    ([1, 0], (0, 0, 1)), ([0, 1], (0, 0, -1)), ([s, s], (1, 0, 0)), ([s, -s], (-1, 0, 0)),
+    # |±i⟩ = (|0⟩ ± i|1⟩)/√2 lie on ±y
+    ([s, 1j * s], (0, 1, 0)), ([s, -1j * s], (0, -1, 0)),
+])
+def test_axis_states(state, expected):
+    np.testing.assert_allclose(bloch_vector(np.array(state, dtype=complex)), expected, atol=1e-12)
+
+
+def test_bloch_vector_broadcasts_and_normalises():
+    theta, phi = np.linspace(0, np.pi, 7), np.linspace(0, 2 * np.pi, 7)
+    states = 3 * np.stack([np.cos(theta / 2), np.exp(1j * phi) * np.sin(theta / 2)], axis=-1)
+    x, y, z = bloch_vector(states)
+    assert x.shape == (7,)
+    np.testing.assert_allclose(x, np.sin(theta) * np.cos(phi), atol=1e-12)
+    np.testing.assert_allclose(y, np.sin(theta) * np.sin(phi), atol=1e-12)
+    np.testing.assert_allclose(z, np.cos(theta), atol=1e-12)
+
+
+def test_renderer_blits_on_an_agg_canvas():
+    pytest.importorskip('matplotlib')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from quantum.bloch import BlochRenderer
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    renderer = BlochRenderer(figure)
+    renderer.update([s, 1j * s])
+    assert renderer._background is not None
+    renderer.update([1, 0])
+    x, y, z = renderer.arrow.get_data_3d()
+    np.testing.assert_allclose([x[1], y[1], z[1]], [0, 0, 1], atol=1e-12)
+    assert renderer.coord_text.get_text() == "Bloch coords: (0.000, 0.000, 1.000)"
+
+
+def test_grid_redraws_only_the_qubits_that_moved():
+    pytest.importorskip('matplotlib')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from quantum.bloch import BlochGridRenderer
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    grid = BlochGridRenderer(figure, 3)
+    vectors = np.tile([0.0, 0.0, 1.0], (3, 1))
+    grid.update(vectors)
+    assert grid._backgrounds is not None and len(grid._backgrounds) == 3
+    vectors[1] = [0, 0, 0]
+    vectors[2, 2] = 1 - 1e-4  # within tolerance
+    assert grid.update(vectors).tolist() == [1]
+    assert grid.labels[1].get_text() == "q1  purity 0.50"
+    np.testing.assert_allclose(grid.vectors[2], [0, 0, 1])
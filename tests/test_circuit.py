@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from quantum.circuit import BranchCache, Circuit
+from quantum.gates import H, X, Z, CNOT, SWAP
+from quantum.gate_factory import phase, rx, rz, u3
+from quantum.protocols import teleport_feedforward_circuit, teleport_shots
+from quantum.register import BatchedRegister, QuantumRegister
+
+
+def random_circuit(n, depth, seed):
+    rng = np.random.default_rng(seed)
+    circuit = Circuit(n)
+    singles = [H, X, Z, rx(0.3), rz(0.7), phase(0.2), u3(0.1, 0.4, 0.9)]
+    for _ in range(depth):
+        kind = rng.integers(4)
+        if kind == 0:
+            a, b = rng.choice(n, 2, replace=False)
+            circuit.apply_gate(CNOT, [a, b])
+        elif kind == 1:
+            a, b = rng.choice(n, 2, replace=False)
+            circuit.apply_controlled(phase(0.5), a, b)
+        else:
+            circuit.apply_gate(singles[rng.integers(len(singles))], int(rng.integers(n)))
+    return circuit
+
+
+def final_state(circuit, optimize):
+    start = np.random.default_rng(9).normal(size=2**circuit.n_qubits) + 0j
+    return circuit.run(QuantumRegister(circuit.n_qubits, start / np.linalg.norm(start)), optimize=optimize).state
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_optimize_preserves_the_state(seed):
+    circuit = random_circuit(4, 60, seed)
+    optimized = circuit.optimize()
+    np.testing.assert_allclose(final_state(optimized, False), final_state(circuit, False), atol=1e-12)
+    assert optimized.stats['gates_before'] == len(circuit)
+    assert optimized.stats['gates_after'] == len(optimized) <= len(circuit)
+
+
+def test_optimize_cancels_fuses_and_merges():
+    circuit = Circuit(2)
+    circuit.apply_gate(H, 0).apply_gate(H, 0)  # cancels
+    circuit.apply_gate(CNOT, [0, 1]).apply_gate(CNOT, [0, 1])  # cancels
+    circuit.apply_gate(rx(0.2), 1).apply_gate(rz(0.3), 1).apply_gate(rx(0.5), 1)  # fuses to one
+    circuit.apply_controlled(Z, 0, 1).apply_controlled(phase(0.4), 0, 1)  # diagonal, merged
+    optimized = circuit.optimize()
+    assert len(optimized) == 2
+    assert optimized.stats['cancelled'] == 4
+    assert optimized.stats['fused'] == 2
+    assert optimized.stats['merged'] == 1
+    np.testing.assert_allclose(final_state(optimized, False), final_state(circuit, False), atol=1e-12)
+
+
+def test_optimize_keeps_non_adjacent_gates_apart():
+    circuit = Circuit(2)
+    circuit.apply_gate(CNOT, [0, 1]).apply_gate(H, 1).apply_gate(CNOT, [0, 1])
+    assert len(circuit.optimize()) == 3
+
+
+def test_run_backends_agree():
+    circuit = Circuit(3)
+    circuit.apply_gate(H, 0).apply_gate(CNOT, [0, 1]).apply_gate(SWAP, [1, 2]).apply_gate(rz(0.3), 2)
+    reference = circuit.run(backend='statevector').state
+    np.testing.assert_allclose(circuit.run(backend='mps').to_statevector(), reference, atol=1e-12)
+    with pytest.raises(ValueError):
+        circuit.run(backend='tensor network')
+
+
+def test_gate_shape_is_checked():
+    with pytest.raises(ValueError):
+        Circuit(2).apply_gate(CNOT, [0])
+
+
+def test_branch_cache_teleports_with_four_branches():
+    alpha, beta = 0.6, 0.8j
+    counts, cache = teleport_shots([alpha, beta], 20000, rng=1)
+    assert sum(counts.values()) == 20000
+    assert cache.branches == 5  # the root and one branch per (c0, c1)
+    bob_one = sum(n for bits, n in counts.items() if bits[2] == '1') / 20000
+    assert bob_one == pytest.approx(abs(beta)**2, abs=0.02)
+    # Later batches reuse the cached branches
+    more, same = teleport_shots(None, 1000, rng=2, cache=cache)
+    assert same is cache and cache.branches == 5 and sum(more.values()) == 1000
+
+
+def test_branch_outcomes_are_exact():
+    state = np.array([0.6, 0.8j])
+    register = QuantumRegister(3, np.kron(state, [1, 0, 0, 0]))
+    outcomes = BranchCache(teleport_feedforward_circuit(measure_bob=False), register).outcomes()
+    assert sorted(outcomes) == ['00', '01', '10', '11']
+    for p, branch in outcomes.values():
+        assert p == pytest.approx(0.25)
+        bob = branch.reduced_density_matrices()[2]
+        np.testing.assert_allclose(bob, np.outer(state, state.conj()), atol=1e-12)
+
+
+def test_branch_cache_only_simulates_reachable_outcomes():
+    circuit = Circuit(2)
+    circuit.apply_gate(X, 0).measure(0).apply_gate(H, 1, condition=(0, 1)).measure(1)
+    cache = BranchCache(circuit)
+    counts = cache.sample(4000, rng=3)
+    assert cache.branches == 2
+    assert set(counts) == {'10', '11'}
+    assert counts['10'] == pytest.approx(2000, abs=200)
+    assert list(cache.outcomes()) == ['10']
+
+
+def test_execute_applies_conditions_per_batch_member():
+    circuit = Circuit(2)
+    circuit.apply_gate(H, 0).measure(0).apply_gate(X, 1, condition=(0, 1))
+    register, clbits = circuit.execute(BatchedRegister(2, batch_size=200), rng=4)
+    assert clbits.shape == (200, 1)
+    assert 0 < clbits.sum() < 200
+    # Qubit 1 copies each member's measured bit
+    np.testing.assert_allclose(register.marginal_probabilities([1])[:, 1], clbits[:, 0])
@@ -0,0 +1,63 @@
+import io
+import json
+import sys
+
+import pytest
+
+from quantum.__main__ import main
+
+
+def run(capsys, *argv):
+    assert main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_ghz_prints_one_json_record(capsys):
+    record, = run(capsys, 'ghz', '--n-qubits', '40', '--shots', '500', '--seed', '1')
+    assert record['program'] == 'ghz'
+    assert record['params']['n_qubits'] == 40 and record['params']['backend'] == 'auto'
+    assert set(record['result']['counts']) == {'0' * 40, '1' * 40}
+    assert sum(record['result']['counts'].values()) == 500
+    assert set(record['timings']) == {'import', 'run'}
+
+
+def test_runs_are_reproducible_with_a_seed(capsys):
+    argv = ['grovers_search', '--n-qubits', '5', '--target', '10110', '--shots', '200', '--seed', '3']
+    first, = run(capsys, *argv)
+    second, = run(capsys, *argv)
+    assert first['result'] == second['result']
+    assert max(first['result']['counts'], key=first['result']['counts'].get) == '10110'
+
+
+@pytest.mark.parametrize('argv, check', [
+    (['teleport', '--theta', '3.14159265', '--shots', '400'],
+     lambda r: all(bits[2] == '1' for bits in r['counts']) and r['branches'] == 5),
+    (['shors_factor', '--N', '15', '--seed', '0'], lambda r: sorted(r['factors']) == [3, 5]),
+    (['bernstein_vazirani', '--secret', '1101', '--shots', '50'], lambda r: r['counts'] == {'1101': 50}),
+    (['qft', '--n-qubits', '30', '--input', '1', '--backend', 'mps', '--shots', '10'],
+     lambda r: r['max_bond'] <= 4 and sum(r['counts'].values()) == 10),
+])
+def test_programs(capsys, argv, check):
+    record, = run(capsys, *argv)
+    assert check(record['result'])
+
+
+def test_batch_runs_jobs_from_a_file(capsys, tmp_path, monkeypatch):
+    jobs = tmp_path / 'jobs.jsonl'
+    jobs.write_text('{"program": "ghz", "n_qubits": 3, "shots": 10, "seed": 0}\n\n'
+                    '{"program": "bernstein_vazirani", "secret": "011", "shots": 5}\n')
+    records = run(capsys, 'batch', str(jobs))
+    assert [r['program'] for r in records] == ['ghz', 'bernstein_vazirani']
+    assert records[1]['result']['counts'] == {'011': 5}
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('{"program": "ghz", "shots": 4}\n'))
+    record, = run(capsys, 'batch', '-')
+    assert sum(record['result']['counts'].values()) == 4
+
+
+def test_bad_arguments_exit(capsys):
+    with pytest.raises(SystemExit):
+        main(['grovers_search', '--target', '10a'])
+    with pytest.raises(SystemExit):
+        main(['no_such_program'])
+    with pytest.raises(ValueError):
+        main(['grovers_search', '--n-qubits', '3', '--target', '10'])
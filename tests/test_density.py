@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from quantum.density import DensityMatrix
+from quantum.gates import H, X, CNOT
+from quantum.gate_factory import rx, u3
+from quantum.noise import amplitude_damping, depolarizing
+from quantum.register import QuantumRegister
+
+rng = np.random.default_rng(3)
+
+
+def random_state(n):
+    state = rng.normal(size=2**n) + 1j * rng.normal(size=2**n)
+    return state / np.linalg.norm(state)
+
+
+def test_pure_evolution_matches_the_statevector():
+    state = random_state(3)
+    rho = DensityMatrix.from_state(state)
+    register = QuantumRegister(3, state)
+    for target in (rho, register):
+        target.apply_gate(u3(0.2, 0.5, 0.1), 2).apply_gate(CNOT, [2, 0]).apply_controlled(rx(0.9), [0, 2], [1])
+    np.testing.assert_allclose(rho.rho, np.outer(register.state, register.state.conj()), atol=1e-12)
+    np.testing.assert_allclose(rho.probabilities(), register.probabilities(), atol=1e-12)
+    np.testing.assert_allclose(rho.bloch_vectors(), register.bloch_vectors(), atol=1e-12)
+    assert rho.fidelity(register.state) == pytest.approx(1)
+    assert rho.purity() == pytest.approx(1)
+
+
+def test_channel_is_the_kraus_sum():
+    state = random_state(2)
+    kraus = amplitude_damping(0.3)
+    rho = DensityMatrix.from_state(state).apply_channel(kraus, 1)
+    full = [np.kron(np.eye(2), k) for k in kraus]
+    outer = np.outer(state, state.conj())
+    np.testing.assert_allclose(rho.rho, sum(k @ outer @ k.conj().T for k in full), atol=1e-12)
+    assert np.trace(rho.rho).real == pytest.approx(1)
+
+
+def test_full_depolarizing_gives_the_maximally_mixed_qubit():
+    rho = DensityMatrix(1).apply_gate(H, 0).apply_channel(depolarizing(1), 0)
+    np.testing.assert_allclose(rho.rho, np.eye(2) / 2, atol=1e-12)
+    assert rho.purity() == pytest.approx(0.5)
+
+
+def test_reduced_traces_out_the_rest():
+    state = random_state(3)
+    rho = DensityMatrix.from_state(state)
+    psi = state.reshape(2, 2, 2)
+    expected = np.einsum('aib,ajb->ij', psi, psi.conj())
+    np.testing.assert_allclose(rho.reduced([1]), expected, atol=1e-12)
+    np.testing.assert_allclose(rho.reduced_density_matrices()[1], expected, atol=1e-12)
+    np.testing.assert_allclose(rho.marginal_probabilities([1]), np.real(np.diagonal(expected)), atol=1e-12)
+
+
+def test_sampling_and_target_checks():
+    rho = DensityMatrix(2).apply_gate(X, 1)
+    assert rho.counts(20, rng=0) == {'01': 20}
+    assert rho.measure(rng=0) == [0, 1]
+    with pytest.raises(ValueError):
+        rho.apply_gate(CNOT, [1, 1])
+    with pytest.raises(ValueError):
+        DensityMatrix(2, np.eye(2))
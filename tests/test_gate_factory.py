@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from quantum.gates import H, X, CNOT
+from quantum.gate_factory import GateCache, controlled, expanded, fused, phase, rx, rz, u3
+
+
+def test_cache_counts_hits_misses_and_evictions():
+    cache = GateCache(max_entries=2)
+    built = []
+
+    def build(value):
+        return lambda: built.append(value) or np.full(4, value)
+
+    cache.get('a', build(1))
+    cache.get('b', build(2))
+    assert cache.get('a', build(1))[0] == 1  # hit; 'b' is now least recent
+    cache.get('c', build(3))
+    assert built == [1, 2, 3]
+    assert cache.stats()['hits'] == 1 and cache.misses == 3 and cache.evictions == 1
+    cache.get('b', build(2))  # rebuilt after eviction
+    assert built == [1, 2, 3, 2] and len(cache) == 2
+
+
+def test_cache_byte_budget_and_configure():
+    cache = GateCache(max_entries=10, max_bytes=100)
+    cache.get('big', lambda: np.zeros(20))  # 160 bytes: handed out uncached
+    assert len(cache) == 0
+    for key in range(3):
+        cache.get(key, lambda: np.zeros(5))
+    assert len(cache) == 2 and cache.nbytes == 80
+    cache.configure(max_entries=1)
+    assert len(cache) == 1 and cache.evictions == 2
+    cache.clear()
+    assert cache.stats()['entries'] == cache.hits == cache.misses == 0
+
+
+def test_cached_entries_are_shared_and_read_only():
+    gate = rx(0.25)
+    assert rx(0.25) is gate
+    assert rx(0.25, dtype=np.complex64) is not gate
+    with pytest.raises(ValueError):
+        gate[0, 0] = 0
+
+
+@pytest.mark.parametrize('gate', [phase(0.3), rx(1.2), rz(-0.4), u3(0.3, 1.1, 2.0)])
+def test_parameterized_gates_are_unitary(gate):
+    np.testing.assert_allclose(gate @ gate.conj().T, np.eye(2), atol=1e-12)
+
+
+def test_controlled_expanded_and_fused():
+    np.testing.assert_allclose(controlled(X), CNOT)
+    toffoli = controlled(X, 2)
+    assert toffoli.shape == (8, 8)
+    np.testing.assert_allclose(toffoli[:6, :6], np.eye(6))
+    np.testing.assert_allclose(toffoli[6:, 6:], X)
+    np.testing.assert_allclose(expanded(H, [1], 3), np.kron(np.kron(np.eye(2), H), np.eye(2)))
+    np.testing.assert_allclose(expanded(CNOT, [0, 1], 3), np.kron(CNOT, np.eye(2)))
+    # Control 2, target 0: |abc⟩ -> |(a^c) b c⟩
+    flip = [i ^ (4 * (i & 1)) for i in range(8)]
+    np.testing.assert_allclose(expanded(CNOT, [2, 0], 3), np.eye(8)[flip])
+    np.testing.assert_allclose(fused(H, rz(0.5), X), X @ rz(0.5) @ H)
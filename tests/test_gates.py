@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from quantum.gates import (H, X, Z, CNOT, SWAP, apply_gate, gate_structure,
+                           CONTROLLED, DIAGONAL, PERMUTATION, GENERAL)
+from quantum.gate_factory import rz
+
+rng = np.random.default_rng(5)
+STATE = rng.normal(size=4) + 1j * rng.normal(size=4)
+BATCH = rng.normal(size=(4, 3)) + 1j * rng.normal(size=(4, 3))
+
+
+@pytest.mark.parametrize('gate, structure', [
+    (CNOT, CONTROLLED), (np.kron(Z, rz(0.3)), DIAGONAL), (SWAP, PERMUTATION), (np.kron(H, X), GENERAL)])
+def test_gate_structure(gate, structure):
+    assert gate_structure(gate) == structure
+
+
+@pytest.mark.parametrize('gate', [np.kron(Z, rz(0.3)), SWAP, np.kron(H, X)])
+@pytest.mark.parametrize('state', [STATE, BATCH], ids=['vector', 'columns'])
+def test_apply_gate_matches_matmul(gate, state):
+    # The diagonal and permutation fast paths act on rows, so a (4, m)
+    # state is m column vectors
+    np.testing.assert_allclose(apply_gate(state, gate), gate @ state)
+
+
+def test_apply_gate_rejects_wrong_dimension():
+    with pytest.raises(ValueError):
+        apply_gate(np.ones(2), CNOT)
@@ -0,0 +1,68 @@
+import json
+
+from quantum import instrument
+from quantum.circuit import Circuit
+from quantum.gates import H, X, CNOT
+from quantum.gate_factory import phase, rx
+from quantum.register import QuantumRegister
+
+
+def test_disabled_instrumentation_is_a_shared_no_op():
+    assert instrument.active is None
+    assert instrument.gate(H) is instrument.span('anything') is instrument._NULL
+
+
+def test_gate_labels():
+    assert instrument.gate_label(CNOT) == 'CNOT'
+    assert instrument.gate_label(phase(0.3)) == 'diagonal/1q'
+    assert instrument.gate_label(rx(0.3)) == 'general/1q'
+
+
+def test_profile_counts_gates_and_spans(tmp_path):
+    circuit = Circuit(3)
+    circuit.apply_gate(H, 0)
+    circuit.apply_gate(CNOT, [0, 1])
+    circuit.apply_gate(CNOT, [1, 2])
+    circuit.apply_gate(X, 2)
+    with instrument.profile(memory=True) as prof:
+        circuit.run(QuantumRegister(3), optimize=False)
+    assert instrument.active is None
+    stats = {(row['kind'], row['name']): row for row in prof.summary()}
+    assert stats['gate', 'CNOT']['calls'] == 2
+    assert stats['gate', 'H']['calls'] == stats['gate', 'X']['calls'] == 1
+    assert stats['gate', 'H']['state_bytes'] == 8 * 16
+    assert stats['span', 'circuit.run']['calls'] == 1
+    assert all(row['seconds'] >= 0 for row in prof.summary())
+    assert 'circuit.run' in prof.format_summary()
+
+    path = tmp_path / 'trace.json'
+    prof.export_chrome_trace(path)
+    events = json.load(open(path))['traceEvents']
+    assert len(events) == len(prof.events) == 6
+    run = next(event for event in events if event['name'] == 'circuit.run')
+    assert run['args']['gates'] == 4 and run['args']['backend'] == 'QuantumRegister'
+    # Gates nest inside the span
+    gates = [event for event in events if event['cat'] == 'gate']
+    assert all(run['ts'] <= event['ts'] and event['ts'] + event['dur'] <= run['ts'] + run['dur'] + 1e-3
+               for event in gates)
+
+
+def test_events_beyond_max_events_are_only_aggregated():
+    register = QuantumRegister(2)
+    with instrument.profile(max_events=3) as prof:
+        for _ in range(10):
+            register.apply_gate(H, 0)
+    assert len(prof.events) == 3 and prof.dropped == 7
+    assert prof.summary()[0]['calls'] == 10
+    assert '7 events' in prof.format_summary()
+
+
+def test_profiles_nest_and_restore():
+    with instrument.profile() as outer:
+        with instrument.profile() as inner:
+            QuantumRegister(1).apply_gate(X, 0)
+        assert instrument.active is outer
+        QuantumRegister(1).apply_gate(H, 0)
+    assert [row['name'] for row in inner.summary()] == ['X']
+    assert [row['name'] for row in outer.summary()] == ['H']
+    assert instrument.active is None
@@ -0,0 +1,118 @@
+"""Headless smoke tests for the GUI job machinery (Qt's offscreen platform)."""
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('PyQt5')
+pytest.importorskip('matplotlib')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from quantum import main_window  # noqa: E402
+from quantum.main_window import QuantumGUI, SimulationJob, in_process  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _wait(app, done, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while not done():
+        assert time.perf_counter() < deadline, "timed out waiting for the GUI"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def _collect(job):
+    events = []
+    for name in ('progress', 'result', 'error', 'cancelled', 'finished'):
+        getattr(job.signals, name).connect(lambda *args, name=name: events.append((name,) + args))
+    return events
+
+
+def test_report_is_throttled(app):
+    def work(job):
+        for i in range(1000):
+            job.report(i / 1000, f"step {i}")
+        job.report(1, "done")
+        return 'ok'
+
+    job = SimulationJob("throttled", work, min_interval=60)
+    events = _collect(job)
+    job.run()
+    progress = [e for e in events if e[0] == 'progress']
+    # The first report goes out, the rest wait out the interval, completion always goes
+    assert [e[2] for e in progress] == [0, 1]
+    assert events[-2:] == [('result', job.id, 'ok'), ('finished', job.id)]
+
+
+def test_job_outcomes(app):
+    calls = []
+    queued = SimulationJob("queued", lambda job: calls.append(job))
+    queued.cancel()
+    events = _collect(queued)
+    queued.run()
+    assert not calls  # a job cancelled while queued never runs
+    assert [e[0] for e in events] == ['cancelled', 'finished']
+
+    failing = SimulationJob("failing", lambda job: 1 / 0)
+    events = _collect(failing)
+    failing.run()
+    assert [e[0] for e in events] == ['error', 'finished']
+
+
+def test_in_process_returns_and_terminates_on_cancel(app):
+    assert in_process(SimulationJob("pow", None), pow, 2, 10) == 1024
+    with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+        in_process(SimulationJob("div", None), divmod, 1, 0)
+
+    job = SimulationJob("sleep", None)
+    threading.Timer(0.5, job.cancel).start()
+    start = time.perf_counter()
+    with pytest.raises(main_window.Cancelled):
+        in_process(job, time.sleep, 60)
+    assert time.perf_counter() - start < 10
+    assert not multiprocessing.active_children()
+
+
+def test_window_runs_and_closes(app):
+    window = QuantumGUI()
+    window.run_teleportation()
+    _wait(app, lambda: not window.jobs)
+    assert window.output_label.text().startswith("TELEPORTATION RESULTS")
+    window.grover_qubits.setValue(3)
+    window.run_grover()
+    _wait(app, lambda: not window.jobs)
+    assert "GROVER'S SEARCH RESULTS (3 qubits)" in window.output_label.text()
+    assert window.progress_bar.value() == 0
+
+    # The animation plays for seconds; closing cancels it and waits for the pool
+    window.run_animation()
+    _wait(app, lambda: window.pool.activeThreadCount() == 1)
+    window.close()
+    assert window.pool.activeThreadCount() == 0
+    _wait(app, lambda: not window.jobs)
+    assert window.output_label.text() == "Animation cancelled"
+
+
+def test_large_grover_runs_in_a_process_that_cancel_terminates(app, monkeypatch):
+    monkeypatch.setattr(main_window, 'PROCESS_QUBITS', 3)
+    window = QuantumGUI()
+    window.grover_qubits.setValue(3)
+    window.run_grover()
+    _wait(app, lambda: not window.jobs, timeout=60)
+    assert "GROVER'S SEARCH RESULTS (3 qubits)" in window.output_label.text()
+
+    window.grover_qubits.setValue(24)  # minutes of work if left running
+    window.run_grover()
+    _wait(app, lambda: multiprocessing.active_children(), timeout=60)
+    window.close()
+    _wait(app, lambda: not window.jobs)
+    assert window.output_label.text() == "Grover (24 qubits) cancelled"
+    assert not multiprocessing.active_children()
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from quantum.gates import H, X, CNOT, SWAP
+from quantum.gate_factory import controlled, phase, rx, u3
+from quantum.mps import MPSRegister
+from quantum.register import QuantumRegister
+from quantum.state import Qubit
+from quantum.transforms import qft
+
+
+def random_ops(n, depth, seed):
+    rng = np.random.default_rng(seed)
+    ops = []
+    for _ in range(depth):
+        kind = rng.integers(5)
+        if kind == 0:
+            ops.append((u3(*rng.uniform(0, np.pi, 3)), [int(rng.integers(n))]))
+        elif kind == 1:
+            a, b = rng.choice(n, 2, replace=False)
+            ops.append((CNOT, [int(a), int(b)]))
+        elif kind == 2:
+            a, b = rng.choice(n, 2, replace=False)
+            ops.append((SWAP, [int(a), int(b)]))
+        elif kind == 3:
+            a, b = rng.choice(n, 2, replace=False)
+            ops.append((controlled(phase(rng.uniform(0, np.pi))), [int(a), int(b)]))
+        else:
+            ops.append((controlled(rx(0.7), 2), [int(q) for q in rng.choice(n, 3, replace=False)]))
+    return ops
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_circuits_match_the_statevector(seed):
+    n = 6
+    mps, register = MPSRegister(n), QuantumRegister(n)
+    for gate, targets in random_ops(n, 40, seed):
+        mps.apply_gate(gate, targets)
+        register.apply_gate(gate, targets)
+    np.testing.assert_allclose(mps.to_statevector(), register.state, atol=1e-10)
+    assert mps.truncation_error < 1e-20
+    assert max(mps.bond_dimensions()) <= 2**(n // 2)
+
+
+def test_controlled_on_distant_qubits():
+    mps = MPSRegister(5).apply_gate(H, 4).apply_controlled(X, 4, 0).apply_controlled(rx(0.5), [0, 4], 2)
+    register = QuantumRegister(5).apply_gate(H, 4).apply_controlled(X, 4, 0).apply_controlled(rx(0.5), [0, 4], 2)
+    np.testing.assert_allclose(mps.to_statevector(), register.state, atol=1e-12)
+
+
+def test_bond_limit_truncates_and_renormalises():
+    n = 8
+    exact, limited = MPSRegister(n), MPSRegister(n, max_bond=2)
+    for gate, targets in random_ops(n, 60, 7):
+        exact.apply_gate(gate, targets)
+        limited.apply_gate(gate, targets)
+    assert max(limited.bond_dimensions()) <= 2 < max(exact.bond_dimensions())
+    assert limited.truncation_error > 0
+    psi = limited.to_statevector()
+    assert np.linalg.norm(psi) == pytest.approx(1)
+    fidelity = abs(np.vdot(exact.to_statevector(), psi))**2
+    assert fidelity < 1 - 1e-6
+    with pytest.raises(ValueError):
+        MPSRegister(2, max_bond=0)
+
+
+def test_sampling_follows_the_probabilities():
+    mps = MPSRegister(4)
+    for gate, targets in random_ops(4, 20, 3):
+        mps.apply_gate(gate, targets)
+    probs = mps.probabilities()
+    shots = 40000
+    counts = mps.counts(shots, rng=5)
+    observed = np.zeros(16)
+    for bits, count in counts.items():
+        observed[int(bits, 2)] = count / shots
+    assert np.abs(observed - probs).sum() / 2 < 0.02
+    # Sampling a subset reads those qubits only, in the order given
+    subset = mps.sample(shots, rng=6, qubits=[3, 1])
+    marginal = probs.reshape(2, 2, 2, 2).sum(axis=(0, 2)).T.reshape(-1)
+    np.testing.assert_allclose(np.bincount(subset @ [2, 1], minlength=4) / shots, marginal, atol=0.015)
+    np.testing.assert_allclose(mps.probabilities(), probs)  # sampling doesn't collapse
+
+
+def test_measurement_collapses_the_chain():
+    mps = MPSRegister(4).apply_gate(H, 0)
+    for q in range(3):
+        mps.apply_gate(CNOT, [q, q + 1])
+    bit = mps.measure_qubits([2], rng=8)[0]
+    np.testing.assert_allclose(np.flatnonzero(mps.probabilities() > 1e-12), [15 * bit])
+
+
+def test_from_qubits_and_wide_qft():
+    qubits = [Qubit([1, 0]), Qubit([0, 1]), Qubit([2**-0.5, 2**-0.5])]
+    mps = MPSRegister.from_qubits(qubits)
+    np.testing.assert_allclose(mps.to_statevector(), QuantumRegister.from_qubits(qubits).state, atol=1e-12)
+    # The QFT of a basis state is a product state, so bonds stay small at any width
+    wide = MPSRegister(60).apply_gate(X, 0)
+    qft(wide)
+    assert max(wide.bond_dimensions()) <= 4
+    counts = wide.counts(2000, rng=9, qubits=[0])
+    assert counts['0'] == pytest.approx(1000, abs=120)
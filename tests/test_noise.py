@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from quantum.circuit import Circuit
+from quantum.density import DensityMatrix
+from quantum.gates import H, CNOT
+from quantum.gate_factory import rx
+from quantum.noise import (NoiseModel, amplitude_damping, apply_channel_trajectories,
+                           dephasing, depolarizing, run_density, run_trajectories)
+from quantum.register import BatchedRegister
+
+
+def _circuit():
+    circuit = Circuit(3)
+    circuit.apply_gate(H, 0)
+    circuit.apply_gate(rx(0.8), 1)
+    circuit.apply_gate(CNOT, [0, 2])
+    circuit.apply_gate(CNOT, [1, 0])
+    return circuit
+
+
+@pytest.mark.parametrize('kraus', [depolarizing(0.2), amplitude_damping(0.3), dephasing(0.4)])
+def test_channels_are_trace_preserving(kraus):
+    np.testing.assert_allclose(sum(k.conj().T @ k for k in kraus), np.eye(2), atol=1e-12)
+
+
+@pytest.mark.parametrize('noise', [NoiseModel(depolarizing(0.1)),
+                                   NoiseModel(amplitude_damping(0.2), dephasing(0.1))])
+def test_trajectories_converge_to_density_matrix(noise):
+    rho = run_density(_circuit(), noise).rho
+    register = run_trajectories(_circuit(), noise, 20000, rng=1)
+    states = register.state
+    average = states.T @ states.conj() / len(states)
+    assert np.abs(average - rho).max() < 0.02
+
+
+def test_trajectories_stay_normalised_and_reproducible():
+    runs = []
+    for _ in range(2):
+        register = BatchedRegister(2, batch_size=500)
+        register.apply_gate(H, 0)
+        register.apply_gate(CNOT, [0, 1])
+        runs.append(apply_channel_trajectories(register, amplitude_damping(0.5), 1, rng=7).state)
+    np.testing.assert_allclose(np.linalg.norm(runs[0], axis=1), 1)
+    np.testing.assert_array_equal(runs[0], runs[1])
+
+
+def test_two_qubit_channel_on_reordered_targets():
+    # Not a mixture of unitaries, so the weights come from the reduced states
+    kraus = [np.kron(a, b) for a in amplitude_damping(0.4) for b in dephasing(0.3)]
+    register = BatchedRegister(3, batch_size=4000)
+    register.apply_gate(H, 0)
+    register.apply_gate(rx(1.1), 2)
+    rho = DensityMatrix.from_state(register.state[0]).apply_channel(kraus, [2, 0]).rho
+    states = apply_channel_trajectories(register, kraus, [2, 0], rng=3).state
+    average = states.T @ states.conj() / len(states)
+    assert np.abs(average - rho).max() < 0.03
@@ -0,0 +1,81 @@
+from functools import reduce
+from itertools import product
+
+import numpy as np
+import pytest
+
+from quantum.density import DensityMatrix
+from quantum.observables import expectation, parse_pauli
+from quantum.register import BatchedRegister, QuantumRegister
+from quantum.state import Qubit
+
+rng = np.random.default_rng(4)
+
+PAULIS = {'I': np.eye(2), 'X': np.array([[0, 1], [1, 0]]),
+          'Y': np.array([[0, -1j], [1j, 0]]), 'Z': np.diag([1, -1])}
+
+
+def random_state(n, batch=None):
+    shape = (2**n,) if batch is None else (batch, 2**n)
+    state = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    return state / np.linalg.norm(state, axis=-1, keepdims=True)
+
+
+def pauli_matrix(pauli):
+    return reduce(np.kron, [PAULIS[c] for c in pauli])
+
+
+def dense_expectation(state, pauli):
+    return np.real(np.einsum('...i,ij,...j->...', np.conj(state), pauli_matrix(pauli), state))
+
+
+ALL_3 = [''.join(p) for p in product('IXYZ', repeat=3)]
+
+
+def test_every_pauli_string_matches_the_dense_matrix():
+    state = random_state(3)
+    values = expectation(QuantumRegister(3, state), ALL_3)
+    np.testing.assert_allclose(values, [dense_expectation(state, p) for p in ALL_3], atol=1e-12)
+
+
+@pytest.mark.parametrize('pauli', ['XZIYX', 'ZZZZZ', 'IIIII', 'YIIIY', 'XXXXX'])
+def test_single_strings_return_floats(pauli):
+    state = random_state(5)
+    value = expectation(state, pauli)
+    assert isinstance(value, float)
+    assert value == pytest.approx(dense_expectation(state, pauli), abs=1e-12)
+
+
+def test_hamiltonian_dict_and_coefficients():
+    # Many diagonal terms in one group take the Walsh-Hadamard path
+    hamiltonian = {'ZZII': 1.0, 'IZZI': -0.5, 'IIZZ': 0.25, 'ZIIZ': 2.0, 'ZIII': 0.3, 'IIIZ': -1.2,
+                   'XXII': 0.7, 'IYYI': -0.4}
+    state = random_state(4)
+    dense = sum(c * pauli_matrix(p) for p, c in hamiltonian.items())
+    expected = np.real(np.conj(state) @ dense @ state)
+    assert expectation(state, hamiltonian) == pytest.approx(expected, abs=1e-12)
+    assert expectation(state, list(hamiltonian), list(hamiltonian.values())) == pytest.approx(expected, abs=1e-12)
+
+
+def test_batched_and_density_operands():
+    states = random_state(3, batch=5)
+    terms = ['XYZ', 'ZIZ', 'YYI']
+    batch = expectation(BatchedRegister(3, states), terms)
+    assert batch.shape == (5, 3)
+    np.testing.assert_allclose(batch, [[dense_expectation(s, p) for p in terms] for s in states], atol=1e-12)
+    assert expectation(states, 'XYZ').shape == (5,)
+    # A mixture: Tr(ρP) is the weighted mean of the members
+    weights = rng.dirichlet(np.ones(5))
+    rho = np.einsum('b,bi,bj->ij', weights, states, np.conj(states))
+    np.testing.assert_allclose(expectation(DensityMatrix(3, rho), terms), weights @ batch, atol=1e-12)
+
+
+def test_qubit_operand_and_validation():
+    assert expectation(Qubit(), 'Z') == pytest.approx(1)
+    assert parse_pauli('xiy', 3) == ((0, 2), (2,), 1)
+    with pytest.raises(ValueError):
+        expectation(random_state(2), 'XYZ')
+    with pytest.raises(ValueError):
+        expectation(random_state(2), 'XA')
+    with pytest.raises(ValueError):
+        expectation(np.ones(3), 'X')
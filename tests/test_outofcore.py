@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pytest
+
+from quantum.gates import H, X, CNOT, SWAP
+from quantum.gate_factory import rx, u3
+from quantum.outofcore import MemmapRegister
+from quantum.register import QuantumRegister
+
+N_QUBITS = 7
+# Gates on high (strided) and low (contiguous) qubits, so blocks gather slabs
+OPERATIONS = [
+    ('gate', H, [0]), ('gate', rx(0.4), [6]), ('gate', CNOT, [0, 6]), ('gate', SWAP, [1, 5]),
+    ('gate', u3(0.3, 0.2, 0.1), [3]), ('controlled', X, [[0, 2], [4]]), ('gate', CNOT, [5, 1]),
+]
+
+
+def evolve(register):
+    for kind, gate, targets in OPERATIONS:
+        if kind == 'gate':
+            register.apply_gate(gate, targets)
+        else:
+            register.apply_controlled(gate, *targets)
+    return register
+
+
+@pytest.fixture
+def start():
+    rng = np.random.default_rng(6)
+    state = rng.normal(size=2**N_QUBITS) + 1j * rng.normal(size=2**N_QUBITS)
+    return state / np.linalg.norm(state)
+
+
+@pytest.mark.parametrize('chunk_size', [8, 32, 2**N_QUBITS])
+def test_memmap_matches_in_memory(tmp_path, start, chunk_size):
+    reference = evolve(QuantumRegister(N_QUBITS, start))
+    register = evolve(MemmapRegister(N_QUBITS, tmp_path / 'amps', chunk_size=chunk_size, state=start))
+    np.testing.assert_allclose(np.asarray(register.state), reference.state, atol=1e-12)
+    np.testing.assert_allclose(register.probabilities(), reference.probabilities(), atol=1e-12)
+    np.testing.assert_allclose(register.marginal_probabilities([5, 0]),
+                               reference.marginal_probabilities([5, 0]), atol=1e-12)
+    register.close()
+
+
+def test_chunked_sampling_follows_the_state(tmp_path, start):
+    register = MemmapRegister(N_QUBITS, tmp_path / 'amps', chunk_size=16, state=start)
+    indices = register._sample_indices(100000, np.random.default_rng(0))
+    observed = np.bincount(indices, minlength=2**N_QUBITS) / len(indices)
+    assert np.abs(observed - np.abs(start)**2).sum() / 2 < 0.02
+    assert sum(register.counts(50, rng=1).values()) == 50
+    register.close()
+
+
+def test_existing_files_are_reopened_not_truncated(tmp_path, start):
+    path = tmp_path / 'amps'
+    register = MemmapRegister(N_QUBITS, path, state=start)
+    register.apply_gate(H, 2)
+    expected = np.array(register.state)
+    register.close()
+    assert path.exists()  # named files are kept
+    np.testing.assert_allclose(np.asarray(MemmapRegister(N_QUBITS, path).state), expected)
+    with pytest.raises(FileExistsError):
+        MemmapRegister(N_QUBITS, path, state=start)
+    with pytest.raises(ValueError):
+        MemmapRegister(N_QUBITS + 1, path)
+    np.testing.assert_allclose(np.asarray(MemmapRegister(N_QUBITS, path, state=start, overwrite=True).state), start)
+
+
+def test_temporary_file_is_removed_on_close():
+    register = MemmapRegister(3)
+    assert register.probabilities()[0] == 1
+    path = register.path
+    register.close()
+    assert not os.path.exists(path)
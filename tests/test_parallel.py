@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from quantum import parallel
+from quantum.gates import H, X, CNOT, SWAP
+from quantum.gate_factory import controlled, phase, rx, u3
+from quantum.register import BatchedRegister, QuantumRegister
+
+rng = np.random.default_rng(5)
+
+N_QUBITS = 18
+
+
+def random_state(n, batch=None):
+    shape = (2**n,) if batch is None else (batch, 2**n)
+    state = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    return state / np.linalg.norm(state, axis=-1, keepdims=True)
+
+
+@pytest.mark.parametrize('gate, targets', [
+    (H, [0]), (H, [N_QUBITS - 1]), (rx(0.4), [7]), (phase(0.3), [2]), (X, [5]),
+    (CNOT, [0, 17]), (SWAP, [3, 11]), (u3(0.2, 0.5, 0.9), [1]), (controlled(rx(0.7), 2), [0, 4, 1]),
+])
+def test_threaded_kernels_match_serial(gate, targets):
+    state = random_state(N_QUBITS)
+    serial = QuantumRegister(N_QUBITS, state).apply_gate(gate, targets).state
+    with parallel.num_threads(4):
+        threaded = QuantumRegister(N_QUBITS, state).apply_gate(gate, targets).state
+    np.testing.assert_allclose(threaded, serial, atol=1e-12)
+
+
+def test_threaded_controlled_and_batched_match_serial():
+    states = random_state(14, batch=8)
+    serial = BatchedRegister(14, states).apply_controlled(rx(1.1), [2, 9], 0).state
+    with parallel.num_threads(3):
+        threaded = BatchedRegister(14, states).apply_controlled(rx(1.1), [2, 9], 0).state
+    np.testing.assert_allclose(threaded, serial, atol=1e-12)
+
+
+def test_blocks_cover_the_tensor_once():
+    shape = (2,) * N_QUBITS
+    assert parallel.blocks(shape, (3,)) is None  # serial by default
+    with parallel.num_threads(4) as n:
+        assert n == parallel.get_num_threads() == 4
+        split = parallel.blocks(shape, (3,))
+        assert parallel.blocks((2,) * 10, (3,)) is None  # too small to split
+    assert parallel.get_num_threads() == 1
+    assert len(split) > 1
+    covered = np.zeros(shape, dtype=int)
+    for index, _ in split:
+        covered[index] += 1
+    assert np.all(covered == 1)
+
+
+def test_rejects_bad_thread_counts():
+    with pytest.raises(ValueError):
+        parallel.set_num_threads(0)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from quantum.circuit import Circuit
+from quantum.density import DensityMatrix
+from quantum.gates import H, CNOT
+from quantum.gate_factory import rx, u3
+from quantum.precision import default_dtype, get_default_dtype, resolve_dtype, set_default_dtype
+from quantum.register import BatchedRegister, QuantumRegister
+from quantum.state import Qubit
+
+
+def _evolve(register):
+    # Dense, controlled, diagonal and permutation kernels, all fed complex128 gates
+    register.apply_gate(H, 0).apply_gate(u3(0.3, 0.2, 0.1), 1).apply_gate(CNOT, [0, 2])
+    register.apply_controlled(rx(0.7), [1], [2]).apply_gate(np.kron(H, H), [2, 1])
+    return register
+
+
+@pytest.mark.parametrize('cls', [QuantumRegister, lambda n, dtype: BatchedRegister(n, batch_size=2, dtype=dtype),
+                                 DensityMatrix])
+def test_complex64_states_are_never_upcast(cls):
+    register = _evolve(cls(3, dtype=np.complex64))
+    state = register.rho if isinstance(register, DensityMatrix) else register.state
+    assert state.dtype == np.complex64
+    reference = _evolve(cls(3, dtype=np.complex128))
+    expected = reference.rho if isinstance(reference, DensityMatrix) else reference.state
+    np.testing.assert_allclose(state, expected, atol=1e-6)
+
+
+def test_default_dtype_context_restores_the_previous_default():
+    assert get_default_dtype() == np.complex128
+    with default_dtype(np.complex64):
+        assert QuantumRegister(2).dtype == np.complex64
+        assert Qubit().state.dtype == np.complex64
+        assert Circuit(1).apply_gate(H, 0).run(backend='statevector').dtype == np.complex64
+    assert get_default_dtype() == np.complex128
+    assert QuantumRegister(2).dtype == np.complex128
+
+
+def test_unsupported_dtypes_are_rejected():
+    with pytest.raises(ValueError):
+        resolve_dtype(np.float64)
+    with pytest.raises(ValueError):
+        set_default_dtype(np.complex256 if hasattr(np, 'complex256') else np.int32)
+    with pytest.raises(ValueError):
+        QuantumRegister(2, dtype=np.float32)
+
+
+def test_dense_gates_reuse_one_scratch_buffer():
+    register = QuantumRegister(4, dtype=np.complex64)
+    register.apply_gate(CNOT, [0, 1])  # permutation: works in place
+    assert register._scratch is None
+    register.apply_gate(H, 2)
+    scratch = register._scratch
+    register.apply_gate(u3(0.1, 0.2, 0.3), 0).apply_controlled(H, [1], [3])
+    assert register._scratch is scratch and scratch.dtype == np.complex64
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from quantum.gates import H, X, CNOT, SWAP
+from quantum.gate_factory import rx, ry, rz, u3
+from quantum.register import BatchedRegister, QuantumRegister
+from quantum.state import Qubit
+
+rng = np.random.default_rng(1)
+
+
+def random_state(n, batch=None):
+    shape = (2**n,) if batch is None else (batch, 2**n)
+    state = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    return state / np.linalg.norm(state, axis=-1, keepdims=True)
+
+
+def random_unitary(k):
+    q, r = np.linalg.qr(rng.normal(size=(2**k, 2**k)) + 1j * rng.normal(size=(2**k, 2**k)))
+    return q * (np.diagonal(r) / np.abs(np.diagonal(r)))
+
+
+def dense_operator(gate, targets, n):
+    """The 2^n x 2^n matrix of `gate` on `targets`, built entry by entry."""
+    index = np.arange(2**n)
+    bits = (index[:, None] >> (n - 1 - np.arange(n))) & 1
+    sub = bits[:, list(targets)] @ (1 << np.arange(len(targets) - 1, -1, -1))
+    rest = [q for q in range(n) if q not in targets]
+    same_rest = np.all(bits[:, None, rest] == bits[None, :, rest], axis=-1)
+    return np.where(same_rest, gate[sub[:, None], sub[None, :]], 0)
+
+
+def test_dense_operator_matches_kron():
+    gate = random_unitary(1)
+    np.testing.assert_allclose(dense_operator(gate, [1], 3), np.kron(np.kron(np.eye(2), gate), np.eye(2)))
+    np.testing.assert_allclose(dense_operator(CNOT, [0, 1], 3), np.kron(CNOT, np.eye(2)))
+
+
+@pytest.mark.parametrize('gate, targets', [
+    (H, [0]), (rx(0.3), [3]), (rz(1.1), [2]), (X, [1]),
+    (CNOT, [0, 1]), (CNOT, [3, 0]), (SWAP, [1, 3]), (random_unitary(2), [2, 0]),
+    (random_unitary(3), [1, 3, 0]), (np.kron(rz(0.4), rz(0.9)), [3, 1]),
+])
+def test_apply_gate_matches_dense_reference(gate, targets):
+    state = random_state(4)
+    register = QuantumRegister(4, state).apply_gate(gate, targets)
+    np.testing.assert_allclose(register.state, dense_operator(gate, targets, 4) @ state, atol=1e-12)
+
+
+@pytest.mark.parametrize('controls, targets', [([0], [2]), ([3, 1], [0]), ([2], [3, 0])])
+def test_apply_controlled_matches_dense_reference(controls, targets):
+    gate = random_unitary(len(targets))
+    full = np.eye(2**(len(controls) + len(targets)), dtype=complex)
+    full[-len(gate):, -len(gate):] = gate
+    state = random_state(4)
+    register = QuantumRegister(4, state).apply_controlled(gate, controls, targets)
+    np.testing.assert_allclose(register.state, dense_operator(full, controls + targets, 4) @ state, atol=1e-12)
+
+
+def test_from_qubits_is_the_kron_product():
+    qubits = [Qubit(u3(0.3, 0.2, 0.1) @ [1, 0]), Qubit([0, 1]), Qubit(ry(1.2) @ [1, 0])]
+    expected = np.kron(np.kron(qubits[0].state, qubits[1].state), qubits[2].state)
+    np.testing.assert_allclose(QuantumRegister.from_qubits(qubits).state, expected)
+
+
+def test_rejects_bad_targets():
+    register = QuantumRegister(3)
+    for targets in ([3], [-1], [0, 0]):
+        with pytest.raises(ValueError):
+            register.apply_gate(H if len(targets) == 1 else CNOT, targets)
+    with pytest.raises(ValueError):
+        register.apply_gate(CNOT, [0])
+    with pytest.raises(ValueError):
+        QuantumRegister(2, np.ones(8))
+
+
+def test_marginal_probabilities_trace_out_the_rest():
+    state = random_state(4)
+    probs = (np.abs(state)**2).reshape(2, 2, 2, 2)
+    marginal = QuantumRegister(4, state).marginal_probabilities([3, 1])
+    np.testing.assert_allclose(marginal, probs.sum(axis=(0, 2)).T.reshape(-1))
+
+
+def test_measure_qubits_collapses_to_the_outcome():
+    register = QuantumRegister(3)
+    register.apply_gate(H, 0).apply_gate(CNOT, [0, 1]).apply_gate(H, 2)
+    bits = register.measure_qubits([1], rng=4)
+    # Qubits 0 and 1 are perfectly correlated and qubit 2 is untouched
+    assert register.marginal_probabilities([0])[bits[0]] == pytest.approx(1)
+    np.testing.assert_allclose(register.marginal_probabilities([2]), [0.5, 0.5])
+    assert np.linalg.norm(register.state) == pytest.approx(1)
+    with pytest.raises(ValueError):
+        register.project([0], 1 - bits[0])
+
+
+def partial_trace(state, q, n):
+    """Reduced density matrix of qubit q from the full outer product."""
+    rho = np.outer(state, state.conj()).reshape((2,) * (2 * n))
+    for i, other in enumerate(o for o in range(n) if o != q):
+        rho = np.trace(rho, axis1=other - i, axis2=other - i + rho.ndim // 2)
+    return rho
+
+
+def test_reduced_density_matrices_match_the_partial_trace():
+    n = 5
+    state = random_state(n)
+    register = QuantumRegister(n, state)
+    rdms = register.reduced_density_matrices()
+    expected = np.array([partial_trace(state, q, n) for q in range(n)])
+    np.testing.assert_allclose(rdms, expected, atol=1e-12)
+    paulis = [np.array([[0, 1], [1, 0]]), np.array([[0, -1j], [1j, 0]]), np.diag([1, -1])]
+    np.testing.assert_allclose(register.bloch_vectors(),
+                               np.einsum('qij,pji->qp', expected, np.array(paulis)).real, atol=1e-12)
+    np.testing.assert_allclose(register.purities(), np.einsum('qij,qji->q', expected, expected).real,
+                               atol=1e-12)
+
+
+def test_reduced_states_of_a_batch_are_per_member():
+    states = random_state(3, batch=4)
+    batch = BatchedRegister(3, states)
+    assert batch.reduced_density_matrices().shape == (4, 3, 2, 2)
+    for member, state in zip(batch.bloch_vectors(), states):
+        np.testing.assert_allclose(member, QuantumRegister(3, state).bloch_vectors(), atol=1e-12)
+    # A Bell pair's halves are maximally mixed
+    bell = QuantumRegister(2).apply_gate(H, 0).apply_gate(CNOT, [0, 1])
+    np.testing.assert_allclose(bell.bloch_vectors(), 0, atol=1e-12)
+    np.testing.assert_allclose(bell.purities(), 0.5)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from quantum.gates import H, CNOT
+from quantum.register import QuantumRegister
+from quantum.sampling import (batch_counts, counts_from_bits, counts_from_indices,
+                              indices_to_bits, sample_indices)
+from quantum.state import Qubit
+
+PROBS = np.array([0.1, 0.0, 0.6, 0.3])
+
+
+def test_sample_indices_follows_the_distribution():
+    indices = sample_indices(PROBS, 200000, rng=0)
+    np.testing.assert_allclose(np.bincount(indices, minlength=4) / len(indices), PROBS, atol=0.005)
+    assert not np.any(indices == 1)
+
+
+def test_sample_indices_accepts_unnormalised_rows():
+    rows = np.array([[0, 0, 2, 0], [1, 1, 1, 1], [0, 5, 0, 5]], dtype=float)
+    indices = sample_indices(rows, 50000, rng=1)
+    assert indices.shape == (3, 50000)
+    assert np.all(indices[0] == 2)
+    np.testing.assert_allclose(np.bincount(indices[1], minlength=4) / 50000, 0.25, atol=0.01)
+    assert set(np.unique(indices[2])) == {1, 3}
+
+
+def test_seeds_reproduce_and_generators_advance():
+    np.testing.assert_array_equal(sample_indices(PROBS, 100, rng=7), sample_indices(PROBS, 100, rng=7))
+    generator = np.random.default_rng(7)
+    first, second = sample_indices(PROBS, 100, generator), sample_indices(PROBS, 100, generator)
+    assert not np.array_equal(first, second)
+
+
+def test_bits_and_counts_agree():
+    indices = np.array([0, 2, 2, 3, 2])
+    bits = indices_to_bits(indices, 3)
+    np.testing.assert_array_equal(bits[1], [0, 1, 0])
+    assert counts_from_indices(indices, 3) == counts_from_bits(bits) == {'000': 1, '010': 3, '011': 1}
+    assert batch_counts(np.array([[0, 1], [1, 1]]), 1) == [{'0': 1, '1': 1}, {'1': 2}]
+
+
+def test_register_counts_are_seeded():
+    register = QuantumRegister(2).apply_gate(H, 0).apply_gate(CNOT, [0, 1])
+    counts = register.counts(1000, rng=3)
+    assert set(counts) == {'00', '11'} and sum(counts.values()) == 1000
+    assert register.counts(1000, rng=3) == counts
+    assert register.sample(4, rng=3).shape == (4, 2)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_qubit_measure_uses_the_seed(seed):
+    outcomes = {Qubit(H @ np.array([1, 0], dtype=complex)).measure(seed) for _ in range(5)}
+    assert len(outcomes) == 1
+    qubit = Qubit(H @ np.array([1, 0], dtype=complex))
+    outcome = qubit.measure(seed)
+    np.testing.assert_array_equal(qubit.state, np.eye(2)[outcome])
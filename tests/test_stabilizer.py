@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from quantum.circuit import Circuit
+from quantum.gates import H, X, Z, CNOT, SWAP
+from quantum.gate_factory import phase, rx
+from quantum.register import QuantumRegister
+from quantum.stabilizer import StabilizerState
+
+S = np.diag([1, 1j])
+Y = np.array([[0, -1j], [1j, 0]])
+
+
+def random_clifford(n, depth, seed):
+    rng = np.random.default_rng(seed)
+    circuit = Circuit(n)
+    for _ in range(depth):
+        kind = rng.integers(6)
+        a, b = (int(q) for q in rng.choice(n, 2, replace=False))
+        if kind == 0:
+            circuit.apply_gate(CNOT, [a, b])
+        elif kind == 1:
+            circuit.apply_controlled(Z, a, b)
+        elif kind == 2:
+            circuit.apply_gate(SWAP, [a, b])
+        else:
+            circuit.apply_gate([H, S, X, Y, Z][rng.integers(5)], a)
+    return circuit
+
+
+def support(probabilities, atol=1e-9):
+    n = int(np.log2(len(probabilities)))
+    return {format(int(i), f'0{n}b') for i in np.flatnonzero(probabilities > atol)}
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_samples_cover_the_statevector_support(seed):
+    circuit = random_clifford(6, 40, seed)
+    assert circuit.is_clifford()
+    probabilities = circuit.run(backend='statevector', optimize=False).probabilities()
+    counts = circuit.run(backend='stabilizer', optimize=False).counts(4096, rng=seed)
+    assert set(counts) == support(probabilities)
+    # A stabilizer state is uniform over its support
+    np.testing.assert_allclose(probabilities[probabilities > 1e-9], 1 / len(counts), atol=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_measurement_collapses_like_the_statevector(seed):
+    circuit = random_clifford(5, 30, seed)
+    tableau = circuit.run(backend='stabilizer', optimize=False)
+    register = circuit.run(backend='statevector', optimize=False)
+    rng = np.random.default_rng(seed)
+    for q in rng.permutation(5)[:3]:
+        bit = tableau.measure_qubit(int(q), rng)
+        assert register.marginal_probabilities([q])[bit] > 1e-9
+        register.project([q], bit)
+        assert set(tableau.counts(2048, rng)) == support(register.probabilities())
+
+
+def test_wide_ghz_spans_several_words():
+    n = 150
+    state = StabilizerState(n).apply_gate(H, 0)
+    for q in range(n - 1):
+        state.apply_gate(CNOT, [q, q + 1])
+    bits = state.sample(200, rng=0)
+    assert set(bits.sum(axis=1).tolist()) == {0, n}
+    assert state.measure_qubit(70, forced=1) == 1
+    assert state.measure_qubit(149) == 1 and state.measure_qubit(0) == 1
+
+
+@pytest.mark.parametrize('gate', [phase(np.pi / 4), rx(0.3)])
+def test_non_clifford_gates_are_rejected(gate):
+    with pytest.raises(ValueError):
+        StabilizerState(2).apply_gate(gate, 0)
+    circuit = Circuit(2)
+    circuit.apply_gate(H, 0)
+    circuit.apply_controlled(gate, 0, 1)
+    assert not circuit.is_clifford()
+    assert isinstance(circuit.run(), QuantumRegister)
+
+
+def test_auto_backend_picks_the_tableau_for_clifford_circuits():
+    assert isinstance(random_clifford(4, 10, 0).run(), StabilizerState)
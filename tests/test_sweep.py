@@ -0,0 +1,29 @@
+import json
+
+import numpy as np
+
+from quantum.sweep import jsonable, parameter_grid, sweep, timing_table
+
+
+def draw(scale, shift, rng):
+    return {'value': float(scale * rng.random() + shift), 'array': np.arange(2) * scale}
+
+
+def test_parameter_grid_is_the_cartesian_product():
+    assert parameter_grid(a=[1, 2], b=['x']) == [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'x'}]
+
+
+def test_results_do_not_depend_on_workers_or_chunks(tmp_path):
+    grid = parameter_grid(scale=[1, 10, 100], shift=[0, 1])
+    serial = sweep(draw, grid, max_workers=1, seed=5)
+    pooled = sweep(draw, grid, max_workers=2, chunksize=2, seed=5, output=tmp_path / 'out.jsonl')
+    assert [r['index'] for r in pooled] == list(range(len(grid)))
+    assert [r['result']['value'] for r in serial] == [r['result']['value'] for r in pooled]
+    assert [r['params'] for r in pooled] == grid
+    lines = [json.loads(line) for line in (tmp_path / 'out.jsonl').read_text().splitlines()]
+    assert sorted(line['index'] for line in lines) == list(range(len(grid)))
+    assert timing_table(pooled)['index'].tolist() == list(range(len(grid)))
+
+
+def test_jsonable_converts_numpy_values():
+    assert json.dumps({'a': np.float32(1.5), 'b': np.arange(3)}, default=jsonable) == '{"a": 1.5, "b": [0, 1, 2]}'
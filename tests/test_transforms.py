@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from quantum.circuit import Circuit
+from quantum.mps import MPSRegister
+from quantum.register import BatchedRegister, QuantumRegister
+from quantum.transforms import qft, qft_circuit
+
+rng = np.random.default_rng(0)
+
+
+def _random_state(*shape):
+    state = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    return state / np.linalg.norm(state, axis=-1, keepdims=True)
+
+
+TARGETS = [
+    (4, None),
+    (6, [1, 2, 3]),  # contiguous run in the middle
+    (6, [3, 4, 5]),  # contiguous run at the end
+    (6, [4, 0, 2]),  # reordered and strided
+    (5, [3, 2]),  # contiguous but descending
+    (8, [2, 3, 4, 5, 6]),
+]
+
+
+@pytest.mark.parametrize('n, targets', TARGETS)
+def test_fft_matches_gates(n, targets):
+    state = _random_state(2**n)
+    reference = qft(QuantumRegister(n, state), targets).state
+    fast = qft(QuantumRegister(n, state), targets, method="fft").state
+    np.testing.assert_allclose(fast, reference, atol=1e-12)
+
+
+@pytest.mark.parametrize('n, targets', TARGETS)
+def test_fft_matches_gates_on_a_batch(n, targets):
+    states = _random_state(3, 2**n)
+    reference = qft_circuit(n, targets).run(BatchedRegister(n, states)).state
+    fast = qft(BatchedRegister(n, states), targets, method="fft").state
+    np.testing.assert_allclose(fast, reference, atol=1e-12)
+    for row, state in zip(fast, states):
+        np.testing.assert_allclose(row, qft(QuantumRegister(n, state), targets, method="fft").state)
+
+
+def test_full_qft_is_the_normalised_inverse_dft():
+    state = _random_state(2**5)
+    np.testing.assert_allclose(qft(QuantumRegister(5, state), method="fft").state,
+                               np.fft.ifft(state, norm='ortho'), atol=1e-12)
+
+
+def test_mps_runs_the_gate_qft():
+    register = MPSRegister(5)
+    register.apply_gate(np.array([[0, 1], [1, 0]]), 4)
+    expected = qft(QuantumRegister(5, register.to_statevector())).state
+    np.testing.assert_allclose(qft(register).to_statevector(), expected, atol=1e-10)
+    with pytest.raises(ValueError):
+        qft(register, method="fft")
+
+
+def test_circuit_records_only_the_gate_qft():
+    assert len(qft(Circuit(3)).operations) > 0
+    with pytest.raises(ValueError):
+        qft(Circuit(3), method="fft")
@@ -1,14 +1,76 @@
 import numpy as np
-from .gates import H, apply_gate 
+from .gates import H, SWAP, phase
+from .register import QuantumRegister
+from .circuit import Circuit
+from .mps import MPSRegister
 
-def qft(qubits):
-    """Quantum Fourier Transform on a list of qubits."""
-    n = len(qubits)
+def _record_qft(target, targets):
+    """Apply the QFT gate network to anything with apply_gate/apply_controlled"""
+    n = len(targets)
     for i in range(n):
-        for j in range(i):
-            # Apply controlled rotations
-            angle = np.pi/(2**(i-j))
-            qubits[i].state = apply_gate(qubits[i].state, 
-                np.array([[1, 0], [0, np.exp(1j*angle)]]))
-        qubits[i].state = apply_gate(qubits[i].state, H)
-    return qubits
\ No newline at end of file
+        target.apply_gate(H, targets[i])
+        for j in range(i + 1, n):
+            # Controlled rotation R_(j-i+1) with control on the less significant qubit
+            angle = np.pi / (2**(j - i))
+            target.apply_controlled(phase(angle), targets[j], targets[i])
+    for i in range(n // 2):
+        target.apply_gate(SWAP, [targets[i], targets[n - 1 - i]])
+    return target
+
+def qft_circuit(n_qubits, targets=None):
+    """Record the QFT on `targets` (default: all qubits) as a Circuit."""
+    targets = list(range(n_qubits)) if targets is None else list(targets)
+    return _record_qft(Circuit(n_qubits), targets)
+
+def qft_fft(register, targets=None):
+    """QFT on `targets` as a normalised inverse DFT over those qubits, in O(n·2^n).
+
+    A contiguous ascending run of qubits is just one axis of a reshape, so
+    numpy.fft transforms the state in place instead of running the O(n^2)
+    gate network; other target orders are gathered into one block first.
+    """
+    n = register.n_qubits
+    targets = list(range(n)) if targets is None else [int(t) for t in targets]
+    register._check_targets(targets)
+    lead = register.state.shape[:-1]
+    m = len(targets)
+    if targets == list(range(targets[0], targets[0] + m)):
+        first = targets[0]
+        view = register.state.reshape(lead + (2**first, 2**m, 2**(n - first - m)))
+        np.fft.ifft(view, axis=-2, norm='ortho', out=view)
+        return register
+    # Gather the targets (in order, targets[0] most significant) into one axis
+    axes = [len(lead) + t for t in targets]
+    tensor = np.moveaxis(register.tensor, axes, range(-m, 0))
+    moved_shape = tensor.shape
+    block = tensor.reshape(moved_shape[:-m] + (2**m,))  # a copy: the moved axes are strided
+    np.fft.ifft(block, axis=-1, norm='ortho', out=block)
+    register.tensor[...] = np.moveaxis(block.reshape(moved_shape), range(-m, 0), axes)
+    return register
+
+def qft(qubits, targets=None, method="gates"):
+    """Quantum Fourier Transform on a register (or a list of qubits).
+
+    Applies the textbook H + controlled-phase network followed by the final
+    swaps, so |x⟩ -> 1/√N Σ_k e^(2πi·xk/N)|k⟩ with qubit 0 most significant.
+    A list of Qubit objects is first combined into a register; the register
+    (QuantumRegister or MPSRegister) is returned. Passing a Circuit records the gates into it instead.
+    method="fft" computes the same transform with numpy.fft (see qft_fft);
+    the gate-level path is kept as the reference.
+    """
+    if isinstance(qubits, Circuit):
+        if method != "gates":
+            raise ValueError("A Circuit can only record the gate-level QFT")
+        targets = list(range(qubits.n_qubits)) if targets is None else list(targets)
+        return _record_qft(qubits, targets)
+    if isinstance(qubits, (QuantumRegister, MPSRegister)):
+        register = qubits
+    else:
+        register = QuantumRegister.from_qubits(qubits)
+    if method == "fft":
+        if isinstance(register, MPSRegister):
+            raise ValueError("An MPSRegister can only run the gate-level QFT")
+        return qft_fft(register, targets)
+    if method != "gates":
+        raise ValueError(f"Unknown QFT method {method!r}")
+    return qft_circuit(register.n_qubits, targets).run(register)
\ No newline at end of file